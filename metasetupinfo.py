@@ -122,6 +122,9 @@ packages = [
     'mysql.connector.django',
     'mysql.connector.fabric',
     ]
+if sys.version_info >= (3, 5):
+    # asyncio API uses async/await syntax
+    packages.append('mysql.connector.aio')
 description = "MySQL driver written in Python"
 long_description = """\
 MySQL driver written in Python which does not depend on MySQL C client
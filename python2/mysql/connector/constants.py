@@ -345,6 +345,7 @@ class ClientFlag(_Flags):
     SECURE_CONNECTION       = 1 << 15
     MULTI_STATEMENTS        = 1 << 16
     MULTI_RESULTS           = 1 << 17
+    ZSTD_COMPRESSION_ALGORITHM = 1 << 26
     SSL_VERIFY_SERVER_CERT  = 1 << 30
     REMEMBER_OPTIONS        = 1 << 31
 
@@ -367,6 +368,8 @@ class ClientFlag(_Flags):
         'SECURE_CONNECTION':  (1 << 15, 'New 4.1 authentication'),
         'MULTI_STATEMENTS':   (1 << 16, 'Enable/disable multi-stmt support'),
         'MULTI_RESULTS':      (1 << 17, 'Enable/disable multi-results'),
+        'ZSTD_COMPRESSION_ALGORITHM': (1 << 26,
+                                       'Can use zstd compression'),
         'SSL_VERIFY_SERVER_CERT':     (1 << 30, ''),
         'REMEMBER_OPTIONS':           (1 << 31, ''),
     }
@@ -485,6 +488,25 @@ class ShutdownType(_Constants):
     }
 
 
+class CursorType(_Constants):
+    """MySQL Cursor types
+
+    Cursor types used as flags by the COM_STMT_EXECUTE server command.
+    """
+    _prefix = 'CURSOR_TYPE_'
+    NO_CURSOR = 0
+    READ_ONLY = 1 << 0
+    FOR_UPDATE = 1 << 1
+    SCROLLABLE = 1 << 2
+
+    desc = {
+        'NO_CURSOR': (0, 'No cursor is opened'),
+        'READ_ONLY': (1 << 0, 'Open a read-only cursor'),
+        'FOR_UPDATE': (1 << 1, 'Open a cursor for update'),
+        'SCROLLABLE': (1 << 2, 'Open a scrollable cursor'),
+    }
+
+
 class CharacterSet(_Constants):
     """MySQL supported character sets and collations
 
@@ -28,6 +28,8 @@ import struct
 import datetime
 import time
 from decimal import Decimal
+from functools import partial
+from operator import methodcaller
 
 from mysql.connector.constants import FieldType, FieldFlag, CharacterSet
 
@@ -82,6 +84,17 @@ class MySQLConverterBase(object):
         """Convert MySQL data type to Python"""
         return value
 
+    def row_converters(self, description):
+        """Get the functions converting the columns of a result set
+
+        The description is MySQLCursor.description. Each function takes a
+        value, which is not NULL, of the matching column.
+
+        Returns a tuple.
+        """
+        return tuple([partial(self.to_python, flddsc)
+                      for flddsc in description])
+
     def escape(self, buf):
         """Escape buffer for sending to MySQL"""
         return buf
@@ -288,14 +301,7 @@ class MySQLConverter(MySQLConverterBase):
             return None
 
         if not self._cache_field_types:
-            self._cache_field_types = {}
-            for name, info in FieldType.desc.items():
-                try:
-                    self._cache_field_types[info[0]] = getattr(
-                        self, '_{0}_to_python'.format(name))
-                except AttributeError:
-                    # We ignore field types which has no method
-                    pass
+            self._set_cache_field_types()
 
         try:
             return self._cache_field_types[flddsc[1]](value, flddsc)
@@ -309,6 +315,73 @@ class MySQLConverter(MySQLConverterBase):
         except:
             raise
 
+    def _set_cache_field_types(self):
+        """Map field types to the methods converting them to Python"""
+        self._cache_field_types = {}
+        for name, info in FieldType.desc.items():
+            try:
+                self._cache_field_types[info[0]] = getattr(
+                    self, '_{0}_to_python'.format(name))
+            except AttributeError:
+                # We ignore field types which has no method
+                pass
+
+    def row_converters(self, description):
+        """Get the functions converting the columns of a result set
+
+        The function for each column in description, which is
+        MySQLCursor.description, is looked up once so rows can be converted
+        without dispatching on the field type for every value. SET and
+        BINARY flags of string columns are resolved here as well. Each
+        function takes a value, which is not NULL, of the matching column.
+
+        Returns a tuple.
+        """
+        if self.to_python.__func__ is not MySQLConverter.to_python.__func__:
+            return super(MySQLConverter, self).row_converters(description)
+        if not self._cache_field_types:
+            self._set_cache_field_types()
+        return tuple([self._column_converter(flddsc)
+                      for flddsc in description])
+
+    def _column_converter(self, flddsc):
+        """Get the function converting values of the given column"""
+        try:
+            method = self._cache_field_types[flddsc[1]]
+        except KeyError:
+            return str
+
+        func = method.__func__
+        try:
+            own_func = getattr(MySQLConverter, func.__name__).__func__
+        except AttributeError:
+            own_func = None
+        if func is not own_func:
+            # Overridden methods might use the description
+            return partial(self.to_python, flddsc)
+        elif func in (MySQLConverter._INT_to_python.__func__,
+                      MySQLConverter._LONG_to_python.__func__):
+            return int
+        elif func is MySQLConverter._FLOAT_to_python.__func__:
+            return float
+        elif func in (MySQLConverter._STRING_to_python.__func__,
+                      MySQLConverter._BLOB_to_python.__func__):
+            if flddsc[7] & FieldFlag.SET:
+                return partial(self.to_python, flddsc)
+            elif flddsc[7] & FieldFlag.BINARY or not self.use_unicode:
+                convert = str
+            else:
+                convert = methodcaller('decode', self.charset)
+
+            def _string_to_python(value):
+                """Returns a string; a single \\x00 is returned as None"""
+                if value == '\x00':
+                    return None
+                return convert(value)
+            return _string_to_python
+
+        return method
+
     def _FLOAT_to_python(self, value, desc=None):  # pylint: disable=C0103
         """
         Returns value as float type.
@@ -0,0 +1,150 @@
+# MySQL Connector/Python - MySQL driver written in Python.
+# Copyright (c) 2013, Oracle and/or its affiliates. All rights reserved.
+
+# MySQL Connector/Python is licensed under the terms of the GPLv2
+# <http://www.gnu.org/licenses/old-licenses/gpl-2.0.html>, like most
+# MySQL Connectors. There are special exceptions to the terms and
+# conditions of the GPLv2 as it is applied to this software, see the
+# FOSS License Exception
+# <http://www.mysql.com/about/legal/licensing/foss-exception.html>.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+"""Running queries concurrently on several MySQL connections.
+"""
+
+import select
+
+from mysql.connector import errors
+from mysql.connector.constants import ServerCmd
+
+
+class _Selector(object):
+    """Wait until the sockets of connections can be read"""
+    def __init__(self, connections):
+        self._fileobjs = {}
+        for cnx in connections:
+            # pylint: disable=W0212
+            self._fileobjs[cnx._socket.sock.fileno()] = cnx
+
+    def unregister(self, cnx):
+        """Stop waiting for the given connection"""
+        for fileno, other in list(self._fileobjs.items()):
+            if other is cnx:
+                del self._fileobjs[fileno]
+
+    def select(self, timeout=None):
+        """Wait for connections which can be read
+
+        Returns a list of connections.
+        """
+        (readable, _, _) = select.select(list(self._fileobjs), [], [],
+                                         timeout)
+        return [self._fileobjs[fileno] for fileno in readable]
+
+    def close(self):
+        """Release the resources of the selector"""
+
+
+def _read_result(cnx, raw=False):
+    """Read the result of a query sent to the connection
+
+    Returns a dict() like MySQLConnection.cmd_query(). For result sets,
+    the rows are stored under the key 'rows' and 'eof' holds the EOF
+    packet ending the rows.
+    """
+    # pylint: disable=W0212
+    result = cnx._handle_result(cnx._socket.recv())
+    if cnx._have_next_result:
+        raise errors.InterfaceError(
+            'Use cmd_query_iter for statements with multiple queries.')
+    # pylint: enable=W0212
+    if 'columns' in result:
+        converters = None
+        if not raw:
+            converters = cnx.converter.row_converters(result['columns'])
+        (result['rows'], result['eof']) = cnx.get_rows(converters=converters)
+    return result
+
+
+def query_many(queries, timeout=None, raw=False):
+    """Execute queries concurrently on several connections
+
+    The queries argument is a sequence of (connection, statement) tuples
+    or a dictionary mapping connections to statements; each connection
+    is used once. All statements are sent first, after which the results
+    are read in the order in which they arrive. This lets one thread
+    query, for example, many shards in parallel using blocking
+    connections.
+
+    The result of each query is a dictionary like the one returned by
+    MySQLConnection.cmd_query(). For result sets, the rows are available
+    under the key 'rows', converted to Python types unless raw is True.
+    When a query fails, the errors.Error-exception raised is stored as
+    result of its connection instead; results of the other connections
+    are read as usual.
+
+    When timeout seconds pass without any result arriving, the
+    connections still waiting are disconnected and OperationalError is
+    raised.
+
+    Returns a dictionary mapping connections to results.
+    """
+    if isinstance(queries, dict):
+        queries = list(queries.items())
+    connections = set([cnx for (cnx, _) in queries])
+    if len(connections) != len(queries):
+        raise errors.ProgrammingError(
+            "Connection used for more than one query")
+
+    results = {}
+    pending = []
+    for (cnx, statement) in queries:
+        try:
+            # pylint: disable=W0212
+            cnx._send_cmd(ServerCmd.QUERY, statement, expect_response=False)
+        except errors.Error as err:
+            results[cnx] = err
+        else:
+            pending.append(cnx)
+
+    selector = _Selector(pending)
+    try:
+        while pending:
+            # pylint: disable=W0212
+            ready = [cnx for cnx in pending if cnx._socket.pending()]
+            if not ready:
+                ready = selector.select(timeout)
+            if not ready:
+                for cnx in pending:
+                    cnx.disconnect()
+                raise errors.OperationalError(
+                    "Timeout waiting for results of {0} connection(s)".format(
+                        len(pending)))
+            for cnx in ready:
+                try:
+                    results[cnx] = _read_result(cnx, raw)
+                except errors.Error as err:
+                    results[cnx] = err
+                    if cnx.unread_result:
+                        try:
+                            cnx.get_rows()
+                        except errors.Error:
+                            pass
+                pending.remove(cnx)
+                selector.unregister(cnx)
+    finally:
+        selector.close()
+
+    return results
@@ -24,8 +24,12 @@
 """Module implementing low-level socket communication with MySQL servers.
 """
 
+import os
+import errno
+import select
 import socket
 import struct
+import time
 from collections import deque
 import zlib
 try:
@@ -33,6 +37,11 @@ try:
 except ImportError:
     # If import fails, we don't have SSL support.
     pass
+try:
+    import zstandard
+except ImportError:
+    # Without the zstandard module only zlib compression is available
+    zstandard = None
 
 from mysql.connector import constants, errors
 
@@ -47,6 +56,303 @@ def _strioerror(err):
     return '{errno} {strerr}'.format(errno=err.errno, strerr=err.strerror)
 
 
+def _set_socket_options(sock, options, tcp=True):
+    """Set options of a socket
+
+    The options dictionary is as returned by
+    BaseMySQLSocket.set_socket_options(). Options only meaningful for
+    TCP/IP are skipped when tcp is False. Keepalive timings are only set
+    on platforms providing them.
+    """
+    if options.get('recv_buffer_size'):
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF,
+                        options['recv_buffer_size'])
+    if options.get('send_buffer_size'):
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF,
+                        options['send_buffer_size'])
+    if not tcp:
+        return
+    if options.get('tcp_nodelay'):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    if options.get('keepalive'):
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        keepalive_opts = (
+            # TCP_KEEPALIVE is the name of TCP_KEEPIDLE on OS X
+            ('keepalive_idle', getattr(socket, 'TCP_KEEPIDLE',
+                                       getattr(socket, 'TCP_KEEPALIVE',
+                                               None))),
+            ('keepalive_interval', getattr(socket, 'TCP_KEEPINTVL', None)),
+            ('keepalive_count', getattr(socket, 'TCP_KEEPCNT', None)),
+        )
+        for (key, sockopt) in keepalive_opts:
+            if options.get(key) and sockopt is not None:
+                sock.setsockopt(socket.IPPROTO_TCP, sockopt, options[key])
+
+
+# Packet header: 3 bytes payload length (split low/high) and sequence number
+_HEADER_STRUCT = struct.Struct('<HBB')
+# Compressed packet header: 3 bytes compressed length, sequence number and
+# 3 bytes length of the payload before compression
+_COMPRESSED_HEADER_STRUCT = struct.Struct('<HBBHB')
+
+
+# Payloads up to this size are copied behind their header instead of being
+# sent as a separate buffer
+_SEND_COPY_LIMIT = 16384
+
+# Payloads which do not compress below this ratio are considered
+# incompressible when compression is adaptive
+_COMPRESS_MIN_RATIO = 0.9
+# Maximum number of packets sent uncompressed before sampling again
+_COMPRESS_MAX_BACKOFF = 64
+
+# Maximum number of buffers given to a single sendmsg() call
+_SENDMSG_MAX_BUFFERS = 64
+
+
+# SSL contexts by configuration: (ca, cert, key, verify_cert) => SSLContext
+_SSL_CONTEXTS = {}
+
+
+def _get_ssl_context(ca, cert, key, verify_cert=False):
+    """Get the SSLContext for an SSL configuration
+
+    A context is created once for each configuration and shared by all
+    connections using it, for example those of a connection pool, so the
+    certificate files are loaded only once. The highest TLS version
+    supported by both client and MySQL server is used.
+
+    Returns an ssl.SSLContext.
+    """
+    config = (ca, cert, key, verify_cert)
+    try:
+        return _SSL_CONTEXTS[config]
+    except KeyError:
+        pass
+    context = ssl.SSLContext(ssl.PROTOCOL_SSLv23)
+    context.options |= ssl.OP_NO_SSLv2 | ssl.OP_NO_SSLv3
+    if verify_cert:
+        context.verify_mode = ssl.CERT_REQUIRED
+    else:
+        context.verify_mode = ssl.CERT_NONE
+    if ca:
+        context.load_verify_locations(ca)
+    if cert:
+        context.load_cert_chain(cert, key)
+    _SSL_CONTEXTS[config] = context
+    return context
+
+
+# Seconds to wait for a connection attempt before also trying the next
+# address (Happy Eyeballs, RFC 6555)
+_CONNECT_ATTEMPT_DELAY = 0.25
+# Errors of a non-blocking connect() still in progress
+_CONNECT_IN_PROGRESS = (0, errno.EINPROGRESS, errno.EWOULDBLOCK,
+                        getattr(errno, 'WSAEWOULDBLOCK', errno.EWOULDBLOCK))
+
+# Resolved addresses: (host, port) => (expiry time, addrinfos)
+_DNS_CACHE = {}
+# Hosts which could not be connected: (host, port) => time of failure
+_HOST_FAILURES = {}
+
+
+def _getaddrinfo(host, port, cache_ttl=0):
+    """Get the address information of a MySQL server
+
+    Results are cached for cache_ttl seconds; with a cache_ttl of 0
+    the host is resolved every time.
+
+    Returns a list of tuples as returned by socket.getaddrinfo().
+    """
+    key = (host, port)
+    if cache_ttl:
+        try:
+            (expires, addrinfos) = _DNS_CACHE[key]
+            if expires > time.time():
+                return addrinfos
+        except KeyError:
+            pass
+    addrinfos = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM,
+                                   socket.SOL_TCP)
+    if cache_ttl:
+        _DNS_CACHE[key] = (time.time() + cache_ttl, addrinfos)
+    return addrinfos
+
+
+def _connect_any(candidates, timeout=None, options=None):
+    """Connect to the first address accepting the connection
+
+    The candidates are (key, addrinfo) tuples, in order of preference.
+    Connecting starts with the first address; when it did not succeed
+    within _CONNECT_ATTEMPT_DELAY seconds, or failed, the next address is
+    tried while still waiting for the earlier ones. Sockets are created
+    with the given socket options.
+
+    Raises IOError when no connection could be made within timeout
+    seconds. Returns a tuple (socket, key, failed keys).
+    """
+    candidates = list(candidates)
+    attempts = {}
+    failed = set()
+    last_error = None
+    deadline = time.time() + timeout if timeout is not None else None
+    next_attempt = 0
+    try:
+        while candidates or attempts:
+            now = time.time()
+            if deadline is not None and now >= deadline:
+                raise socket.timeout("timed out")
+            if candidates and (not attempts or now >= next_attempt):
+                (key, (family, socktype, proto, _, sockaddr)) = \
+                    candidates.pop(0)
+                sock = socket.socket(family, socktype, proto)
+                try:
+                    _set_socket_options(sock, options or {})
+                    sock.setblocking(False)
+                    err = sock.connect_ex(sockaddr)
+                    if err not in _CONNECT_IN_PROGRESS:
+                        raise socket.error(err, os.strerror(err))
+                except IOError as err:
+                    sock.close()
+                    failed.add(key)
+                    last_error = err
+                    continue
+                attempts[sock] = key
+                next_attempt = now + _CONNECT_ATTEMPT_DELAY
+                continue
+
+            wait = None
+            if candidates:
+                wait = next_attempt - now
+            if deadline is not None and (wait is None
+                                         or deadline - now < wait):
+                wait = deadline - now
+            socks = list(attempts)
+            (_, writable, exceptional) = select.select(
+                [], socks, socks, max(wait, 0) if wait is not None else None)
+            for sock in set(writable + exceptional):
+                err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                key = attempts.pop(sock)
+                if not err:
+                    sock.setblocking(True)
+                    return (sock, key, failed)
+                sock.close()
+                failed.add(key)
+                last_error = socket.error(err, os.strerror(err))
+    finally:
+        for sock in attempts:
+            sock.close()
+    raise last_error
+
+
+class ZlibCodec(object):
+    """Compress payloads of compressed packets using zlib
+
+    The level is the zlib compression level; None uses the zlib default.
+    """
+    name = 'zlib'
+    available = True
+    min_level = -1
+    max_level = 9
+    error = zlib.error
+
+    def __init__(self, level=None):
+        if level is None:
+            level = zlib.Z_DEFAULT_COMPRESSION
+        self.level = level
+
+    def compress(self, data):
+        """Compress data
+
+        Returns bytes.
+        """
+        return zlib.compress(data, self.level)
+
+    def decompressobj(self):
+        """Get an object decompressing the payload of one packet"""
+        return zlib.decompressobj()
+
+
+class ZstdCodec(object):
+    """Compress payloads of compressed packets using zstd
+
+    The zstd algorithm is only available when the zstandard module is
+    installed and the MySQL server supports it. The level is the zstd
+    compression level; None uses the zstd default.
+    """
+    name = 'zstd'
+    available = zstandard is not None
+    min_level = -7
+    max_level = 22
+    default_level = 3
+    server_min_level = 1
+    error = zstandard.ZstdError if zstandard else None
+
+    def __init__(self, level=None):
+        if level is None:
+            level = self.default_level
+        self.level = level
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    def compress(self, data):
+        """Compress data
+
+        Returns bytes.
+        """
+        return self._compressor.compress(data)
+
+    def decompressobj(self):
+        """Get an object decompressing the payload of one packet"""
+        return self._decompressor.decompressobj()
+
+
+COMPRESSION_CODECS = {
+    ZlibCodec.name: ZlibCodec,
+    ZstdCodec.name: ZstdCodec,
+}
+
+
+def _packet_buffers(payload, pktnr):
+    """Split a payload in MySQL packets without copying it
+
+    The payload is a bytes-like object or a sequence of them which are
+    sent as one payload. Big payloads are not copied; the packets are
+    formed by their headers followed by memoryviews over the payload.
+
+    Returns a list of bytes-like objects.
+    """
+    if not isinstance(payload, (list, tuple)):
+        payload = (payload,)
+    parts = deque(memoryview(part) for part in payload if len(part))
+    pllen = sum(len(part) for part in parts)
+    maxpktlen = constants.MAX_PACKET_LENGTH
+    buffers = []
+    while True:
+        size = min(pllen, maxpktlen)
+        header = _HEADER_STRUCT.pack(size & 0xffff, size >> 16, pktnr % 256)
+        views = []
+        need = size
+        while need:
+            part = parts[0]
+            if len(part) > need:
+                views.append(part[:need])
+                parts[0] = part[need:]
+                break
+            views.append(parts.popleft())
+            need -= len(part)
+        if size <= _SEND_COPY_LIMIT:
+            buffers.append(
+                header + ''.join([view.tobytes() for view in views]))
+        else:
+            buffers.append(header)
+            buffers.extend(views)
+        pllen -= size
+        pktnr += 1
+        if size < maxpktlen:
+            return buffers
+
+
 def _prepare_packets(buf, pktnr):
     """Prepare a packet for sending to the MySQL server"""
     pkts = []
@@ -74,9 +380,23 @@ class BaseMySQLSocket(object):
     def __init__(self):
         self.sock = None  # holds the socket connection
         self._connection_timeout = None
+        self._read_timeout = None
+        self._write_timeout = None
+        self._deadline = None
+        self._timeout = None
         self._packet_number = -1
         self._packet_queue = deque()
+        self._zip_buffer = bytearray()
+        self.compression_stats = {
+            'sent': 0, 'sent_compressed': 0, 'skipped': 0,
+            'received': 0, 'received_compressed': 0}
+        self.set_compression()
         self.recvsize = 8192
+        self._recv_buffer = None
+        self._recv_view = None
+        self._recv_pos = 0
+        self._recv_end = 0
+        self._socket_options = {}
 
     @property
     def next_packet_number(self):
@@ -90,6 +410,34 @@ class BaseMySQLSocket(object):
         """Open the socket"""
         raise NotImplementedError
 
+    def set_socket_options(self, tcp_nodelay=False, keepalive=False,
+                           keepalive_idle=None, keepalive_interval=None,
+                           keepalive_count=None, recv_buffer_size=None,
+                           send_buffer_size=None):
+        """Set the options of the socket used for the connection
+
+        When tcp_nodelay is True, Nagle's algorithm is disabled so small
+        packets are sent immediately. When keepalive is True, TCP
+        keepalive probes are sent after keepalive_idle seconds without
+        traffic, every keepalive_interval seconds, and the connection is
+        dropped after keepalive_count unanswered probes. The sizes of the
+        kernel buffers are set using recv_buffer_size and
+        send_buffer_size (SO_RCVBUF and SO_SNDBUF). Options which are
+        None use the defaults of the operating system.
+
+        Options are applied when the connection is opened; TCP/IP
+        options are ignored for UNIX sockets.
+        """
+        self._socket_options = {
+            'tcp_nodelay': tcp_nodelay,
+            'keepalive': keepalive,
+            'keepalive_idle': keepalive_idle,
+            'keepalive_interval': keepalive_interval,
+            'keepalive_count': keepalive_count,
+            'recv_buffer_size': recv_buffer_size,
+            'send_buffer_size': send_buffer_size,
+        }
+
     def get_address(self):
         """Get the location of the socket"""
         raise NotImplementedError
@@ -108,17 +456,115 @@ class BaseMySQLSocket(object):
             self.next_packet_number  # pylint: disable=W0104
         else:
             self._packet_number = packet_number
-        packets = _prepare_packets(buf, self._packet_number)
-        for packet in packets:
-            try:
-                self.sock.sendall(packet)
-            except IOError as err:
-                raise errors.OperationalError(
-                    errno=2055, values=(self.get_address(), _strioerror(err)))
-            except AttributeError:
-                raise errors.OperationalError(errno=2006)
+        buffers = _packet_buffers(buf, self._packet_number)
+        try:
+            self._sendall(buffers)
+        except IOError as err:
+            raise errors.OperationalError(
+                errno=2055, values=(self.get_address(), _strioerror(err)))
+        except AttributeError:
+            raise errors.OperationalError(errno=2006)
     send = send_plain
 
+    def _sendall(self, buffers):
+        """Send all buffers to the MySQL server
+
+        The buffers are gathered by sendmsg() when the socket supports it,
+        otherwise they are sent one after the other.
+        """
+        self._apply_write_timeout()
+        try:
+            sendmsg = self.sock.sendmsg
+        except AttributeError:
+            sendmsg = None
+        if sendmsg is not None:
+            views = [memoryview(buf) for buf in buffers]
+            i = 0
+            try:
+                while i < len(views):
+                    sent = sendmsg(views[i:i + _SENDMSG_MAX_BUFFERS])
+                    while sent:
+                        size = len(views[i])
+                        if sent < size:
+                            views[i] = views[i][sent:]
+                            break
+                        sent -= size
+                        i += 1
+                return
+            except NotImplementedError:
+                # For example SSL sockets
+                buffers = views[i:]
+        for buf in buffers:
+            self.sock.sendall(buf)
+
+    @property
+    def compression_algorithm(self):
+        """Name of the algorithm compressing the packets"""
+        return self._codec.name
+
+    def set_compression(self, level=None, threshold=50, adaptive=False,
+                        codec=ZlibCodec):
+        """Configure how packets are compressed before they are sent
+
+        The codec is the class compressing the payloads, ZlibCodec by
+        default, and level its compression level, None using the default
+        level of the codec. Packets with a payload not longer than
+        threshold bytes are sent uncompressed. When adaptive is True,
+        packets which do not compress well make the following packets be
+        sent uncompressed, skipping more of them each time compression is
+        sampled again and does not pay off.
+        """
+        self._codec = codec(level)
+        self._compress_threshold = threshold
+        self._compress_adaptive = adaptive
+        self._compress_skip = 0
+        self._compress_backoff = 0
+
+    def _compress(self, payload):
+        """Compress the payload of a compressed packet
+
+        Returns the compressed payload or None when the payload should be
+        sent uncompressed.
+        """
+        stats = self.compression_stats
+        stats['sent'] += len(payload)
+        if len(payload) <= self._compress_threshold:
+            stats['sent_compressed'] += len(payload)
+            return None
+        if self._compress_skip:
+            self._compress_skip -= 1
+            stats['skipped'] += 1
+            stats['sent_compressed'] += len(payload)
+            return None
+        zbuf = self._codec.compress(payload)
+        if len(zbuf) < len(payload) * _COMPRESS_MIN_RATIO:
+            self._compress_backoff = 0
+        elif self._compress_adaptive:
+            self._compress_backoff = min(
+                max(self._compress_backoff * 2, 1), _COMPRESS_MAX_BACKOFF)
+            self._compress_skip = self._compress_backoff
+        if len(zbuf) >= len(payload):
+            stats['skipped'] += 1
+            stats['sent_compressed'] += len(payload)
+            return None
+        stats['sent_compressed'] += len(zbuf)
+        return zbuf
+
+    def _compressed_packet(self, payload, seqid):
+        """Make a compressed packet holding payload
+
+        Returns bytes.
+        """
+        zbuf = self._compress(payload)
+        pllen = len(payload)
+        if zbuf is None:
+            return _COMPRESSED_HEADER_STRUCT.pack(
+                pllen & 0xffff, pllen >> 16, seqid % 256, 0, 0) + payload
+        zlen = len(zbuf)
+        return _COMPRESSED_HEADER_STRUCT.pack(
+            zlen & 0xffff, zlen >> 16, seqid % 256,
+            pllen & 0xffff, pllen >> 16) + zbuf
+
     def send_compressed(self, buf, packet_number=None):
         """Send compressed packets to the MySQL server"""
         if packet_number is None:
@@ -126,55 +572,24 @@ class BaseMySQLSocket(object):
         else:
             self._packet_number = packet_number
         pktnr = self._packet_number
+        if isinstance(buf, (list, tuple)):
+            buf = ''.join([str(part) for part in buf])
         pllen = len(buf)
-        zpkts = []
         maxpktlen = constants.MAX_PACKET_LENGTH
         if pllen > maxpktlen:
-            pkts = _prepare_packets(buf, pktnr)
-            tmpbuf = ''.join(pkts)
-            del pkts
-            seqid = 0
-            zbuf = zlib.compress(tmpbuf[:16384])
-            zpkts.append(struct.pack('<I', len(zbuf))[0:3]
-                         + struct.pack('<B', seqid)
-                         + '\x00\x40\x00' + zbuf)
-            tmpbuf = tmpbuf[16384:]
-            pllen = len(tmpbuf)
-            seqid = seqid + 1
-            while pllen > maxpktlen:
-                zbuf = zlib.compress(tmpbuf[:maxpktlen])
-                zpkts.append(struct.pack('<I', len(zbuf))[0:3]
-                             + struct.pack('<B', seqid)
-                             + '\xff\xff\xff' + zbuf)
-                tmpbuf = tmpbuf[maxpktlen:]
-                pllen = len(tmpbuf)
-                seqid = seqid + 1
-            if tmpbuf:
-                zbuf = zlib.compress(tmpbuf)
-                zpkts.append(struct.pack('<I', len(zbuf))[0:3]
-                             + struct.pack('<B', seqid)
-                             + struct.pack('<I', pllen)[0:3]
-                             + zbuf)
+            tmpbuf = ''.join(_prepare_packets(buf, pktnr))
+            chunks = [tmpbuf[:16384]]
+            for i in xrange(16384, len(tmpbuf), maxpktlen):
+                chunks.append(tmpbuf[i:i + maxpktlen])
             del tmpbuf
         else:
-            pkt = (struct.pack('<I', pllen)[0:3]
-                   + struct.pack('<B', pktnr)
-                   + buf)
-            pllen = len(pkt)
-            if pllen > 50:
-                zbuf = zlib.compress(pkt)
-                zpkts.append(struct.pack('<I', len(zbuf))[0:3]
-                             + struct.pack('<B', 0)
-                             + struct.pack('<I', pllen)[0:3]
-                             + zbuf)
-            else:
-                zpkts.append(struct.pack('<I', pllen)[0:3]
-                             + struct.pack('<B', 0)
-                             + struct.pack('<I', 0)[0:3]
-                             + pkt)
+            chunks = [struct.pack('<I', pllen)[0:3] +
+                      struct.pack('<B', pktnr) + buf]
 
-        for zip_packet in zpkts:
+        for seqid, chunk in enumerate(chunks):
+            zip_packet = self._compressed_packet(chunk, seqid)
             try:
+                self._apply_write_timeout()
                 self.sock.sendall(zip_packet)
             except IOError as err:
                 raise errors.OperationalError(
@@ -182,124 +597,291 @@ class BaseMySQLSocket(object):
             except AttributeError:
                 raise errors.OperationalError(errno=2006)
 
-    def recv_plain(self):
-        """Receive packets from the MySQL server"""
-        packet = ''
+    def pending(self):
+        """Check whether received data is waiting to be read
+
+        Data can be buffered by the socket, the SSL layer or, when using
+        compression, as already decompressed packets. Such data is not
+        reported by select() on the underlying socket.
+
+        Returns True or False.
+        """
+        if self._recv_end > self._recv_pos or self._packet_queue:
+            return True
         try:
-            # Read the header of the MySQL packet, 4 bytes
-            packet = self.sock.recv(1)
-            while len(packet) < 4:
-                chunk = self.sock.recv(1)
-                if not chunk:
-                    raise errors.InterfaceError(errno=2013)
-                packet += chunk
+            return self.sock.pending() > 0
+        except AttributeError:
+            return False
+
+    def _reset_recv_buffer(self):
+        """Discard any data left in the receive buffer"""
+        self._recv_pos = 0
+        self._recv_end = 0
 
-            # Save the packet number and total packet length from header
-            self._packet_number = ord(packet[3])
-            packet_totlen = struct.unpack("<I", packet[0:3] + '\x00')[0] + 4
+    def _recv_fill(self, size):
+        """Make sure the receive buffer holds at least size bytes
 
-            # Read the rest of the packet
-            rest = packet_totlen - len(packet)
+        The receive buffer is a bytearray of recvsize bytes which is filled
+        using the socket's recv_into() method. Unread data is moved to the
+        start of the buffer when there is not enough room left at the end.
+        The buffer is made bigger when recvsize is smaller than size.
+
+        Raises InterfaceError when the connection was lost.
+        """
+        available = self._recv_end - self._recv_pos
+        if available >= size:
+            return
+
+        bufsize = max(self.recvsize, size)
+        if self._recv_buffer is None or (
+                not available and len(self._recv_buffer) != bufsize):
+            self._recv_buffer = bytearray(bufsize)
+            self._recv_view = memoryview(self._recv_buffer)
+            self._recv_pos = self._recv_end = 0
+        elif size > len(self._recv_buffer):
+            buf = bytearray(bufsize)
+            buf[0:available] = \
+                self._recv_view[self._recv_pos:self._recv_end].tobytes()
+            self._recv_buffer = buf
+            self._recv_view = memoryview(buf)
+            self._recv_pos = 0
+            self._recv_end = available
+        elif self._recv_pos + size > len(self._recv_buffer):
+            self._recv_buffer[0:available] = \
+                self._recv_view[self._recv_pos:self._recv_end].tobytes()
+            self._recv_pos = 0
+            self._recv_end = available
+
+        self._apply_read_timeout()
+        while available < size:
+            nbytes = self.sock.recv_into(self._recv_view[self._recv_end:])
+            if not nbytes:
+                self._reset_recv_buffer()
+                raise errors.InterfaceError(errno=2013)
+            self._recv_end += nbytes
+            available += nbytes
+
+    def _recv_packet(self):
+        """Receive a packet from the MySQL server
+
+        Packets are read through a receive buffer so that a single system
+        call usually reads several (small) packets at once. Packets which
+        do not fit in the buffer are read directly from the socket.
+
+        Returns a buffer object over the receive buffer, or a string when
+        the packet was bigger than the buffer.
+        """
+        try:
+            # Read the header of the MySQL packet, 4 bytes
+            self._recv_fill(4)
+            (low, high, self._packet_number) = _HEADER_STRUCT.unpack_from(
+                self._recv_buffer, self._recv_pos)
+            packet_totlen = (low | high << 16) + 4
+
+            if packet_totlen <= len(self._recv_buffer):
+                self._recv_fill(packet_totlen)
+                pos = self._recv_pos
+                self._recv_pos = pos + packet_totlen
+                return buffer(self._recv_buffer, pos, packet_totlen)
+
+            # Packet is bigger than the buffer; read the rest directly
+            chunks = [self._recv_view[self._recv_pos:self._recv_end].tobytes()]
+            rest = packet_totlen - len(chunks[0])
+            self._reset_recv_buffer()
+            self._apply_read_timeout()
             while rest > 0:
                 chunk = self.sock.recv(rest)
                 if not chunk:
                     raise errors.InterfaceError(errno=2013)
-                packet += chunk
-                rest = packet_totlen - len(packet)
+                chunks.append(chunk)
+                rest -= len(chunk)
 
-            return packet
+            return ''.join(chunks)
         except IOError as err:
+            self._reset_recv_buffer()
             raise errors.OperationalError(
                 errno=2055, values=(self.get_address(), _strioerror(err)))
+
+    def recv_plain(self):
+        """Receive packets from the MySQL server"""
+        packet = self._recv_packet()
+        if isinstance(packet, buffer):
+            return str(packet)
+        return packet
     recv = recv_plain
 
-    def _split_zipped_payload(self, packet_bunch):
-        """Split compressed payload"""
-        while packet_bunch:
-            payload_length = struct.unpack("<I",
-                                           packet_bunch[0:3] + '\x00')[0]
-            self._packet_queue.append(packet_bunch[0:payload_length + 4])
-            packet_bunch = packet_bunch[payload_length + 4:]
+    def recv_plain_view(self):
+        """Receive a packet from the MySQL server without copying it
+
+        The packet is returned as a buffer object over the receive buffer.
+        It is only valid until the next packet is received; values which
+        need to be kept must be copied. Slicing a buffer object returns a
+        string.
+
+        Returns a buffer object or a string.
+        """
+        return self._recv_packet()
+    recv_view = recv_plain_view
+
+    def _split_zipped_payload(self):
+        """Queue the complete packets found in the decompressed data
+
+        Data of an incomplete packet is kept until the rest of the packet
+        is received with the next compressed packet.
+        """
+        buf = self._zip_buffer
+        buflen = len(buf)
+        pos = 0
+        while buflen - pos >= 4:
+            (low, high) = _HEADER_STRUCT.unpack_from(buf, pos)[0:2]
+            end = pos + (low | high << 16) + 4
+            if end > buflen:
+                break
+            self._packet_queue.append(str(buf[pos:end]))
+            pos = end
+        del buf[0:pos]
+
+    def _recv_compressed_packet(self):
+        """Receive a compressed packet from the MySQL server
+
+        The payload is read through the receive buffer and decompressed
+        chunk by chunk while it is received. The packets it completes are
+        added to the packet queue.
+        """
+        self._recv_fill(7)
+        (zip_low, zip_high, _, low, high) = \
+            _COMPRESSED_HEADER_STRUCT.unpack_from(self._recv_buffer,
+                                                  self._recv_pos)
+        self._recv_pos += 7
+        rest = zip_low | zip_high << 16
+        self.compression_stats['received_compressed'] += rest
+        self.compression_stats['received'] += (low | high << 16) or rest
+        decompressor = self._codec.decompressobj() if low or high else None
+        while rest:
+            self._recv_fill(1)
+            end = min(self._recv_end, self._recv_pos + rest)
+            chunk = self._recv_view[self._recv_pos:end]
+            rest -= end - self._recv_pos
+            self._recv_pos = end
+            if decompressor:
+                self._zip_buffer += decompressor.decompress(chunk.tobytes())
+            else:
+                self._zip_buffer += chunk
+        if decompressor:
+            self._zip_buffer += decompressor.flush()
+        self._split_zipped_payload()
 
     def recv_compressed(self):
         """Receive compressed packets from the MySQL server"""
         try:
-            return self._packet_queue.popleft()
-        except IndexError:
-            pass
-
-        header = ''
-        packets = []
-        try:
-            abyte = self.sock.recv(1)
-            while abyte and len(header) < 7:
-                header += abyte
-                abyte = self.sock.recv(1)
-            while header:
-                if len(header) < 7:
-                    raise errors.InterfaceError(errno=2013)
-                zip_payload_length = struct.unpack("<I",
-                                                   header[0:3] + '\x00')[0]
-                payload_length = struct.unpack("<I",
-                                               header[4:7] + '\x00')[0]
-                zip_payload = abyte
-                while len(zip_payload) < zip_payload_length:
-                    chunk = self.sock.recv(zip_payload_length
-                                           - len(zip_payload))
-                    if len(chunk) == 0:
-                        raise errors.InterfaceError(errno=2013)
-                    zip_payload = zip_payload + chunk
-                if payload_length == 0:
-                    self._split_zipped_payload(zip_payload)
-                    return self._packet_queue.popleft()
-                packets.append(header + zip_payload)
-                if payload_length != 16384:
-                    break
-                header = ''
-                abyte = self.sock.recv(1)
-                while abyte and len(header) < 7:
-                    header += abyte
-                    abyte = self.sock.recv(1)
+            while not self._packet_queue:
+                self._recv_compressed_packet()
         except IOError as err:
+            self._reset_recv_buffer()
             raise errors.OperationalError(
                 errno=2055, values=(self.get_address(), _strioerror(err)))
+        except self._codec.error as err:
+            raise errors.InterfaceError(
+                "Failed decompressing packet; {0}".format(err))
+        return self._packet_queue.popleft()
 
-        tmp = []
-        for packet in packets:
-            payload_length = struct.unpack("<I", header[4:7] + '\x00')[0]
-            if payload_length == 0:
-                tmp.append(packet[7:])
-            else:
-                tmp.append(zlib.decompress(packet[7:]))
+    def recv_compressed_view(self):
+        """Receive a compressed packet from the MySQL server
 
-        self._split_zipped_payload(''.join(tmp))
-        del tmp
+        Decompressed packets are not read through the receive buffer; the
+        packet returned by recv_compressed() is returned as is.
 
-        try:
-            return self._packet_queue.popleft()
-        except IndexError:
-            pass
+        Returns a string.
+        """
+        return self.recv_compressed()
 
     def set_connection_timeout(self, timeout):
         """Set the connection timeout"""
         self._connection_timeout = timeout
 
+    def set_read_timeout(self, timeout):
+        """Set the timeout for receiving packets
+
+        When timeout is None, the connection timeout is used.
+        """
+        self._read_timeout = timeout
+
+    def set_write_timeout(self, timeout):
+        """Set the timeout for sending packets
+
+        When timeout is None, the connection timeout is used.
+        """
+        self._write_timeout = timeout
+
+    def set_deadline(self, deadline):
+        """Set the time by which packets must have been sent and received
+
+        The deadline is a time as returned by time.time(), or None to
+        remove it. While a deadline is set, the timeouts for sending
+        and receiving packets are shortened so they fail once it has passed.
+        """
+        self._deadline = deadline
+
+    def _settimeout(self, timeout):
+        """Set the timeout of the socket unless it is already used"""
+        if timeout != self._timeout:
+            self.sock.settimeout(timeout)
+            self._timeout = timeout
+
+    def _apply_timeout(self, timeout):
+        """Set the timeout of the socket, shortened by the deadline
+
+        Raises socket.timeout when the deadline has passed.
+        """
+        if timeout is None:
+            timeout = self._connection_timeout
+        if self._deadline is not None:
+            remaining = self._deadline - time.time()
+            if remaining <= 0:
+                raise socket.timeout("deadline exceeded")
+            if timeout is None or remaining < timeout:
+                timeout = remaining
+        self._settimeout(timeout)
+
+    def _apply_read_timeout(self):
+        """Set the timeout of the socket for receiving packets
+
+        Raises socket.timeout when the deadline has passed.
+        """
+        self._apply_timeout(self._read_timeout)
+
+    def _apply_write_timeout(self):
+        """Set the timeout of the socket for sending packets
+
+        Raises socket.timeout when the deadline has passed.
+        """
+        self._apply_timeout(self._write_timeout)
+
 # pylint: disable=C0103
     def switch_to_ssl(self, ca, cert, key, verify_cert=False):
-        """Switch the socket to use SSL"""
+        """Switch the socket to use SSL
+
+        The SSLContext is shared with other connections using the same
+        configuration. Python versions without ssl.SSLContext fall back
+        to ssl.wrap_socket().
+        """
         if not self.sock:
             raise errors.InterfaceError(errno=2048)
 
-        if verify_cert:
-            cert_reqs = ssl.CERT_REQUIRED
-        else:
-            cert_reqs = ssl.CERT_NONE
-
         try:
-            self.sock = ssl.wrap_socket(
-                self.sock, keyfile=key, certfile=cert, ca_certs=ca,
-                cert_reqs=cert_reqs, do_handshake_on_connect=False,
-                ssl_version=ssl.PROTOCOL_TLSv1)
+            if hasattr(ssl, 'SSLContext'):
+                context = _get_ssl_context(ca, cert, key, verify_cert)
+                self.sock = context.wrap_socket(
+                    self.sock, do_handshake_on_connect=False)
+            else:
+                if verify_cert:
+                    cert_reqs = ssl.CERT_REQUIRED
+                else:
+                    cert_reqs = ssl.CERT_NONE
+                self.sock = ssl.wrap_socket(
+                    self.sock, keyfile=key, certfile=cert, ca_certs=ca,
+                    cert_reqs=cert_reqs, do_handshake_on_connect=False,
+                    ssl_version=ssl.PROTOCOL_SSLv23)
             self.sock.do_handshake()
         except NameError:
             raise errors.NotSupportedError(
@@ -326,6 +908,8 @@ class MySQLUnixSocket(BaseMySQLSocket):
         try:
             self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
             self.sock.settimeout(self._connection_timeout)
+            self._timeout = self._connection_timeout
+            _set_socket_options(self.sock, self._socket_options, tcp=False)
             self.sock.connect(self._unix_socket)
         except IOError as err:
             raise errors.InterfaceError(
@@ -337,54 +921,91 @@ class MySQLUnixSocket(BaseMySQLSocket):
 class MySQLTCPSocket(BaseMySQLSocket):
     """MySQL socket class using TCP/IP
 
-    Opens a TCP/IP connection to the MySQL Server.
+    Opens a TCP/IP connection to the MySQL Server. When hosts, a list of
+    (host, port) tuples, is given, the connection is made to the first
+    of these MySQL servers which can be reached; host and port are then
+    ignored. Hosts which failed are skipped for host_retry_delay seconds
+    unless all hosts failed. Resolved addresses are cached for
+    dns_cache_ttl seconds.
     """
-    def __init__(self, host='127.0.0.1', port=3306, force_ipv6=False):
+    def __init__(self, host='127.0.0.1', port=3306, force_ipv6=False,
+                 hosts=None, dns_cache_ttl=0, host_retry_delay=30):
         super(MySQLTCPSocket, self).__init__()
         self.server_host = host
         self.server_port = port
         self.force_ipv6 = force_ipv6
         self._family = 0
+        self._hosts = hosts or [(host, port)]
+        self._dns_cache_ttl = dns_cache_ttl
+        self._host_retry_delay = host_retry_delay
 
     def get_address(self):
         return "%s:%s" % (self.server_host, self.server_port)
 
+    def _get_addrinfos(self, host, port):
+        """Get the addresses to try for connecting to a MySQL server
+
+        IPv4 addresses are favored, unless IPv6 was forced in which case
+        only IPv6 addresses are returned.
+
+        Returns a list.
+        """
+        addrinfos = _getaddrinfo(host, port, self._dns_cache_ttl)
+        if self.force_ipv6:
+            addrinfos = [info for info in addrinfos
+                         if info[0] == socket.AF_INET6]
+            if not addrinfos:
+                raise errors.InterfaceError(
+                    "No IPv6 address found for %s" % host)
+            return addrinfos
+        return sorted(addrinfos, key=lambda info: info[0] != socket.AF_INET)
+
     def open_connection(self):
         """Open the TCP/IP connection to the MySQL server
+
+        Addresses of all hosts are tried, starting a new attempt when the
+        previous did not succeed quickly, and the first connection made
+        is used.
         """
+        now = time.time()
+        hosts = [host for host in self._hosts
+                 if _HOST_FAILURES.get(host, 0) + self._host_retry_delay
+                 <= now] or self._hosts
+
         # Get address information
-        addrinfo = None
-        try:
-            addrinfos = socket.getaddrinfo(self.server_host, self.server_port,
-                                           0, socket.SOCK_STREAM)
-            # If multiple results we favor IPv4, unless IPv6 was forced.
-            for info in addrinfos:
-                if self.force_ipv6 and info[0] == socket.AF_INET6:
-                    addrinfo = info
-                    break
-                elif info[0] == socket.AF_INET:
-                    addrinfo = info
-                    break
-            if self.force_ipv6 and not addrinfo:
-                raise errors.InterfaceError(
-                    "No IPv6 address found for %s" % self.server_host)
-            if not addrinfo:
-                addrinfo = addrinfos[0]
-        except IOError as err:
+        candidates = []
+        error = None
+        for host in hosts:
+            try:
+                candidates.extend([(host, info)
+                                   for info in self._get_addrinfos(*host)])
+            except IOError as err:
+                _HOST_FAILURES[host] = now
+                error = err
+        if not candidates:
+            (self.server_host, self.server_port) = hosts[0]
             raise errors.InterfaceError(
-                errno=2003, values=(self.get_address(), _strioerror(err)))
-
-        (self._family, socktype, proto, _, sockaddr) = addrinfo
+                errno=2003, values=(self.get_address(), _strioerror(error)))
 
         # Instanciate the socket and connect
         try:
-            self.sock = socket.socket(self._family, socktype, proto)
-            self.sock.settimeout(self._connection_timeout)
-            self.sock.connect(sockaddr)
+            (self.sock, host, failed) = _connect_any(
+                candidates, self._connection_timeout, self._socket_options)
         except IOError as err:
+            for host in hosts:
+                _HOST_FAILURES[host] = now
+                _DNS_CACHE.pop(host, None)
+            (self.server_host, self.server_port) = hosts[0]
             raise errors.InterfaceError(
                 errno=2003, values=(self.get_address(), _strioerror(err)))
         except StandardError as err:
             raise errors.InterfaceError(str(err))
-        except:
-            raise
+
+        for failed_host in failed - set([host]):
+            _HOST_FAILURES[failed_host] = now
+            _DNS_CACHE.pop(failed_host, None)
+        _HOST_FAILURES.pop(host, None)
+        (self.server_host, self.server_port) = host
+        self._family = self.sock.family
+        self.sock.settimeout(self._connection_timeout)
+        self._timeout = self._connection_timeout
@@ -33,15 +33,38 @@ try:
 except ImportError:
     from sha import new as sha1
 
-from mysql.connector.constants import (FieldFlag, ServerCmd, FieldType)
+from mysql.connector.constants import (
+    FieldFlag, ServerCmd, FieldType, ClientFlag)
 from mysql.connector import (errors, utils)
 
+# Precompiled structures for the fixed parts of server packets
+_HANDSHAKE = struct.Struct('<I8sxHBHH11x')
+_OK_STATUS = struct.Struct('<HH')
+_COLUMN_DEFINITION = struct.Struct('<xHIBHBxx')
+_EOF_PACKET = struct.Struct('<xxxxBHH')
+_BINARY_PREPARE_OK = struct.Struct('<IHHxH')
+
+# struct formats of fixed-width values in binary protocol rows
+_BINARY_FORMATS = {
+    FieldType.TINY: 'b',
+    FieldType.SHORT: 'h',
+    FieldType.INT24: 'i',
+    FieldType.LONG: 'i',
+    FieldType.LONGLONG: 'q',
+    FieldType.FLOAT: 'f',
+    FieldType.DOUBLE: 'd',
+}
+
 
 class MySQLProtocol(object):
     """
     Implemets MySQL client/server protocol.
     Creates and parse packets based on MySQL client/server protocol.
     """
+    def __init__(self):
+        self._binary_columns = None
+        self._binary_decoder = None
+
     def _scramble_password(self, passwd, seed):
         """Scramble a password ready to send to MySQL"""
         hash4 = None
@@ -85,17 +108,29 @@ class MySQLProtocol(object):
 
     def make_auth(self, seed, username=None, password=None, database=None,
                   charset=33, client_flags=0,
-                  max_allowed_packet=1073741824):
-        """Make a MySQL Authentication packet"""
+                  max_allowed_packet=1073741824, compress_level=3):
+        """Make a MySQL Authentication packet
+
+        The compress_level is the zstd compression level, sent when the
+        client flags contain ZSTD_COMPRESSION_ALGORITHM. The MySQL server
+        only accepts levels from 1 to 22.
+        """
         if not seed:
             raise errors.ProgrammingError('Seed missing')
+        if (client_flags & ClientFlag.ZSTD_COMPRESSION_ALGORITHM
+                and not 1 <= compress_level <= 22):
+            raise errors.ProgrammingError(
+                'zstd compression level should be from 1 to 22')
 
         auth = self._prepare_auth(username, password, database,
                                   client_flags, seed)
-        return utils.int4store(client_flags) +\
+        data = utils.int4store(client_flags) +\
                utils.int4store(max_allowed_packet) +\
                utils.int1store(charset) +\
                '\x00' * 23 + auth[0] + auth[1] + auth[2]
+        if client_flags & ClientFlag.ZSTD_COMPRESSION_ALGORITHM:
+            data += struct.pack('<B', compress_level)
+        return data
 
     def make_auth_ssl(self, charset=33, client_flags=0,
                       max_allowed_packet=1073741824):
@@ -127,18 +162,17 @@ class MySQLProtocol(object):
     def parse_handshake(self, packet):
         """Parse a MySQL Handshake-packet"""
         res = {}
-        (packet, res['protocol']) = utils.read_int(packet[4:], 1)
-        (packet, res['server_version_original']) = utils.read_string(
-            packet, end='\x00')
-        (packet, res['server_threadid']) = utils.read_int(packet, 4)
-        (packet, res['scramble']) = utils.read_bytes(packet, 8)
-        packet = packet[1:]  # Filler 1 * \x00
-        (packet, res['capabilities']) = utils.read_int(packet, 2)
-        (packet, res['charset']) = utils.read_int(packet, 1)
-        (packet, res['server_status']) = utils.read_int(packet, 2)
-        packet = packet[13:]  # Filler 13 * \x00
-        (packet, scramble_next) = utils.read_bytes(packet, 12)
-        res['scramble'] += scramble_next
+        reader = utils.PacketReader(packet, 4)
+        res['protocol'] = reader.read_int(1)
+        res['server_version_original'] = reader.read_string(end='\x00')
+        (res['server_threadid'],
+         res['scramble'],
+         res['capabilities'],
+         res['charset'],
+         res['server_status'],
+         capabilities_upper) = reader.unpack(_HANDSHAKE)
+        res['capabilities'] |= capabilities_upper << 16
+        res['scramble'] += reader.read_bytes(12)
         return res
 
     def parse_ok(self, packet):
@@ -148,15 +182,15 @@ class MySQLProtocol(object):
 
         ok_packet = {}
         try:
-            ok_packet['field_count'] = struct.unpack('<xxxxB', packet[0:5])[0]
-            (packet, ok_packet['affected_rows']) = utils.read_lc_int(packet[5:])
-            (packet, ok_packet['insert_id']) = utils.read_lc_int(packet)
+            ok_packet['field_count'] = ord(packet[4])
+            reader = utils.PacketReader(packet, 5)
+            ok_packet['affected_rows'] = reader.read_lc_int()
+            ok_packet['insert_id'] = reader.read_lc_int()
             (ok_packet['server_status'],
-                ok_packet['warning_count']) = struct.unpack('<HH', packet[0:4])
-            packet = packet[4:]
-            if packet:
-                (packet, ok_packet['info_msg']) = utils.read_lc_string(packet)
-        except ValueError:
+                ok_packet['warning_count']) = reader.unpack(_OK_STATUS)
+            if reader.remaining():
+                ok_packet['info_msg'] = reader.read_lc_string()
+        except (ValueError, struct.error):
             raise errors.InterfaceError("Failed parsing OK packet.")
         return ok_packet
 
@@ -169,16 +203,17 @@ class MySQLProtocol(object):
 
     def parse_column(self, packet):
         """Parse a MySQL column-packet"""
-        (packet, _) = utils.read_lc_string(packet[4:]) # catalog
-        (packet, _) = utils.read_lc_string(packet)  # db
-        (packet, _) = utils.read_lc_string(packet)  # table
-        (packet, _) = utils.read_lc_string(packet)  # org_table
-        (packet, name) = utils.read_lc_string(packet)  # name
-        (packet, _) = utils.read_lc_string(packet)  # org_name
+        reader = utils.PacketReader(packet, 4)
+        reader.skip_lc_string()  # catalog
+        reader.skip_lc_string()  # db
+        reader.skip_lc_string()  # table
+        reader.skip_lc_string()  # org_table
+        name = reader.read_lc_string()  # name
+        reader.skip_lc_string()  # org_name
 
         try:
             (_, _, field_type,
-             flags, _) = struct.unpack('<xHIBHBxx', packet)
+             flags, _) = reader.unpack(_COLUMN_DEFINITION)
         except struct.error:
             raise errors.InterfaceError("Failed parsing column information")
 
@@ -198,15 +233,15 @@ class MySQLProtocol(object):
         err_msg = "Failed parsing EOF packet."
         res = {}
         try:
-            unpacked = struct.unpack('<xxxBBHH', packet)
+            unpacked = _EOF_PACKET.unpack_from(packet)
         except struct.error:
             raise errors.InterfaceError(err_msg)
 
-        if not (unpacked[1] == 254 and len(packet) <= 9):
+        if not (unpacked[0] == 254 and len(packet) <= 9):
             raise errors.InterfaceError(err_msg)
 
-        res['warning_count'] = unpacked[2]
-        res['status_flag'] = unpacked[3]
+        res['warning_count'] = unpacked[1]
+        res['status_flag'] = unpacked[2]
         return res
 
     def parse_statistics(self, packet):
@@ -232,76 +267,111 @@ class MySQLProtocol(object):
                         "%s (%s:%s)." % (errmsg, lbl, val))
         return res
 
-    def read_text_result(self, sock, count=1):
+    def _parse_text_row(self, packet, offset, converters=None):
+        """Parse a text result row, converting the values when requested
+
+        Returns a tuple or None.
+        """
+        if converters is None:
+            return utils.read_lc_string_list(packet, offset)
+        try:
+            return utils.read_lc_values(packet, converters, offset)
+        except StandardError as err:
+            raise errors.InterfaceError(
+                "Failed converting row to Python types; %s" % err)
+
+    def read_text_result(self, sock, count=1, zero_copy=False,
+                         converters=None):
         """Read MySQL text result
 
         Reads all or given number of rows from the socket.
 
+        When zero_copy is True, packets are received as buffer objects over
+        the socket's receive buffer and only the column values are copied.
+
+        When converters is given, as returned by
+        MySQLConverter.row_converters(), the values are converted to Python
+        types while the rows are parsed.
+
         Returns a tuple with 2 elements: a list with all rows and
         the EOF packet.
         """
         rows = []
         eof = None
         rowdata = None
+        recv = sock.recv_view if zero_copy else sock.recv
         i = 0
         while True:
             if eof is not None:
                 break
             if i == count:
                 break
-            packet = sock.recv()
-            if packet.startswith('\xff\xff\xff'):
+            packet = recv()
+            if packet[0:3] == '\xff\xff\xff':
                 datas = [packet[4:]]
-                packet = sock.recv()
-                while packet.startswith('\xff\xff\xff'):
+                packet = recv()
+                while packet[0:3] == '\xff\xff\xff':
                     datas.append(packet[4:])
-                    packet = sock.recv()
+                    packet = recv()
                 if packet[4] == '\xfe':
                     eof = self.parse_eof(packet)
                 else:
                     datas.append(packet[4:])
-                rowdata = utils.read_lc_string_list(''.join(datas))
+                rowdata = self._parse_text_row(''.join(datas), 0, converters)
             elif packet[4] == '\xfe':
                 eof = self.parse_eof(packet)
                 rowdata = None
             else:
                 eof = None
-                rowdata = utils.read_lc_string_list(packet[4:])
+                rowdata = self._parse_text_row(packet, 4, converters)
             if eof is None and rowdata is not None:
                 rows.append(rowdata)
             i += 1
         return (rows, eof)
 
-    def _parse_binary_integer(self, packet, field):
-        """Parse an integer from a binary packet"""
-        if field[1] == FieldType.TINY:
-            format_ = 'b'
-            length = 1
-        elif field[1] == FieldType.SHORT:
-            format_ = 'h'
-            length = 2
-        elif field[1] in (FieldType.INT24, FieldType.LONG):
-            format_ = 'i'
-            length = 4
-        elif field[1] == FieldType.LONGLONG:
-            format_ = 'q'
-            length = 8
-
-        if field[7] & FieldFlag.UNSIGNED:
-            format_ = format_.upper()
-
-        return (packet[length:], struct.unpack(format_, packet[0:length])[0])
-
-    def _parse_binary_float(self, packet, field):
-        """Parse a float/double from a binary packet"""
-        if field[1] == FieldType.DOUBLE:
-            length = 8
-            format_ = 'd'
-        else:
-            length = 4
-            format_ = 'f'
+    def read_text_result_packed(self, sock, zero_copy=False,
+                                converters=None, spill_size=None):
+        """Read all rows of a MySQL text result without decoding them
+
+        The row payloads are stored in a utils.PackedRows object and only
+        parsed, and converted when converters is given, when accessed.
 
-        return (packet[length:], struct.unpack(format_, packet[0:length])[0])
+        When spill_size is given, a utils.SpooledRows object is used which
+        writes the payloads to a temporary file once more than spill_size
+        bytes are read.
+
+        Returns a tuple with 2 elements: a PackedRows object and
+        the EOF packet.
+        """
+        decode = lambda payload: self._parse_text_row(payload, 0, converters)
+        if spill_size is None:
+            rows = utils.PackedRows(decode)
+        else:
+            rows = utils.SpooledRows(decode, spill_size)
+        eof = None
+        recv = sock.recv_view if zero_copy else sock.recv
+        while eof is None:
+            packet = recv()
+            if packet[0:3] == '\xff\xff\xff':
+                datas = [packet[4:]]
+                packet = recv()
+                while packet[0:3] == '\xff\xff\xff':
+                    datas.append(packet[4:])
+                    packet = recv()
+                if packet[4] == '\xfe':
+                    eof = self.parse_eof(packet)
+                else:
+                    datas.append(packet[4:])
+                    rows.append(''.join(datas))
+            elif packet[4] == '\xfe':
+                eof = self.parse_eof(packet)
+            elif packet[4] == '\xff':
+                raise errors.get_exception(packet)
+            else:
+                rows.append(packet[4:])
+        if spill_size is not None:
+            rows.finish()
+        return (rows, eof)
 
     def _parse_binary_timestamp(self, packet, field):
         """Parse a timestamp from a binary packet"""
@@ -345,59 +415,125 @@ class MySQLProtocol(object):
 
         return (packet[length + 1:], tmp)
 
-    def _parse_binary_values(self, fields, packet):
-        """Parse values from a binary result packet"""
-        null_bitmap_length = (len(fields) + 7 + 2) // 8
-        null_bitmap = utils.intread(packet[0:null_bitmap_length])
-        packet = packet[null_bitmap_length:]
+    def _binary_row_decoder(self, columns):
+        """Get a function decoding binary rows of the given columns
 
-        values = []
-        for pos, field in enumerate(fields):
-            if null_bitmap & 1 << (pos + 2):
-                values.append(None)
+        The decoder is built once per result set. Consecutive fixed-width
+        columns are unpacked using one precompiled struct.Struct, other
+        columns are read using a function per column. The last decoder is
+        cached for as long as the same columns are used.
+
+        Returns a function taking the packet and the offset of the row.
+        """
+        if columns is self._binary_columns:
+            return self._binary_decoder
+
+        steps = []
+        run = []
+        for pos, field in enumerate(columns):
+            bit = 1 << (pos + 2)
+            try:
+                format_ = _BINARY_FORMATS[field[1]]
+            except KeyError:
+                pass
+            else:
+                if field[7] & FieldFlag.UNSIGNED and format_ not in 'fd':
+                    format_ = format_.upper()
+                run.append((bit, format_))
                 continue
-            elif field[1] in (FieldType.TINY, FieldType.SHORT,
-                              FieldType.INT24,
-                              FieldType.LONG, FieldType.LONGLONG):
-                (packet, value) = self._parse_binary_integer(packet, field)
-                values.append(value)
-            elif field[1] in (FieldType.DOUBLE, FieldType.FLOAT):
-                (packet, value) = self._parse_binary_float(packet, field)
-                values.append(value)
-            elif field[1] in (FieldType.DATETIME, FieldType.DATE,
-                              FieldType.TIMESTAMP):
-                (packet, value) = self._parse_binary_timestamp(packet, field)
-                values.append(value)
+
+            if run:
+                steps.append(self._binary_fixed_step(run))
+                run = []
+            if field[1] in (FieldType.DATETIME, FieldType.DATE,
+                            FieldType.TIMESTAMP):
+                steps.append((bit, None, (self._parse_binary_timestamp,
+                                          field)))
             elif field[1] == FieldType.TIME:
-                (packet, value) = self._parse_binary_time(packet, field)
-                values.append(value)
+                steps.append((bit, None, (self._parse_binary_time, field)))
             else:
-                (packet, value) = utils.read_lc_string(packet)
-                values.append(value)
+                steps.append((bit, None, (None, field)))
+        if run:
+            steps.append(self._binary_fixed_step(run))
+
+        null_bitmap_length = (len(columns) + 7 + 2) // 8
+
+        def decode(packet, offset=0):
+            """Decode a binary row starting at offset"""
+            null_bitmap = long(
+                packet[offset:offset + null_bitmap_length][::-1].encode('hex'),
+                16)
+            reader = utils.PacketReader(packet, offset + null_bitmap_length)
+            values = []
+            for mask, struct_, parts in steps:
+                if struct_ is not None:
+                    if not null_bitmap & mask:
+                        values.extend(reader.unpack(struct_))
+                        continue
+                    for bit, single in parts:
+                        if null_bitmap & bit:
+                            values.append(None)
+                        else:
+                            values.append(reader.unpack(single)[0])
+                elif null_bitmap & mask:
+                    values.append(None)
+                elif parts[0] is None:
+                    values.append(reader.read_lc_string())
+                else:
+                    data = reader.read_bytes(ord(packet[reader.pos]) + 1)
+                    values.append(parts[0](data, parts[1])[1])
+            return tuple(values)
+
+        self._binary_columns = columns
+        self._binary_decoder = decode
+        return decode
 
-        return tuple(values)
+    def _binary_fixed_step(self, run):
+        """Make a decoder step for consecutive fixed-width columns
+
+        Returns a tuple with the mask of the columns in the NULL-bitmap,
+        the struct.Struct of all values and, for rows having NULL values,
+        the NULL-bitmap bit and struct.Struct of each column.
+        """
+        mask = 0
+        for bit, _ in run:
+            mask |= bit
+        return (mask,
+                struct.Struct('<' + ''.join([fmt for _, fmt in run])),
+                tuple([(bit, struct.Struct('<' + fmt)) for bit, fmt in run]))
+
+    def _parse_binary_values(self, fields, packet):
+        """Parse values from a binary result packet"""
+        return self._binary_row_decoder(fields)(packet)
 
-    def read_binary_result(self, sock, columns, count=1):
+    def read_binary_result(self, sock, columns, count=1, zero_copy=False):
         """Read MySQL binary protocol result
 
         Reads all or given number of binary resultset rows from the socket.
+
+        When zero_copy is True, packets are received as buffer objects over
+        the socket's receive buffer and only the column values are copied.
         """
         rows = []
         eof = None
         values = None
+        recv = sock.recv_view if zero_copy else sock.recv
+        decode = self._binary_row_decoder(columns)
         i = 0
         while True:
             if eof is not None:
                 break
             if i == count:
                 break
-            packet = sock.recv()
+            packet = recv()
             if packet[4] == '\xfe':
                 eof = self.parse_eof(packet)
                 values = None
             elif packet[4] == '\x00':
                 eof = None
-                values = self._parse_binary_values(columns, packet[5:])
+                values = decode(packet, 5)
+            elif packet[4] == '\xff':
+                raise errors.get_exception(packet)
             if eof is None and values is not None:
                 rows.append(values)
             i += 1
@@ -410,12 +546,12 @@ class MySQLProtocol(object):
 
         ok_packet = {}
         try:
-            (packet, ok_packet['statement_id']) = utils.read_int(packet[5:], 4)
-            (packet, ok_packet['num_columns']) = utils.read_int(packet, 2)
-            (packet, ok_packet['num_params']) = utils.read_int(packet, 2)
-            packet = packet[1:]  # Filler 1 * \x00
-            (packet, ok_packet['warning_count']) = utils.read_int(packet, 2)
-        except ValueError:
+            (ok_packet['statement_id'],
+             ok_packet['num_columns'],
+             ok_packet['num_params'],
+             ok_packet['warning_count']) = _BINARY_PREPARE_OK.unpack_from(
+                 packet, 5)
+        except struct.error:
             raise errors.InterfaceError("Failed parsing Binary OK packet")
 
         return ok_packet
@@ -543,9 +679,19 @@ class MySQLProtocol(object):
             data)
         return packet
 
+    def make_stmt_fetch(self, statement_id, rows=1):
+        """Make a MySQL packet with the Statement Fetch command"""
+        return utils.int4store(statement_id) + utils.int4store(rows)
+
     def make_stmt_execute(self, statement_id, data=(), parameters=(),
-                          flags=0, long_data_used=None):
-        """Make a MySQL packet with the Statement Execute command"""
+                          flags=0, long_data_used=None, bound_types=None):
+        """Make a MySQL packet with the Statement Execute command
+
+        The bound_types argument is a dict() mapping statement IDs to the
+        parameter types last sent to the MySQL server. When given, the
+        types are only sent when they differ from the ones already bound,
+        and the dictionary is updated.
+        """
         iteration_count = 1
         null_bitmap = [0] * ((len(data) + 7) // 8)
         values = []
@@ -560,7 +706,7 @@ class MySQLProtocol(object):
                     " match number of parameters")
             for pos, _ in enumerate(parameters):
                 value = data[pos]
-                flags = 0
+                param_flags = 0
                 if value is None:
                     null_bitmap[(pos // 8)] |= 1 << (pos % 8)
                     continue
@@ -573,7 +719,7 @@ class MySQLProtocol(object):
                         field_type = FieldType.STRING
                 elif isinstance(value, (int, long)):
                     (packed, field_type,
-                     flags) = self._prepare_binary_integer(value)
+                     param_flags) = self._prepare_binary_integer(value)
                     values.append(packed)
                 elif isinstance(value, str):
                     values.append(utils.intstore(len(value)) + value)
@@ -597,15 +743,27 @@ class MySQLProtocol(object):
                         "'{classname}' objects".format(
                             classname=value.__class__.__name__))
                 types.append(utils.int1store(field_type) +
-                             utils.int1store(flags))
+                             utils.int1store(param_flags))
+
+        new_params_bound = 1
+        types = ''.join(types)
+        if bound_types is not None:
+            if len(types) != 2 * len(parameters):
+                # NULL values have no type; bind all types next time
+                bound_types.pop(statement_id, None)
+            elif bound_types.get(statement_id) == types:
+                new_params_bound = 0
+                types = ''
+            else:
+                bound_types[statement_id] = types
 
         packet = (
             utils.int4store(statement_id),
             utils.int1store(flags),
             utils.int4store(iteration_count),
             ''.join([struct.pack('B', bit) for bit in null_bitmap]),
-            utils.int1store(1),
-            ''.join(types),
+            utils.int1store(new_params_bound),
+            types,
             ''.join(values)
             )
         return ''.join(packet)
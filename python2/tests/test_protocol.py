@@ -279,8 +279,8 @@ class MySQLProtocolTests(tests.MySQLConnectorTests):
             self.assertEqual(exp,
                              self._protocol.parse_binary_prepare_ok(packet))
     
-    def test__parse_binary_integer(self):
-        """Parse an integer from a binary packet"""
+    def test__binary_row_decoder_integers(self):
+        """Decode integers from a binary row"""
         # Case = Expected value; pack format; field type; field flag
         cases = [
             (-128, 'b', FieldType.TINY, 0),
@@ -292,18 +292,16 @@ class MySQLProtocolTests(tests.MySQLConnectorTests):
             (4294967295, 'I', FieldType.LONG, FieldFlag.UNSIGNED),
             (9999999999, 'Q', FieldType.LONGLONG, FieldFlag.UNSIGNED),
         ]
-        field_info = [None] * 8
-        field_info[0] = 'c1'
-        for exp, format, field_type, flag in cases:
-            field_info[1] = field_type
-            field_info[7] = flag
-            data = struct.pack(format, exp) + '\x00\x00'
-            res = self._protocol._parse_binary_integer(data, field_info)
-            self.assertEqual(('\x00\x00', exp), res,
+        for exp, fmt, field_type, flag in cases:
+            field_info = ['c1', field_type, None, None, None, None, None,
+                          flag]
+            data = '\x00' + struct.pack('<' + fmt, exp)
+            decode = self._protocol._binary_row_decoder([field_info])
+            self.assertEqual((exp,), decode(data),
                              "Failed parsing binary integer '{0}'".format(exp))
-    
-    def test__parse_binary_float(self):
-        """Parse a float/double from a binary packet"""
+
+    def test__binary_row_decoder_floats(self):
+        """Decode floats and doubles from a binary row"""
         # Case = Expected value; data; field type
         cases = [
             (-3.14159, '\x6e\x86\x1b\xf0\xf9\x21\x09\xc0', FieldType.DOUBLE),
@@ -311,18 +309,13 @@ class MySQLProtocolTests(tests.MySQLConnectorTests):
             (-3.14, '\xc3\xf5\x48\xc0', FieldType.FLOAT),
             (3.14, '\xc3\xf5\x48\x40', FieldType.FLOAT),
         ]
-        field_info = [None] * 8
-        field_info[0] = 'c1'
         for exp, data, field_type in cases:
-            field_info[1] = field_type
-            res = self._protocol._parse_binary_float(data + '\x00\x00',
-                                                     field_info)
-            self.assertEqual('\x00\x00', res[0],
-                             "Failed parsing binary float '{0}'".format(exp))
+            field_info = ['c1', field_type, None, None, None, None, None, 0]
+            decode = self._protocol._binary_row_decoder([field_info])
             self.assertAlmostEqual(
-                exp, res[1], places=5,
+                exp, decode('\x00' + data)[0], places=5,
                 msg="Failed parsing binary float '{0}'".format(exp))
-    
+
     def test__parse_binary_timestamp(self):
         """Parse a timestamp from a binary packet"""
         # Case = Expected value; data
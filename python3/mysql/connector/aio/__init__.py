@@ -0,0 +1,90 @@
+# MySQL Connector/Python - MySQL driver written in Python.
+# Copyright (c) 2013, Oracle and/or its affiliates. All rights reserved.
+
+# MySQL Connector/Python is licensed under the terms of the GPLv2
+# <http://www.gnu.org/licenses/old-licenses/gpl-2.0.html>, like most
+# MySQL Connectors. There are special exceptions to the terms and
+# conditions of the GPLv2 as it is applied to this software, see the
+# FOSS License Exception
+# <http://www.mysql.com/about/legal/licensing/foss-exception.html>.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+"""MySQL Connector/Python using asyncio
+
+Connections, cursors and pools of this package communicate with the MySQL
+server using asyncio streams. Methods talking to the server are
+coroutines:
+
+  cnx = await mysql.connector.aio.connect(user='scott', database='test')
+  cur = cnx.cursor()
+  await cur.execute("SELECT id, name FROM t1")
+  async for row in cur:
+      print(row)
+  await cnx.close()
+"""
+
+from mysql.connector.errors import PoolError, InterfaceError
+from mysql.connector.pooling import CNX_POOL_ARGS
+from mysql.connector.aio.connection import MySQLConnection
+from mysql.connector.aio.cursor import (
+    MySQLCursor, MySQLCursorBuffered, MySQLCursorRaw, MySQLCursorBufferedRaw)
+from mysql.connector.aio.pooling import (
+    MySQLConnectionPool, PooledMySQLConnection, generate_pool_name)
+
+_CONNECTION_POOLS = {}
+
+
+async def connect(**kwargs):
+    """Create or get an asyncio MySQL connection object
+
+    Opens a connection to the MySQL server and returns a MySQLConnection
+    object. When any connection pooling arguments are given, for example
+    pool_name or pool_size, a pool is created or a previously one is used
+    to return a PooledMySQLConnection.
+
+    Returns MySQLConnection or PooledMySQLConnection.
+    """
+    # Pooled connections
+    if any([key in kwargs for key in CNX_POOL_ARGS]):
+        # If no pool name specified, generate one
+        try:
+            pool_name = kwargs['pool_name']
+        except KeyError:
+            pool_name = generate_pool_name(**kwargs)
+
+        # No lock needed: the event loop does not switch tasks here
+        if pool_name not in _CONNECTION_POOLS:
+            _CONNECTION_POOLS[pool_name] = MySQLConnectionPool(**kwargs)
+        elif ('pool_size' in kwargs and
+              kwargs['pool_size'] != _CONNECTION_POOLS[pool_name].pool_size):
+            raise PoolError("Size can not be changed for active pools.")
+
+        # Return pooled connection
+        try:
+            return await _CONNECTION_POOLS[pool_name].get_connection()
+        except AttributeError:
+            raise InterfaceError(
+                "Failed getting connection from pool '{0}'".format(pool_name))
+
+    # Regular connection
+    cnx = MySQLConnection(**kwargs)
+    await cnx.connect()
+    return cnx
+
+__all__ = [
+    'connect', 'MySQLConnection', 'MySQLConnectionPool',
+    'PooledMySQLConnection', 'MySQLCursor', 'MySQLCursorBuffered',
+    'MySQLCursorRaw', 'MySQLCursorBufferedRaw',
+    ]
@@ -0,0 +1,712 @@
+# MySQL Connector/Python - MySQL driver written in Python.
+# Copyright (c) 2013, Oracle and/or its affiliates. All rights reserved.
+
+# MySQL Connector/Python is licensed under the terms of the GPLv2
+# <http://www.gnu.org/licenses/old-licenses/gpl-2.0.html>, like most
+# MySQL Connectors. There are special exceptions to the terms and
+# conditions of the GPLv2 as it is applied to this software, see the
+# FOSS License Exception
+# <http://www.mysql.com/about/legal/licensing/foss-exception.html>.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+"""Implementing communication with MySQL servers using asyncio.
+"""
+
+import asyncio
+import re
+
+from mysql.connector import connection, errors
+from mysql.connector.constants import (
+    ClientFlag, ServerCmd, CharacterSet, ShutdownType, NET_BUFFER_LENGTH)
+from mysql.connector.protocol import MySQLProtocol
+from mysql.connector.utils import int4store
+from mysql.connector.aio.network import MySQLStreamSocket, PacketQueue
+from mysql.connector.aio.cursor import (
+    MySQLCursor, MySQLCursorBuffered, MySQLCursorRaw, MySQLCursorBufferedRaw)
+
+# Options of mysql.connector.MySQLConnection without effect for asyncio
+# connections; only their default values are accepted.
+_UNSUPPORTED_OPTIONS = (
+    'read_timeout', 'write_timeout', 'kill_query_on_timeout', 'recvsize',
+    'zero_copy', 'compact_buffered', 'dns_cache_ttl', 'host_retry_delay',
+    'prepared_cache_size',
+)
+
+
+class MySQLConnection(connection.MySQLConnection):
+    """Connection to a MySQL Server using asyncio
+
+    The connection is configured like mysql.connector.MySQLConnection, but
+    every method communicating with the MySQL server is a coroutine. The
+    packets are built and parsed by MySQLProtocol and the values converted
+    by the converter class, like for blocking connections.
+
+    Settings which need a round trip, like autocommit or the current
+    database, are changed and read using coroutines such as
+    set_autocommit() and get_autocommit(); the properties report the
+    configured value.
+
+    Compression, SSL, the binary protocol (prepared statements),
+    connecting to one of several hosts, timeouts for reading and writing
+    packets and the options tuning how result sets are received are not
+    supported.
+    """
+    def __init__(self, **kwargs):
+        super().__init__()
+        if kwargs:
+            self.config(**kwargs)
+
+    def config(self, *args, **kwargs):
+        """Configure the MySQL Connection
+
+        Raises NotSupportedError when compression, SSL, several hosts or
+        another option not supported by asyncio connections is given.
+        """
+        if kwargs.get('compress') or any(
+                kwargs.get(key) for key in ('ssl_ca', 'ssl_cert', 'ssl_key')):
+            raise errors.NotSupportedError(
+                "Compression and SSL are not supported by asyncio "
+                "connections")
+        unsupported = [
+            key for key in _UNSUPPORTED_OPTIONS
+            if key in kwargs
+            and kwargs[key] != connection.DEFAULT_CONFIGURATION[key]]
+        if unsupported:
+            raise errors.NotSupportedError(
+                "Option(s) {} not supported by asyncio connections".format(
+                    ', '.join(sorted(unsupported))))
+        super().config(*args, **kwargs)
+
+    def _set_hosts(self, hosts):
+        """Set the MySQL server to connect to
+
+        Raises NotSupportedError when more than one host is given.
+        """
+        super()._set_hosts(hosts)
+        if self._hosts:
+            self._hosts = None
+            raise errors.NotSupportedError(
+                "Connecting to one of several hosts is not supported by "
+                "asyncio connections")
+
+    def _get_connection(self, prtcls=None):
+        """Get connection based on configuration"""
+        conn = MySQLStreamSocket(host=self.server_host,
+                                 port=self.server_port,
+                                 unix_socket=self.unix_socket,
+                                 force_ipv6=self._force_ipv6)
+        conn.set_connection_timeout(self._connection_timeout)
+        conn.set_socket_options(
+            tcp_nodelay=self._tcp_nodelay, keepalive=self._keepalive,
+            keepalive_idle=self._keepalive_idle,
+            keepalive_interval=self._keepalive_interval,
+            keepalive_count=self._keepalive_count,
+            recv_buffer_size=self._recv_buffer_size,
+            send_buffer_size=self._send_buffer_size)
+        return conn
+
+    async def _do_handshake(self):
+        """Get the handshake from the MySQL server"""
+        packet = await self._socket.recv()
+        if packet[4] == 255:
+            raise errors.get_exception(packet)
+
+        try:
+            handshake = self._protocol.parse_handshake(packet)
+        except Exception as err:
+            raise errors.InterfaceError(
+                'Failed parsing handshake; {}'.format(err))
+
+        regex_ver = re.compile(br"^(\d{1,2})\.(\d{1,2})\.(\d{1,3})(.*)")
+        match = regex_ver.match(handshake['server_version_original'])
+        if not match:
+            raise errors.InterfaceError("Failed parsing MySQL version")
+
+        version = tuple([int(v) for v in match.groups()[0:3]])
+        if version < (4, 1):
+            raise errors.InterfaceError(
+                "MySQL Version '{}' is not supported.".format(
+                    handshake['server_version_original']))
+
+        self._handshake = handshake
+        self._server_version = version
+
+    async def _do_auth(self, username=None, password=None, database=None,
+                       client_flags=0, charset=33, ssl_options=None):
+        """Authenticate with the MySQL server"""
+        packet = self._protocol.make_auth(
+            seed=self._handshake['scramble'],
+            username=username, password=password, database=database,
+            charset=charset, client_flags=client_flags)
+        await self._socket.send(packet)
+        packet = await self._socket.recv()
+
+        if packet[4] == 254:
+            raise errors.NotSupportedError(
+                "Authentication with old (insecure) passwords "
+                "is not supported. For more information, lookup "
+                "Password Hashing in the latest MySQL manual")
+        elif packet[4] == 255:
+            raise errors.get_exception(packet)
+
+        if not (client_flags & ClientFlag.CONNECT_WITH_DB) and database:
+            await self.cmd_init_db(database)
+
+        return True
+
+    async def _open_connection(self):
+        """Open the connection to the MySQL server"""
+        self._socket = self._get_connection()
+        await self._socket.open_connection()
+        await self._do_handshake()
+        await self._do_auth(self._user, self._password, self._database,
+                            self._client_flags & ~ClientFlag.SSL,
+                            self._charset_id)
+        self.set_converter_class(self._converter_class)
+
+    async def _post_connection(self):
+        """Executes commands after connection has been established"""
+        await self.set_charset_collation(self._charset_id)
+        await self.set_autocommit(self._autocommit)
+        if self._time_zone:
+            await self.set_time_zone(self._time_zone)
+        if self._sql_mode:
+            await self.set_sql_mode(self._sql_mode)
+
+    async def connect(self, **kwargs):
+        """Connect to the MySQL server
+
+        This method sets up the connection to the MySQL server. If no
+        arguments are given, it will use the already configured or default
+        values.
+        """
+        if kwargs:
+            self.config(**kwargs)
+
+        self._protocol = MySQLProtocol()
+
+        await self.disconnect()
+        await self._open_connection()
+        await self._post_connection()
+
+    async def disconnect(self):
+        """Disconnect from the MySQL server"""
+        if not self._socket:
+            return
+
+        try:
+            await self.cmd_quit()
+        except (AttributeError, errors.Error):
+            pass  # Getting an exception would mean we are disconnected.
+        await self._socket.close_connection()
+    close = disconnect
+
+    async def _send_cmd(self, command, argument=None, packet_number=0,
+                        packet=None, expect_response=True):
+        """Send a command to the MySQL server
+
+        Returns a MySQL packet or None.
+        """
+        if self.unread_result:
+            raise errors.InternalError("Unread result found.")
+
+        try:
+            payload = (self._protocol.make_command(command),
+                       packet or argument or b'')
+            await self._socket.send(payload, packet_number)
+        except AttributeError:
+            raise errors.OperationalError("MySQL Connection not available.")
+
+        if not expect_response:
+            return None
+        return await self._socket.recv()
+
+    async def _send_data(self, data_file, send_empty_packet=False):
+        """Send data to the MySQL server
+
+        Returns a MySQL packet.
+        """
+        if self.unread_result:
+            raise errors.InternalError("Unread result found.")
+
+        if not hasattr(data_file, 'read'):
+            raise ValueError("expecting a file-like object")
+
+        try:
+            buf = data_file.read(NET_BUFFER_LENGTH - 16)
+            while buf:
+                await self._socket.send(buf)
+                buf = data_file.read(NET_BUFFER_LENGTH - 16)
+            if send_empty_packet:
+                await self._socket.send(b'')
+        except AttributeError:
+            raise errors.OperationalError("MySQL Connection not available.")
+
+        return await self._socket.recv()
+
+    async def _handle_load_data_infile(self, filename):
+        """Handle a LOAD DATA INFILE LOCAL request"""
+        try:
+            data_file = open(filename, 'rb')
+        except IOError:
+            # Send a empty packet to cancel the operation
+            try:
+                await self._socket.send(b'')
+            except AttributeError:
+                raise errors.OperationalError(
+                    "MySQL Connection not available.")
+            raise errors.InterfaceError("File '{0}' could not be read".format(
+                                        filename))
+
+        with data_file:
+            return self._handle_ok(
+                await self._send_data(data_file, send_empty_packet=True))
+
+    async def _handle_result(self, packet):
+        """Handle a MySQL Result
+
+        Returns a dict()
+        """
+        if not packet or len(packet) < 4:
+            raise errors.InterfaceError('Empty response')
+        elif packet[4] == 0:
+            return self._handle_ok(packet)
+        elif packet[4] == 251:
+            return await self._handle_load_data_infile(packet[5:])
+        elif packet[4] == 254:
+            return self._handle_eof(packet)
+        elif packet[4] == 255:
+            raise errors.get_exception(packet)
+
+        # We have a text result set
+        column_count = self._protocol.parse_column_count(packet)
+        if not column_count or not isinstance(column_count, int):
+            raise errors.InterfaceError('Illegal result set.')
+
+        columns = [None] * column_count
+        for i in range(0, column_count):
+            columns[i] = self._protocol.parse_column(
+                await self._socket.recv())
+
+        eof = self._handle_eof(await self._socket.recv())
+        self.unread_result = True
+        return {'columns': columns, 'eof': eof}
+
+    async def get_rows(self, count=None, converters=None):
+        """Get all rows returned by the MySQL server
+
+        At most count rows are read when count is given. Text result rows
+        are converted to Python types while reading them when converters,
+        as returned by MySQLConverter.row_converters(), is given.
+
+        Returns a tuple()
+        """
+        if not self.unread_result:
+            raise errors.InternalError("No result set available.")
+
+        try:
+            packets = await self._socket.recv_rows(count)
+        except errors.Error:
+            self.unread_result = False
+            raise
+        rows = self._protocol.read_text_result(
+            PacketQueue(packets), count, converters=converters)
+        if rows[-1] is not None:
+            self._handle_server_status(rows[-1]['status_flag'])
+            self.unread_result = False
+
+        return rows
+
+    async def get_row(self, converters=None):
+        """Get the next rows returned by the MySQL server
+
+        Returns a tuple.
+        """
+        (rows, eof) = await self.get_rows(count=1, converters=converters)
+        if rows:
+            return (rows[0], eof)
+        return (None, eof)
+
+    async def cmd_init_db(self, database):
+        """Change the current database
+
+        Returns a dict()
+        """
+        return self._handle_ok(
+            await self._send_cmd(ServerCmd.INIT_DB, database.encode('utf-8')))
+
+    async def cmd_query(self, query):
+        """Send a query to the MySQL server
+
+        Returns a dict()
+        """
+        if not isinstance(query, bytes):
+            query = query.encode('utf-8')
+        result = await self._handle_result(
+            await self._send_cmd(ServerCmd.QUERY, query))
+
+        if self._have_next_result:
+            raise errors.InterfaceError(
+                'Use cmd_query_iter for statements with multiple queries.')
+
+        return result
+
+    async def cmd_query_iter(self, statements):
+        """Send one or more statements to the MySQL server
+
+        Returns an asynchronous generator of the results.
+        """
+        if not isinstance(statements, bytes):
+            statements = statements.encode('utf-8')
+
+        # Handle the first query result
+        yield await self._handle_result(
+            await self._send_cmd(ServerCmd.QUERY, statements))
+
+        # Handle next results, if any
+        while self._have_next_result:
+            if self.unread_result:
+                raise errors.InternalError("Unread result found.")
+            yield await self._handle_result(await self._socket.recv())
+
+    async def cmd_refresh(self, options):
+        """Send the Refresh command to the MySQL server
+
+        Returns a dict()
+        """
+        return self._handle_ok(
+            await self._send_cmd(ServerCmd.REFRESH, int4store(options)))
+
+    async def cmd_quit(self):
+        """Close the current connection with the server
+
+        Returns a str()
+        """
+        if self.unread_result:
+            raise errors.InternalError("Unread result found.")
+
+        packet = self._protocol.make_command(ServerCmd.QUIT)
+        await self._socket.send(packet, 0)
+        return packet
+
+    async def cmd_shutdown(self, shutdown_type=None):
+        """Shut down the MySQL Server
+
+        Returns a dict()
+        """
+        if shutdown_type:
+            if not ShutdownType.get_info(shutdown_type):
+                raise errors.InterfaceError("Invalid shutdown type")
+            atype = shutdown_type
+        else:
+            atype = ShutdownType.SHUTDOWN_DEFAULT
+        return self._handle_eof(
+            await self._send_cmd(ServerCmd.SHUTDOWN, atype))
+
+    async def cmd_statistics(self):
+        """Send the statistics command to the MySQL Server
+
+        Returns a dict()
+        """
+        if self.unread_result:
+            raise errors.InternalError("Unread result found.")
+
+        packet = self._protocol.make_command(ServerCmd.STATISTICS)
+        await self._socket.send(packet, 0)
+        return self._protocol.parse_statistics(await self._socket.recv())
+
+    async def cmd_process_kill(self, mysql_pid):
+        """Kill a MySQL process
+
+        Returns a dict()
+        """
+        return self._handle_ok(
+            await self._send_cmd(ServerCmd.PROCESS_KILL, int4store(mysql_pid)))
+
+    async def cmd_debug(self):
+        """Send the DEBUG command
+
+        Returns a dict()
+        """
+        return self._handle_eof(await self._send_cmd(ServerCmd.DEBUG))
+
+    async def cmd_ping(self):
+        """Send the PING command
+
+        Returns a dict()
+        """
+        return self._handle_ok(await self._send_cmd(ServerCmd.PING))
+
+    async def cmd_change_user(self, username='', password='', database='',
+                              charset=33):
+        """Change the current logged in user
+
+        Returns a dict()
+        """
+        if self.unread_result:
+            raise errors.InternalError("Unread result found.")
+
+        packet = self._protocol.make_change_user(
+            seed=self._handshake['scramble'],
+            username=username, password=password, database=database,
+            charset=charset, client_flags=self._client_flags)
+        await self._socket.send(packet, 0)
+        return self._handle_ok(await self._socket.recv())
+
+    def _not_supported(self, *args, **kwargs):
+        """Prepared statements, pipelining and deadlines are not supported
+
+        Every method of mysql.connector.MySQLConnection communicating with
+        the MySQL server which has no coroutine counterpart is replaced by
+        this method, so blocking I/O can not be used by accident.
+        """
+        raise errors.NotSupportedError(
+            "Prepared statements, pipelining and statement deadlines are "
+            "not supported by asyncio connections")
+    cmd_stmt_prepare = cmd_stmt_execute = cmd_stmt_close = _not_supported
+    cmd_stmt_send_long_data = cmd_stmt_reset = _not_supported
+    cmd_stmt_execute_pipeline = cmd_stmt_fetch = _not_supported
+    _stmt_prepare_cached = _handle_binary_result = _not_supported
+    _read_stmt_pipeline_result = _not_supported
+    cmd_query_pipeline = _read_query_pipeline_result = _not_supported
+    _set_deadline = _check_deadline = _kill_thread = _not_supported
+
+    async def is_connected(self):
+        """Reports whether the connection to MySQL Server is available
+
+        Returns True or False.
+        """
+        try:
+            await self.cmd_ping()
+        except:
+            return False  # This method does not raise
+        return True
+
+    async def reconnect(self, attempts=1, delay=0):
+        """Attempt to reconnect to the MySQL server
+
+        Raises InterfaceError on errors.
+        """
+        counter = 0
+        while counter != attempts:
+            counter = counter + 1
+            try:
+                await self.disconnect()
+                await self.connect()
+                if await self.is_connected():
+                    break
+            except Exception as err:  # pylint: disable=W0703
+                if counter == attempts:
+                    msg = "Can not reconnect to MySQL after {} "\
+                          "attempt(s): {}".format(attempts, str(err))
+                    raise errors.InterfaceError(msg)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    async def ping(self, reconnect=False, attempts=1, delay=0):
+        """Check availability to the MySQL server
+
+        Raises InterfaceError on errors.
+        """
+        try:
+            await self.cmd_ping()
+        except:
+            if reconnect:
+                await self.reconnect(attempts=attempts, delay=delay)
+            else:
+                raise errors.InterfaceError("Connection to MySQL is"
+                                            " not available.")
+
+    async def set_charset_collation(self, charset=None, collation=None):
+        """Sets the character set and collation for the current connection
+        """
+        if charset:
+            if isinstance(charset, int):
+                self._charset_id = charset
+                (charset_name, collation_name) = CharacterSet.get_info(
+                    self._charset_id)
+            elif isinstance(charset, str):
+                (self._charset_id, charset_name, collation_name) = \
+                    CharacterSet.get_charset_info(charset, collation)
+            else:
+                raise ValueError(
+                    "charset should be either integer, string or None")
+        elif collation:
+            (self._charset_id, charset_name, collation_name) = \
+                    CharacterSet.get_charset_info(collation=collation)
+
+        await self._execute_query("SET NAMES '{}' COLLATE '{}'".format(
+            charset_name, collation_name))
+        self.converter.set_charset(charset_name)
+
+    async def set_database(self, value):
+        """Set the current database"""
+        await self.cmd_query("USE %s" % value)
+        self._database = value
+
+    async def get_database(self):
+        """Get the current database"""
+        return (await self._info_query("SELECT DATABASE()"))[0]
+
+    @property
+    def database(self):
+        """Database configured or set using set_database()"""
+        return self._database
+
+    async def set_time_zone(self, value):
+        """Set the time zone"""
+        await self.cmd_query("SET @@session.time_zone = '{}'".format(value))
+        self._time_zone = value
+
+    async def get_time_zone(self):
+        """Get the current time zone"""
+        return (await self._info_query("SELECT @@session.time_zone"))[0]
+
+    @property
+    def time_zone(self):
+        """Time zone configured or set using set_time_zone()"""
+        return self._time_zone
+
+    async def set_sql_mode(self, value):
+        """Set the SQL mode"""
+        if isinstance(value, (list, tuple)):
+            value = ','.join(value)
+        await self.cmd_query("SET @@session.sql_mode = '{}'".format(value))
+        self._sql_mode = value
+
+    async def get_sql_mode(self):
+        """Get the SQL mode"""
+        return (await self._info_query("SELECT @@session.sql_mode"))[0]
+
+    @property
+    def sql_mode(self):
+        """SQL mode configured or set using set_sql_mode()"""
+        return self._sql_mode
+
+    async def set_autocommit(self, value):
+        """Toggle autocommit"""
+        switch = 'ON' if value else 'OFF'
+        await self._execute_query(
+            "SET @@session.autocommit = {}".format(switch))
+        self._autocommit = value
+
+    async def get_autocommit(self):
+        """Get whether autocommit is on or off"""
+        value = (await self._info_query("SELECT @@session.autocommit"))[0]
+        return True if value == 1 else False
+
+    @property
+    def autocommit(self):
+        """Autocommit configured or set using set_autocommit()"""
+        return self._autocommit
+
+    def cursor(self, buffered=None, raw=None, prepared=None,
+               cursor_class=None, prefetch=None):
+        """Instantiates and returns a cursor
+
+        By default, an asyncio MySQLCursor is returned. Depending on the
+        options while connecting, a buffered and/or raw cursor instantiated
+        instead. A custom cursor_class must be a subclass of
+        mysql.connector.aio.cursor.MySQLCursor.
+
+        Raises NotSupportedError for prepared and prefetching cursors.
+        Returns a cursor-object
+        """
+        if self._unread_result is True:
+            raise errors.InternalError("Unread result found.")
+        if not self._socket:
+            raise errors.OperationalError("MySQL Connection not available.")
+        if prepared or prefetch is not None:
+            raise errors.NotSupportedError(
+                "Prepared and prefetching cursors are not supported by "
+                "asyncio connections")
+        if cursor_class is not None:
+            if not issubclass(cursor_class, MySQLCursor):
+                raise errors.ProgrammingError(
+                    "Cursor class needs be to subclass of "
+                    "aio.cursor.MySQLCursor")
+            return (cursor_class)(self)
+
+        buffered = buffered or self._buffered
+        raw = raw or self._raw
+
+        cursor_type = 0
+        if buffered is True:
+            cursor_type |= 1
+        if raw is True:
+            cursor_type |= 2
+
+        types = (
+            MySQLCursor,  # 0
+            MySQLCursorBuffered,
+            MySQLCursorRaw,
+            MySQLCursorBufferedRaw,
+        )
+        return (types[cursor_type])(self)
+
+    async def start_transaction(self, consistent_snapshot=False,
+                                isolation_level=None):
+        """Start a transaction
+
+        Raises ProgrammingError when a transaction is already in progress
+        and when ValueError when isolation_level specifies an Unknown
+        level.
+        """
+        if self.in_transaction:
+            raise errors.ProgrammingError("Transaction already in progress")
+
+        if isolation_level:
+            level = isolation_level.strip().replace('-', ' ').upper()
+            levels = ['READ UNCOMMITTED', 'READ COMMITTED', 'REPEATABLE READ',
+                      'SERIALIZABLE']
+
+            if level not in levels:
+                raise ValueError(
+                    'Unknown isolation level "{0}"'.format(isolation_level))
+
+            await self._execute_query(
+                "SET TRANSACTION ISOLATION LEVEL {0}".format(level))
+
+        query = "START TRANSACTION"
+        if consistent_snapshot:
+            query += " WITH CONSISTENT SNAPSHOT"
+        await self._execute_query(query)
+
+    async def commit(self):
+        """Commit current transaction"""
+        await self._execute_query("COMMIT")
+
+    async def rollback(self):
+        """Rollback current transaction"""
+        if self._unread_result:
+            await self.get_rows()
+
+        await self._execute_query("ROLLBACK")
+
+    async def _execute_query(self, query):
+        """Execute a query
+
+        Returns a dict()
+        """
+        if self._unread_result is True:
+            raise errors.InternalError("Unread result found.")
+
+        await self.cmd_query(query)
+
+    async def _info_query(self, query):
+        """Send a query which only returns 1 row"""
+        cursor = self.cursor(buffered=True)
+        await cursor.execute(query)
+        return await cursor.fetchone()
@@ -0,0 +1,423 @@
+# MySQL Connector/Python - MySQL driver written in Python.
+# Copyright (c) 2013, Oracle and/or its affiliates. All rights reserved.
+
+# MySQL Connector/Python is licensed under the terms of the GPLv2
+# <http://www.gnu.org/licenses/old-licenses/gpl-2.0.html>, like most
+# MySQL Connectors. There are special exceptions to the terms and
+# conditions of the GPLv2 as it is applied to this software, see the
+# FOSS License Exception
+# <http://www.mysql.com/about/legal/licensing/foss-exception.html>.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+"""Cursor classes using asyncio
+"""
+
+import re
+
+from mysql.connector import cursor, errors
+from mysql.connector.cursor import RE_SQL_INSERT_STMT, RE_SQL_SPLIT_STMTS
+
+
+class MySQLCursor(cursor.MySQLCursor):
+    """Cursor for interacting with MySQL using asyncio
+
+    Works like mysql.connector.cursor.MySQLCursor, but execute() and the
+    fetch-methods are coroutines and the rows are iterated using
+    'async for':
+
+      await cur.execute("SELECT id, name FROM t1")
+      async for row in cur:
+          print(row)
+    """
+    def __iter__(self):
+        raise TypeError("Use 'async for' to iterate over asyncio cursors")
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        """Fetch the next row for 'async for'"""
+        row = await self.fetchone()
+        if not row:
+            raise StopAsyncIteration
+        return row
+
+    async def close(self):
+        """Close the cursor
+
+        Returns True when successful, otherwise False.
+        """
+        return super().close()
+
+    async def _handle_noresultset(self, res):
+        """Handles result of execute() when there is no result set"""
+        try:
+            self._rowcount = res['affected_rows']
+            self._last_insert_id = res['insert_id']
+            self._warning_count = res['warning_count']
+        except (KeyError, TypeError) as err:
+            raise errors.ProgrammingError(
+                "Failed handling non-resultset; {}".format(err))
+
+        if self._connection.get_warnings is True and self._warning_count:
+            self._warnings = await self._fetch_warnings()
+
+    async def _handle_resultset(self):
+        """Handles result set
+
+        Called after reading the column information; non-buffering cursors
+        read the rows when they are fetched.
+        """
+        pass
+
+    async def _handle_result(self, result):
+        """Handle the result after a command was send
+
+        Raises InterfaceError when result is not a dict() or result is
+        invalid.
+        """
+        if not isinstance(result, dict):
+            raise errors.InterfaceError('Result was not a dict()')
+
+        if 'columns' in result:
+            # Weak test, must be column/eof information
+            self._description = result['columns']
+            self._connection.unread_result = True
+            self._fused_converters = self._get_fused_converters()
+            await self._handle_resultset()
+        elif 'affected_rows' in result:
+            # Weak test, must be an OK-packet
+            self._connection.unread_result = False
+            await self._handle_noresultset(result)
+        else:
+            raise errors.InterfaceError('Invalid result')
+
+    async def _execute_iter(self, query_iter):
+        """Asynchronous generator of the cursor for multiple statements"""
+        if not self._executed_list:
+            self._executed_list = RE_SQL_SPLIT_STMTS.split(self._executed)
+
+        statements = iter(self._executed_list)
+        async for result in query_iter:
+            try:
+                stmt = next(statements)
+            except StopIteration:
+                return
+            self._reset_result()
+            await self._handle_result(result)
+            self._executed = stmt
+            yield self
+
+    async def execute(self, operation, params=None, multi=False):
+        """Executes the given operation
+
+        Executes the given operation substituting any markers with
+        the given parameters.
+
+        Returns an asynchronous generator when multi is True, otherwise
+        None.
+        """
+        if not operation:
+            return None
+        if self._connection.unread_result is True:
+            raise errors.InternalError("Unread result found.")
+
+        self._reset_result()
+        stmt = self._make_statement(operation, params)
+        self._executed = stmt
+        if multi:
+            self._executed_list = []
+            return self._execute_iter(self._connection.cmd_query_iter(stmt))
+
+        try:
+            await self._handle_result(await self._connection.cmd_query(stmt))
+        except errors.InterfaceError:
+            if self._connection._have_next_result:  # pylint: disable=W0212
+                raise errors.InterfaceError(
+                    "Use multi=True when executing multiple statements")
+            raise
+        return None
+
+    async def executemany(self, operation, seq_params):
+        """Execute the given operation multiple times
+
+        INSERT statements are optimized by batching the data, that is
+        using the MySQL multiple rows syntax.
+        """
+        if not operation:
+            return None
+        if self._connection.unread_result is True:
+            raise errors.InternalError("Unread result found.")
+        if not isinstance(seq_params, (list, tuple)):
+            raise errors.ProgrammingError(
+                "Parameters for query must be list or tuple.")
+
+        # Optimize INSERTs by batching them
+        if re.match(RE_SQL_INSERT_STMT, operation):
+            if not seq_params:
+                self._rowcount = 0
+                return None
+            stmt = self._make_batch_insert(operation, seq_params)
+            return await self.execute(stmt)
+
+        rowcnt = 0
+        try:
+            for params in seq_params:
+                await self.execute(operation, params)
+                if self.with_rows and self._have_unread_result():
+                    await self.fetchall()
+                rowcnt += self._rowcount
+        except (ValueError, TypeError) as err:
+            raise errors.InterfaceError(
+                "Failed executing the operation; {}".format(err))
+        self._rowcount = rowcnt
+        return None
+
+    def execute_pipeline(self, *args, **kwargs):
+        """Execute operations without waiting for each result
+
+        Not supported with asyncio cursors.
+        """
+        raise errors.NotSupportedError(
+            "Pipelining is not supported by asyncio cursors")
+
+    async def callproc(self, procname, args=()):
+        """Calls a stored procedure with the given arguments
+
+        Works like mysql.connector.cursor.MySQLCursor.callproc(); stored
+        results are buffered asyncio cursors.
+        """
+        if not procname or not isinstance(procname, str):
+            raise ValueError("procname must be a string")
+
+        if not isinstance(args, (tuple, list)):
+            raise ValueError("args must be a sequence")
+
+        argfmt = "@_{name}_arg{index}"
+        self._stored_results = []
+
+        results = []
+        try:
+            argnames = []
+
+            if args:
+                for idx, arg in enumerate(args):
+                    argname = argfmt.format(name=procname, index=idx + 1)
+                    argnames.append(argname)
+                    await self.execute("SET {0}=%s".format(argname), (arg,))
+
+            call = "CALL {0}({1})".format(procname, ','.join(argnames))
+
+            async for result in self._connection.cmd_query_iter(call):
+                if 'columns' in result:
+                    # pylint: disable=W0212
+                    tmp = MySQLCursorBuffered(self._connection._get_self())
+                    await tmp._handle_result(result)
+                    results.append(tmp)
+                    # pylint: enable=W0212
+
+            self._stored_results = results
+            if argnames:
+                select = "SELECT {0}".format(','.join(argnames))
+                await self.execute(select)
+                return await self.fetchone()
+            return ()
+
+        except errors.Error:
+            raise
+        except Exception as err:
+            raise errors.InterfaceError(
+                "Failed calling stored routine; {0}".format(err))
+
+    async def _fetch_warnings(self):
+        """Fetch warnings doing a SHOW WARNINGS
+
+        Returns a result set or None when there were no warnings.
+        """
+        res = []
+        try:
+            cur = self._connection.cursor()
+            await cur.execute("SHOW WARNINGS")
+            res = await cur.fetchall()
+            await cur.close()
+        except Exception as err:
+            raise errors.InterfaceError(
+                "Failed getting warnings; %s" % err)
+
+        if self._connection.raise_on_warnings is True:
+            raise errors.get_mysql_exception(res[0][1], res[0][2])
+        if res:
+            return res
+        return None
+
+    async def _handle_eof(self, eof):
+        """Handle EOF packet"""
+        self._connection.unread_result = False
+        self._warning_count = eof['warning_count']
+        if self._connection.get_warnings is True and eof['warning_count']:
+            self._warnings = await self._fetch_warnings()
+
+    async def _fetch_batch(self):
+        """Read the next batch of rows from the result set"""
+        (rows, eof) = await self._connection.get_rows(
+            count=max(self.batch_size, 1), converters=self._fused_converters)
+        self._nextrows.extend(rows)
+        if eof is not None:
+            await self._handle_eof(eof)
+
+    async def _fetch_row(self):
+        """Returns the next row in the result set
+
+        Returns a tuple or None.
+        """
+        if not self._nextrows:
+            if not self._have_more_rows():
+                return None
+            await self._fetch_batch()
+            if not self._nextrows:
+                return None
+
+        row = self._nextrows.popleft()
+        if not self._nextrows and self._have_more_rows():
+            await self._fetch_batch()
+        if self._rowcount == -1:
+            self._rowcount = 1
+        else:
+            self._rowcount += 1
+
+        return row
+
+    async def _fetch_all_rows(self):
+        """Returns all remaining rows in the result set
+
+        Raises InterfaceError when there is no result set.
+
+        Returns a list.
+        """
+        if not self._nextrows and not self._have_unread_result():
+            raise errors.InterfaceError("No result set to fetch from.")
+        rows = list(self._nextrows)
+        self._nextrows.clear()
+        if self._have_unread_result():
+            (more, eof) = await self._connection.get_rows(
+                converters=self._fused_converters)
+            rows.extend(more)
+            await self._handle_eof(eof)
+        return rows
+
+    async def fetchone(self):
+        """Returns next row of a query result set
+
+        Returns a tuple or None.
+        """
+        row = await self._fetch_row()
+        if row:
+            if self._raw or self._fused_converters is not None:
+                return row
+            return self._row_to_python(row)
+        return None
+
+    async def fetchmany(self, size=None):
+        """Returns the next size rows, arraysize when size is not given
+
+        Returns a list.
+        """
+        res = []
+        cnt = (size or self.arraysize)
+        while cnt > 0 and (self._nextrows or self._have_more_rows()):
+            cnt -= 1
+            row = await self.fetchone()
+            if row:
+                res.append(row)
+        return res
+
+    async def fetchall(self):
+        """Returns all remaining rows of a query result set
+
+        Returns a list.
+        """
+        rows = await self._fetch_all_rows()
+        if self._raw or self._fused_converters is not None:
+            res = rows
+        else:
+            res = self._rows_to_python(rows)
+        if self._rowcount == -1:
+            self._rowcount = 0
+        self._rowcount += len(rows)
+        return res
+
+
+class MySQLCursorBuffered(MySQLCursor):
+    """Cursor using asyncio which fetches rows within execute()"""
+
+    def __init__(self, connection=None):
+        MySQLCursor.__init__(self, connection)
+        self._rows = None
+        self._next_row = 0
+
+    async def _handle_resultset(self):
+        (self._rows, eof) = await self._connection.get_rows(
+            converters=self._fused_converters)
+        self._rowcount = len(self._rows)
+        await self._handle_eof(eof)
+        self._next_row = 0
+        self._connection.unread_result = False
+
+    def reset(self):
+        self._rows = None
+
+    def _have_more_rows(self):
+        return self._rows is not None and self._next_row < len(self._rows)
+
+    async def _fetch_row(self):
+        try:
+            row = self._rows[self._next_row]
+        except (IndexError, TypeError):
+            return None
+        self._next_row += 1
+        return row
+
+    async def fetchall(self):
+        if self._rows is None:
+            raise errors.InterfaceError("No result set to fetch from.")
+        res = self._rows[self._next_row:]
+        if not self._raw and self._fused_converters is None:
+            res = self._rows_to_python(res)
+        self._next_row = len(self._rows)
+        return res
+
+    @property
+    def with_rows(self):
+        return self._rows is not None
+
+
+class MySQLCursorRaw(MySQLCursor):
+    """
+    Cursor using asyncio which skips conversion from MySQL datatypes to
+    Python types when fetching rows.
+    """
+    def __init__(self, connection=None):
+        MySQLCursor.__init__(self, connection)
+        self._raw = True
+
+
+class MySQLCursorBufferedRaw(MySQLCursorBuffered):
+    """
+    Cursor using asyncio which skips conversion from MySQL datatypes to
+    Python types when fetching rows and fetches rows within execute().
+    """
+    def __init__(self, connection=None):
+        MySQLCursorBuffered.__init__(self, connection)
+        self._raw = True
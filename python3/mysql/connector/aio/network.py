@@ -0,0 +1,194 @@
+# MySQL Connector/Python - MySQL driver written in Python.
+# Copyright (c) 2013, Oracle and/or its affiliates. All rights reserved.
+
+# MySQL Connector/Python is licensed under the terms of the GPLv2
+# <http://www.gnu.org/licenses/old-licenses/gpl-2.0.html>, like most
+# MySQL Connectors. There are special exceptions to the terms and
+# conditions of the GPLv2 as it is applied to this software, see the
+# FOSS License Exception
+# <http://www.mysql.com/about/legal/licensing/foss-exception.html>.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+"""Module implementing asyncio stream communication with MySQL servers.
+"""
+
+import asyncio
+import socket
+
+from mysql.connector import errors
+from mysql.connector.network import (_HEADER_STRUCT, _packet_buffers,
+                                     _set_socket_options, _strioerror)
+
+
+class PacketQueue(object):
+    """Packets received from the MySQL server, read as from a socket
+
+    MySQLProtocol reads result sets using the recv()-method of a socket.
+    The asyncio socket receives the packets first and hands them over
+    using this class, so the protocol can parse them without blocking.
+    """
+    def __init__(self, packets):
+        self._packets = iter(packets)
+
+    def recv(self):
+        """Get the next packet"""
+        try:
+            return next(self._packets)
+        except StopIteration:
+            raise errors.InterfaceError(errno=2013)
+    recv_view = recv
+
+
+class MySQLStreamSocket(object):
+    """MySQL socket using asyncio streams
+
+    Opens a TCP/IP connection, or a connection through the UNIX socket
+    when unix_socket is given, to the MySQL server. Packets are sent and
+    received using coroutines.
+    """
+    def __init__(self, host='127.0.0.1', port=3306, unix_socket=None,
+                 force_ipv6=False):
+        self.server_host = host
+        self.server_port = port
+        self.unix_socket = unix_socket
+        self.force_ipv6 = force_ipv6
+        self._connection_timeout = None
+        self._socket_options = {}
+        self._packet_number = -1
+        self._reader = None
+        self._writer = None
+
+    @property
+    def next_packet_number(self):
+        """Increments the packet number"""
+        self._packet_number = self._packet_number + 1
+        if self._packet_number > 255:
+            self._packet_number = 0
+        return self._packet_number
+
+    def get_address(self):
+        """Get the location of the socket"""
+        if self.unix_socket:
+            return self.unix_socket
+        return "{}:{}".format(self.server_host, self.server_port)
+
+    def set_connection_timeout(self, timeout):
+        """Set the connection timeout"""
+        self._connection_timeout = timeout
+
+    def set_socket_options(self, **options):
+        """Set the options of the socket used for the connection
+
+        Options are the same as for BaseMySQLSocket.set_socket_options()
+        and are applied once the connection is opened.
+        """
+        self._socket_options = options
+
+    async def open_connection(self):
+        """Open the connection to the MySQL server"""
+        if self.unix_socket:
+            opening = asyncio.open_unix_connection(self.unix_socket)
+            errno = 2002
+        else:
+            family = socket.AF_INET6 if self.force_ipv6 else 0
+            opening = asyncio.open_connection(
+                self.server_host, self.server_port, family=family)
+            errno = 2003
+        try:
+            (self._reader, self._writer) = await asyncio.wait_for(
+                opening, self._connection_timeout)
+        except asyncio.TimeoutError:
+            raise errors.InterfaceError(
+                errno=errno, values=(self.get_address(), 'timed out'))
+        except IOError as err:
+            raise errors.InterfaceError(
+                errno=errno, values=(self.get_address(), _strioerror(err)))
+        _set_socket_options(self._writer.get_extra_info('socket'),
+                            self._socket_options, tcp=not self.unix_socket)
+
+    async def close_connection(self):
+        """Close the connection
+
+        Returns once the transport is closed.
+        """
+        writer = self._writer
+        self._reader = self._writer = None
+        if writer is None:
+            return
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except IOError:
+            pass  # Closing a connection which failed
+
+    async def send(self, buf, packet_number=None):
+        """Send packets to the MySQL server"""
+        if packet_number is None:
+            self.next_packet_number  # pylint: disable=W0104
+        else:
+            self._packet_number = packet_number
+        buffers = _packet_buffers(buf, self._packet_number)
+        try:
+            self._writer.writelines(buffers)
+            await self._writer.drain()
+        except IOError as err:
+            raise errors.OperationalError(
+                errno=2055, values=(self.get_address(), _strioerror(err)))
+        except AttributeError:
+            raise errors.OperationalError(errno=2006)
+
+    async def recv(self):
+        """Receive a packet from the MySQL server
+
+        Returns bytes.
+        """
+        try:
+            header = await self._reader.readexactly(4)
+            (low, high, self._packet_number) = _HEADER_STRUCT.unpack(header)
+            return header + await self._reader.readexactly(low | high << 16)
+        except asyncio.IncompleteReadError:
+            raise errors.InterfaceError(errno=2013)
+        except IOError as err:
+            raise errors.OperationalError(
+                errno=2055, values=(self.get_address(), _strioerror(err)))
+        except AttributeError:
+            raise errors.OperationalError(errno=2006)
+
+    async def recv_rows(self, count=None):
+        """Receive the packets of a text result set
+
+        Packets are received until count rows, or all rows when count is
+        None, are read or up to the EOF packet ending the result set. A
+        row split over several packets counts as one row.
+
+        Raises an errors.Error-exception when the MySQL server sends an
+        Error packet. Returns a list of packets.
+        """
+        packets = []
+        rows = 0
+        continued = False
+        while count is None or rows < count:
+            packet = await self.recv()
+            packets.append(packet)
+            if packet[0:3] == b'\xff\xff\xff':
+                continued = True
+                continue
+            if packet[4] == 254:
+                break
+            elif packet[4] == 255 and not continued:
+                raise errors.get_exception(packet)
+            continued = False
+            rows += 1
+        return packets
@@ -0,0 +1,188 @@
+# MySQL Connector/Python - MySQL driver written in Python.
+# Copyright (c) 2013, Oracle and/or its affiliates. All rights reserved.
+
+# MySQL Connector/Python is licensed under the terms of the GPLv2
+# <http://www.gnu.org/licenses/old-licenses/gpl-2.0.html>, like most
+# MySQL Connectors. There are special exceptions to the terms and
+# conditions of the GPLv2 as it is applied to this software, see the
+# FOSS License Exception
+# <http://www.mysql.com/about/legal/licensing/foss-exception.html>.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+"""Implementing pooling of asyncio connections to MySQL servers.
+"""
+
+import asyncio
+
+from mysql.connector import errors, pooling
+from mysql.connector.pooling import generate_pool_name
+from mysql.connector.aio.connection import MySQLConnection
+
+
+class PooledMySQLConnection(pooling.PooledMySQLConnection):
+    """Class holding an asyncio MySQL Connection in a pool
+
+    Works like mysql.connector.pooling.PooledMySQLConnection; the
+    close()-coroutine adds the connection back to the pool.
+    """
+    async def close(self):
+        """Do not close, but add connection back to pool"""
+        self._cnx_pool.add_connection(self._cnx)
+        self._cnx = None
+
+
+class MySQLConnectionPool(pooling.MySQLConnectionPool):
+    """Class defining a pool of asyncio MySQL connections
+
+    Unlike mysql.connector.pooling.MySQLConnectionPool, connections are
+    opened when they are needed, up to pool_size connections, and
+    get_connection() waits for a connection to be added back to the pool
+    when all of them are in use.
+    """
+    def __init__(self, pool_size=5, pool_name=None, **kwargs):
+        """Initialize
+
+        Initialize a MySQL connection pool with a maximum number of
+        connections set to pool_size. The rest of the keywords
+        arguments, kwargs, are configuration arguments for MySQLConnection
+        instances.
+        """
+        # pylint: disable=W0231
+        self._pool_size = None
+        self._pool_name = None
+        self._set_pool_size(pool_size)
+        self._set_pool_name(pool_name or generate_pool_name(**kwargs))
+        self._cnx_config = {}
+        self._cnx_queue = asyncio.Queue(self._pool_size)
+        self._cnx_count = 0
+        self._config_version = None
+        if kwargs:
+            self.set_config(**kwargs)
+
+    def set_config(self, **kwargs):
+        """Set the connection configuration for MySQLConnection instances
+
+        Raises PoolError when a connection argument is not valid, missing
+        or not supported by MySQLConnection.
+        """
+        if not kwargs:
+            return
+        try:
+            MySQLConnection().config(**kwargs)
+        except (AttributeError, errors.NotSupportedError) as err:
+            raise errors.PoolError(
+                "Connection configuration not valid: {0}".format(err))
+        super().set_config(**kwargs)
+
+    def _queue_connection(self, cnx):
+        """Put connection back in the queue
+
+        Raises PoolError on errors.
+        """
+        if not isinstance(cnx, MySQLConnection):
+            raise errors.PoolError(
+                "Connection instance not subclass of MySQLConnection.")
+
+        try:
+            self._cnx_queue.put_nowait(cnx)
+        except asyncio.QueueFull:
+            raise errors.PoolError("Failed adding connection; queue is full")
+
+    def add_connection(self, cnx=None):
+        """Add a connection to the pool
+
+        The connection is a connected MySQLConnection, usually one taken
+        from the pool using get_connection().
+
+        Raises PoolError on errors.
+        """
+        if not self._cnx_config:
+            raise errors.PoolError("Connection configuration not available")
+        self._queue_connection(cnx)
+
+    async def _new_connection(self):
+        """Open a new connection for the pool
+
+        Returns a MySQLConnection.
+        """
+        self._cnx_count += 1
+        try:
+            cnx = MySQLConnection(**self._cnx_config)
+            await cnx.connect()
+        except:
+            self._cnx_count -= 1
+            raise
+        # pylint: disable=W0212
+        cnx._pool_config_version = self._config_version
+        # pylint: enable=W0212
+        return cnx
+
+    async def get_connection(self, timeout=None):
+        """Get a connection from the pool
+
+        A new connection is opened when none is available and the pool
+        holds less than pool_size connections. Otherwise, it waits at most
+        timeout seconds, or forever when timeout is None, for a connection
+        to be added back to the pool. Connections which are not connected,
+        or were configured before set_config() was called again, are
+        reconnected.
+
+        Raises PoolError on errors.
+
+        Returns a PooledMySQLConnection instance.
+        """
+        if not self._cnx_config:
+            raise errors.PoolError("Connection configuration not available")
+
+        if self._cnx_queue.empty() and self._cnx_count < self._pool_size:
+            return PooledMySQLConnection(self, await self._new_connection())
+
+        try:
+            cnx = await asyncio.wait_for(self._cnx_queue.get(), timeout)
+        except asyncio.TimeoutError:
+            raise errors.PoolError(
+                "Failed getting connection; pool exhausted")
+
+        # pylint: disable=W0212
+        if (self._config_version != cnx._pool_config_version
+                or not await cnx.is_connected()):
+            cnx.config(**self._cnx_config)
+            try:
+                await cnx.reconnect()
+            except errors.InterfaceError:
+                # Failed to reconnect, give connection back to pool
+                self._queue_connection(cnx)
+                raise
+            cnx._pool_config_version = self._config_version
+        # pylint: enable=W0212
+
+        return PooledMySQLConnection(self, cnx)
+
+    async def _remove_connections(self):
+        """Close all connections in the pool
+
+        Returns the number of connections closed.
+        """
+        cnt = 0
+        while not self._cnx_queue.empty():
+            cnx = self._cnx_queue.get_nowait()
+            self._cnx_count -= 1
+            try:
+                await cnx.disconnect()
+            except errors.Error:
+                # Any error when closing means connection is closed
+                pass
+            cnt += 1
+        return cnt
@@ -27,9 +27,11 @@
 import os
 import time
 import re
+from collections import OrderedDict
 from io import IOBase
 
-from mysql.connector.network import MySQLUnixSocket, MySQLTCPSocket
+from mysql.connector.network import (MySQLUnixSocket, MySQLTCPSocket,
+    ZlibCodec, ZstdCodec, COMPRESSION_CODECS)
 from mysql.connector.constants import (
     ClientFlag, ServerCmd, CharacterSet, ServerFlag,
     flag_is_set, ShutdownType, NET_BUFFER_LENGTH
@@ -39,7 +41,8 @@ from mysql.connector.protocol import MySQLProtocol
 from mysql.connector import errors
 from mysql.connector.utils import int4store
 from mysql.connector.cursor import (CursorBase, MySQLCursor, MySQLCursorRaw,
-    MySQLCursorBuffered, MySQLCursorBufferedRaw, MySQLCursorPrepared)
+    MySQLCursorBuffered, MySQLCursorBufferedRaw, MySQLCursorPrepared,
+    MySQLCursorPrefetch)
 
 DEFAULT_CONFIGURATION = {
     'database': None,
@@ -58,8 +61,15 @@ DEFAULT_CONFIGURATION = {
     'get_warnings': False,
     'raise_on_warnings': False,
     'connection_timeout': None,
+    'read_timeout': None,
+    'write_timeout': None,
+    'kill_query_on_timeout': False,
     'client_flags': 0,
     'compress': False,
+    'compress_algorithm': None,
+    'compress_level': None,
+    'compress_threshold': 50,
+    'compress_adaptive': False,
     'buffered': False,
     'raw': False,
     'ssl_ca': None,
@@ -71,8 +81,25 @@ DEFAULT_CONFIGURATION = {
     'connect_timeout': None,
     'dsn': None,
     'force_ipv6': False,
+    'dns_cache_ttl': 0,
+    'host_retry_delay': 30,
+    'zero_copy': False,
+    'compact_buffered': False,
+    'prepared_cache_size': 0,
+    'tcp_nodelay': True,
+    'keepalive': False,
+    'keepalive_idle': None,
+    'keepalive_interval': None,
+    'keepalive_count': None,
+    'recv_buffer_size': None,
+    'send_buffer_size': None,
+    'recvsize': 8192,
 }
 
+# Client errors raised when the socket failed; the connection can not be
+# used any longer: server has gone away, lost connection
+_SOCKET_ERRORS = (2006, 2013, 2055)
+
 
 class MySQLConnection(object):
     """Connection to a MySQL Server"""
@@ -100,18 +127,43 @@ class MySQLConnection(object):
         self._client_port = 0
         self._ssl = {}
         self._force_ipv6 = False
+        self._hosts = None
+        self._dns_cache_ttl = 0
+        self._host_retry_delay = 30
 
         self._use_unicode = True
         self._get_warnings = False
         self._raise_on_warnings = False
         self._connection_timeout = None
+        self._read_timeout = None
+        self._write_timeout = None
+        self._kill_query_on_timeout = False
+        self._deadline = None
         self._buffered = False
         self._unread_result = False
         self._have_next_result = False
         self._raw = False
         self._in_transaction = False
+        self._zero_copy = False
+        self._compact_buffered = False
+        self._compress_algorithm = None
+        self._compress_level = None
+        self._compress_threshold = 50
+        self._compress_adaptive = False
+        self._tcp_nodelay = True
+        self._keepalive = False
+        self._keepalive_idle = None
+        self._keepalive_interval = None
+        self._keepalive_count = None
+        self._recv_buffer_size = None
+        self._send_buffer_size = None
+        self._recvsize = 8192
 
         self._prepared_statements = None
+        self._prepared_cache_size = 0
+        self._prepared_cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        self._stmt_bound_types = {}
+        self._stmt_long_data = set()
 
         if len(kwargs) > 0:
             self.connect(**kwargs)
@@ -163,7 +215,8 @@ class MySQLConnection(object):
         packet = self._protocol.make_auth(
             seed=self._handshake['scramble'],
             username=username, password=password, database=database,
-            charset=charset, client_flags=client_flags)
+            charset=charset, client_flags=client_flags,
+            compress_level=self._get_server_compress_level())
         self._socket.send(packet)
         packet = self._socket.recv()
 
@@ -221,6 +274,67 @@ class MySQLConnection(object):
         except KeyError:
             pass  # Missing compress argument is OK
 
+        # Check compression settings
+        algorithm = config.get('compress_algorithm', self._compress_algorithm)
+        if algorithm is not None and algorithm not in COMPRESSION_CODECS:
+            raise errors.InterfaceError(
+                "Compression algorithm should be one of {0}".format(
+                    ', '.join(sorted(COMPRESSION_CODECS))))
+        try:
+            level = config['compress_level']
+            # Without algorithm, the level must also be valid for zlib
+            codec = COMPRESSION_CODECS[algorithm or ZlibCodec.name]
+            if level is not None and (
+                    not isinstance(level, int)
+                    or not codec.min_level <= level <= codec.max_level):
+                raise errors.InterfaceError(
+                    "Compression level should be an integer from "
+                    "{0} to {1}".format(codec.min_level, codec.max_level))
+        except KeyError:
+            pass  # Missing compress_level argument is OK
+        try:
+            threshold = config['compress_threshold']
+            if not isinstance(threshold, int) or threshold < 0:
+                raise errors.InterfaceError(
+                    "Compression threshold should be 0 or a positive integer")
+        except KeyError:
+            pass  # Missing compress_threshold argument is OK
+
+        # Check prepared statement cache size
+        try:
+            size = config['prepared_cache_size']
+            if not isinstance(size, int) or size < 0:
+                raise errors.InterfaceError(
+                    "Prepared statement cache size should be 0 or a "
+                    "positive integer")
+        except KeyError:
+            pass  # Missing prepared_cache_size argument is OK
+
+        # Check timeouts
+        for key in ('read_timeout', 'write_timeout'):
+            value = config.get(key)
+            if value is not None and (not isinstance(value, (int, float))
+                                      or value <= 0):
+                raise errors.InterfaceError(
+                    "Option {0} should be a positive number".format(key))
+
+        # Check socket options
+        for key in ('tcp_nodelay', 'keepalive'):
+            if key in config and not isinstance(config[key], bool):
+                raise errors.InterfaceError(
+                    "Option {0} should be True or False".format(key))
+        for key in ('keepalive_idle', 'keepalive_interval', 'keepalive_count',
+                    'recv_buffer_size', 'send_buffer_size', 'recvsize'):
+            try:
+                value = config[key]
+            except KeyError:
+                continue  # Missing socket option is OK
+            if value is None and key != 'recvsize':
+                continue  # Using the default of the operating system
+            if not isinstance(value, int) or value <= 0:
+                raise errors.InterfaceError(
+                    "Option {0} should be a positive integer".format(key))
+
         # Configure character set and collation
         if ('charset' in config or 'collation' in config):
             try:
@@ -283,6 +397,16 @@ class MySQLConnection(object):
         except ValueError:
             raise errors.InterfaceError(
                 "TCP/IP port number should be an integer")
+        try:
+            self._set_hosts(config['host'])
+            del config['host']
+        except KeyError:
+            pass  # Missing host argument is OK
+        for key in ('dns_cache_ttl', 'host_retry_delay'):
+            if key in config and (not isinstance(config[key], (int, float))
+                                  or config[key] < 0):
+                raise errors.InterfaceError(
+                    "Option {0} should be 0 or a positive number".format(key))
 
         # Other configuration
         set_ssl_flag = False
@@ -317,6 +441,44 @@ class MySQLConnection(object):
                     ', '.join(missing_attrs)))
             self.set_client_flags([ClientFlag.SSL])
 
+    def _set_hosts(self, hosts):
+        """Set the MySQL server(s) to connect to
+
+        The hosts argument is a host name or IP address, a string with
+        hosts separated by commas, or a list of hosts. Each host can be
+        followed by a colon and a TCP/IP port, or be a (host, port) tuple;
+        hosts without port use the port option. IPv6 addresses with a
+        port are written within brackets, for example [::1]:3306.
+
+        When more than one host is given, the connection is made to the
+        first MySQL server which can be reached.
+        """
+        if not isinstance(hosts, (list, tuple)):
+            hosts = hosts.split(',')
+        parsed = []
+        for host in hosts:
+            port = None
+            if isinstance(host, (list, tuple)):
+                (host, port) = host
+            else:
+                host = host.strip()
+                if host.startswith('['):
+                    (host, _, port) = host[1:].partition(']')
+                    port = port.lstrip(':')
+                elif host.count(':') == 1:
+                    (host, port) = host.split(':')
+            try:
+                parsed.append((host, int(port) if port else None))
+            except ValueError:
+                raise errors.InterfaceError(
+                    "TCP/IP port number should be an integer")
+        if not parsed:
+            raise errors.InterfaceError("No MySQL server host given")
+        self._host = parsed[0][0]
+        if parsed[0][1]:
+            self._port = parsed[0][1]
+        self._hosts = parsed if len(parsed) > 1 else None
+
     def _get_connection(self, prtcls=None):
         """Get connection based on configuration
 
@@ -329,10 +491,27 @@ class MySQLConnection(object):
         if self.unix_socket and os.name != 'nt':
             conn = MySQLUnixSocket(unix_socket=self.unix_socket)
         else:
+            hosts = None
+            if self._hosts:
+                hosts = [(host, port or self._port)
+                         for (host, port) in self._hosts]
             conn = MySQLTCPSocket(host=self.server_host,
                                   port=self.server_port,
-                                  force_ipv6=self._force_ipv6)
+                                  force_ipv6=self._force_ipv6,
+                                  hosts=hosts,
+                                  dns_cache_ttl=self._dns_cache_ttl,
+                                  host_retry_delay=self._host_retry_delay)
         conn.set_connection_timeout(self._connection_timeout)
+        conn.set_read_timeout(self._read_timeout)
+        conn.set_write_timeout(self._write_timeout)
+        conn.set_socket_options(
+            tcp_nodelay=self._tcp_nodelay, keepalive=self._keepalive,
+            keepalive_idle=self._keepalive_idle,
+            keepalive_interval=self._keepalive_interval,
+            keepalive_count=self._keepalive_count,
+            recv_buffer_size=self._recv_buffer_size,
+            send_buffer_size=self._send_buffer_size)
+        conn.recvsize = self._recvsize
         return conn
 
     def _open_connection(self):
@@ -345,13 +524,66 @@ class MySQLConnection(object):
         self._socket = self._get_connection()
         self._socket.open_connection()
         self._do_handshake()
+        codec = self._get_compression_codec()
+        client_flags = self._client_flags
+        if codec is ZstdCodec:
+            client_flags &= ~ClientFlag.COMPRESS
+            client_flags |= ClientFlag.ZSTD_COMPRESSION_ALGORITHM
         self._do_auth(self._user, self._password,
-                      self._database, self._client_flags, self._charset_id,
+                      self._database, client_flags, self._charset_id,
                       self._ssl)
         self.set_converter_class(self._converter_class)
-        if self._client_flags & ClientFlag.COMPRESS:
+        self._reset_prepared_cache()
+        if codec:
             self._socket.recv = self._socket.recv_compressed
+            self._socket.recv_view = self._socket.recv_compressed_view
             self._socket.send = self._socket.send_compressed
+            self._socket.set_compression(self._compress_level,
+                                         self._compress_threshold,
+                                         self._compress_adaptive,
+                                         codec)
+
+    def _get_compression_codec(self):
+        """Get the codec compressing the packets
+
+        When no compression algorithm was configured, zstd is used when the
+        zstandard module is available and the MySQL server supports it,
+        otherwise zlib.
+
+        Raises NotSupportedError when zstd was configured but can not be
+        used. Returns a codec class or None when compression is not used.
+        """
+        if not self._client_flags & ClientFlag.COMPRESS:
+            return None
+        zstd_supported = ZstdCodec.available and (
+            self._handshake['capabilities']
+            & ClientFlag.ZSTD_COMPRESSION_ALGORITHM)
+        if self._compress_algorithm == ZstdCodec.name:
+            if not zstd_supported:
+                raise errors.NotSupportedError(
+                    "zstd compression requires the zstandard module and "
+                    "a MySQL server supporting it")
+            return ZstdCodec
+        if self._compress_algorithm is None and zstd_supported:
+            return ZstdCodec
+        return ZlibCodec
+
+    def _get_server_compress_level(self):
+        """Get the zstd compression level sent to the MySQL server
+
+        The MySQL server accepts levels from 1 to 22. The zstd default
+        level is sent when the configured compression level is not set or
+        outside this range, for example a zlib level when zstd was chosen
+        automatically. The packets sent are still compressed using the
+        configured level.
+
+        Returns an integer.
+        """
+        level = self._compress_level
+        if level is None or not (ZstdCodec.server_min_level <= level
+                                 <= ZstdCodec.max_level):
+            return ZstdCodec.default_level
+        return level
 
     def _post_connection(self):
         """Executes commands after connection has been established
@@ -396,6 +628,85 @@ class MySQLConnection(object):
             pass  # Getting an exception would mean we are disconnected.
     close = disconnect
 
+    def _set_deadline(self, timeout):
+        """Set the time left for reading the result of a statement
+
+        Receiving packets fails once timeout seconds have passed. When
+        timeout is None, the deadline is removed.
+        """
+        if timeout is None:
+            self._deadline = None
+        else:
+            self._deadline = time.monotonic() + timeout
+        try:
+            self._socket.set_deadline(self._deadline)
+        except AttributeError:
+            raise errors.OperationalError("MySQL Connection not available.")
+
+    def _check_deadline(self, err=None):
+        """Abort the statement when its deadline has passed
+
+        The result of the statement can not be read any longer, so the
+        connection is closed without sending the QUIT command. This is
+        also done when the socket failed, given as err, while a deadline
+        was set; for example when it timed out before the deadline was
+        reached according to the clock. When the kill_query_on_timeout
+        option is set, the connection is also killed on the MySQL server,
+        using a second connection, which stops the statement still running
+        there.
+
+        Raises OperationalError when the deadline has passed.
+        """
+        if self._deadline is None:
+            return
+        expired = time.monotonic() >= self._deadline
+        if not expired and (err is None
+                            or err.errno not in _SOCKET_ERRORS):
+            return
+        thread_id = self.connection_id
+        address = None
+        if isinstance(self._socket, MySQLTCPSocket):
+            # With several hosts, this might not be the first one
+            address = (self._socket.server_host, self._socket.server_port)
+        self._socket.close_connection()
+        self._unread_result = False
+        self._deadline = None
+        if self._kill_query_on_timeout and thread_id:
+            self._kill_thread(thread_id, address)
+        if expired:
+            raise errors.OperationalError(
+                "Statement exceeded its deadline; connection closed")
+
+    def _kill_thread(self, thread_id, address=None):
+        """Kill a MySQL thread using a new connection
+
+        The connection uses the same credentials as this connection. It
+        connects to the TCP address given as a (host, port) tuple, which
+        should be the server this connection was connected to, or else
+        to the configured host or Unix socket. Errors are ignored; the
+        thread might have ended already.
+        """
+        (host, port) = address or (self._host, self._port)
+        config = {
+            'user': self._user,
+            'password': self._password,
+            'host': host,
+            'port': port,
+            'unix_socket': None if address else self._unix_socket,
+            'connection_timeout': self._connection_timeout,
+            'force_ipv6': self._force_ipv6,
+        }
+        for key, value in self._ssl.items():
+            config['ssl_' + key] = value
+        try:
+            cnx = MySQLConnection(**config)
+            try:
+                cnx.cmd_process_kill(thread_id)
+            finally:
+                cnx.close()
+        except errors.Error:
+            pass
+
     def _send_cmd(self, command, argument=None, packet_number=0, packet=None,
                   expect_response=True):
         """Send a command to the MySQL server
@@ -417,9 +728,10 @@ class MySQLConnection(object):
             raise errors.InternalError("Unread result found.")
 
         try:
-            self._socket.send(
-                self._protocol.make_command(command, packet or argument),
-                packet_number)
+            # The argument is sent as is, without joining it to the command
+            payload = (self._protocol.make_command(command),
+                       packet or argument or b'')
+            self._socket.send(payload, packet_number)
         except AttributeError:
             raise errors.OperationalError("MySQL Connection not available.")
 
@@ -566,30 +878,46 @@ class MySQLConnection(object):
         self.unread_result = True
         return {'columns': columns, 'eof': eof}
 
-    def get_rows(self, count=None, binary=False, columns=None):
+    def get_rows(self, count=None, binary=False, columns=None,
+                 converters=None, packed=False, spill_size=None):
         """Get all rows returned by the MySQL server
 
         This method gets all rows returned by the MySQL server after sending,
         for example, the query command. The result is a tuple consisting of
         a list of rows and the EOF packet.
 
+        Text result rows are converted to Python types while reading them
+        when converters, as returned by MySQLConverter.row_converters(), is
+        given.
+
+        When packed is True, all text result rows are read and returned
+        as a utils.PackedRows object decoding the rows when accessed. When
+        spill_size is also given, rows are written to a temporary file once
+        more than spill_size bytes are read.
+
         Returns a tuple()
         """
         if not self.unread_result:
             raise errors.InternalError("No result set available.")
 
-        if binary:
+        if packed and not binary:
+            rows = self._protocol.read_text_result_packed(
+                self._socket, zero_copy=self._zero_copy,
+                converters=converters, spill_size=spill_size)
+        elif binary:
             rows = self._protocol.read_binary_result(
-                self._socket, columns, count)
+                self._socket, columns, count, zero_copy=self._zero_copy)
         else:
-            rows = self._protocol.read_text_result(self._socket, count)
+            rows = self._protocol.read_text_result(
+                self._socket, count, zero_copy=self._zero_copy,
+                converters=converters)
         if rows[-1] is not None:
             self._handle_server_status(rows[-1]['status_flag'])
             self.unread_result = False
 
         return rows
 
-    def get_row(self, binary=False, columns=None):
+    def get_row(self, binary=False, columns=None, converters=None):
         """Get the next rows returned by the MySQL server
 
         This method gets one row from the result set after sending, for
@@ -599,7 +927,8 @@ class MySQLConnection(object):
 
         Returns a tuple.
         """
-        (rows, eof) = self.get_rows(count=1, binary=binary, columns=columns)
+        (rows, eof) = self.get_rows(count=1, binary=binary, columns=columns,
+                                    converters=converters)
         if len(rows):
             return (rows[0], eof)
         return (None, eof)
@@ -672,6 +1001,75 @@ class MySQLConnection(object):
                 result = self._handle_result(self._socket.recv())
             yield result
 
+    def _read_query_pipeline_result(self):
+        """Read the result of a pipelined query
+
+        Returns a dict() like cmd_query(), or the errors.Error instance
+        when the MySQL server returned an error.
+        """
+        packet = self._socket.recv()
+        if packet[4] == 255:
+            return errors.get_exception(packet)
+        return self._handle_result(packet)
+
+    def cmd_query_pipeline(self, statements, window=32):
+        """Send queries to the MySQL server without waiting for results
+
+        Up to window statements are sent using separate COM_QUERY packets
+        before the first result is read, and the next statement is sent
+        each time a result was read. Unlike sending the statements as one
+        multi-statement query, the client flag MULTI_STATEMENTS is not
+        needed and a failing statement does not stop the others.
+
+        This method returns a generator yielding for each statement the
+        result like cmd_query(), or the errors.Error instance when the
+        statement failed. Rows of a result set can be read using
+        get_rows() before the next result is taken; unread rows are
+        discarded. Statements returning more than one result, such as
+        CALL, and LOAD DATA LOCAL INFILE can not be used.
+
+        for result in cnx.cmd_query_pipeline(statements):
+            if isinstance(result, errors.Error):
+                # the statement failed
+            elif 'columns' in result:
+                rows = cnx.get_rows()
+
+        Returns a generator.
+        """
+        if not isinstance(window, int) or window < 1:
+            raise ValueError("window should be a positive integer")
+        statements = iter(statements)
+        pending = 0
+        try:
+            while True:
+                while pending < window:
+                    try:
+                        statement = next(statements)
+                    except StopIteration:
+                        break
+                    if not isinstance(statement, bytes):
+                        statement = statement.encode('utf-8')
+                    self._send_cmd(ServerCmd.QUERY, statement,
+                                   expect_response=False)
+                    pending += 1
+                if not pending:
+                    return
+                result = self._read_query_pipeline_result()
+                pending -= 1
+                yield result
+                if self.unread_result:
+                    self.get_rows()
+        except GeneratorExit:
+            # Read the results of the statements already sent
+            if self.unread_result:
+                self.get_rows()
+            while pending:
+                self._read_query_pipeline_result()
+                pending -= 1
+                if self.unread_result:
+                    self.get_rows()
+            raise
+
     def cmd_refresh(self, options):
         """Send the Refresh command to the MySQL server
 
@@ -804,7 +1202,10 @@ class MySQLConnection(object):
             username=username, password=password, database=database,
             charset=charset, client_flags=self._client_flags)
         self._socket.send(packet, 0)
-        return self._handle_ok(self._socket.recv())
+        ok_packet = self._handle_ok(self._socket.recv())
+        # Changing user closes the prepared statements
+        self._reset_prepared_cache()
+        return ok_packet
 
     def is_connected(self):
         """Reports whether the connection to MySQL Server is available
@@ -1037,6 +1438,43 @@ class MySQLConnection(object):
             return True
         return False
 
+    @property
+    def compression_algorithm(self):
+        """Name of the algorithm compressing the packets
+
+        Returns a string or None when the connection is not compressed.
+        """
+        if self._socket and self._client_flags & ClientFlag.COMPRESS:
+            return self._socket.compression_algorithm
+        return None
+
+    @property
+    def compression_stats(self):
+        """Statistics about the compression of the packets
+
+        The 'sent' and 'received' counters hold the number of bytes of
+        the payloads before compression, 'sent_compressed' and
+        'received_compressed' the number of bytes after compression.
+        'skipped' counts the packets sent uncompressed because they did
+        not compress well, and 'saved' the number of bytes compression
+        saved. All counters are 0 when the connection is not compressed.
+
+        Returns a dictionary.
+        """
+        stats = dict.fromkeys(
+            ['sent', 'sent_compressed', 'skipped',
+             'received', 'received_compressed'], 0)
+        if self._socket and self._client_flags & ClientFlag.COMPRESS:
+            stats.update(self._socket.compression_stats)
+        stats['saved'] = (stats['sent'] - stats['sent_compressed']
+                          + stats['received'] - stats['received_compressed'])
+        return stats
+
+    @property
+    def compact_buffered(self):
+        """Whether buffered cursors keep rows packed until fetched"""
+        return self._compact_buffered
+
     @property
     def user(self):
         """User used while connecting to MySQL"""
@@ -1195,13 +1633,24 @@ class MySQLConnection(object):
                                  doc="Toggle whether to raise on warnings "
                                      "(implies retrieving warnings).")
 
-    def cursor(self, buffered=None, raw=None, prepared=None, cursor_class=None):
+    def cursor(self, buffered=None, raw=None, prepared=None, cursor_class=None,
+               prefetch=None, server_side=None):
         """Instantiates and returns a cursor
 
         By default, MySQLCursor is returned. Depending on the options
         while connecting, a buffered and/or raw cursor instantiated
         instead.
 
+        When prefetch is given, a MySQLCursorPrefetch is returned which
+        reads the result set using a background thread, queueing at most
+        prefetch batches of rows. It can not be combined with buffered,
+        raw or prepared.
+
+        When server_side is True, a MySQLCursorPrepared is returned which
+        opens a read-only cursor on the MySQL server and fetches the rows
+        in batches of arraysize rows. It can not be combined with buffered,
+        raw or prefetch.
+
         It is possible to also give a custom cursor through the
         cursor_class parameter, but it needs to be a subclass of
         mysql.connector.cursor.CursorBase.
@@ -1217,6 +1666,19 @@ class MySQLConnection(object):
                 raise errors.ProgrammingError(
                     "Cursor class needs be to subclass of cursor.CursorBase")
             return (cursor_class)(self)
+        if server_side is True:
+            if buffered is True or raw is True or prefetch is not None:
+                raise ValueError(
+                    "server_side can not be used with buffered, raw or "
+                    "prefetch")
+            return MySQLCursorPrepared(self, server_side=True)
+        if prefetch is not None:
+            if buffered is True or raw is True or prepared is True:
+                raise ValueError(
+                    "prefetch can not be used with buffered, raw or prepared")
+            if not isinstance(prefetch, int) or prefetch < 1:
+                raise ValueError("prefetch must be a positive integer")
+            return MySQLCursorPrefetch(self, prefetch)
         if prepared is True:
             return MySQLCursorPrepared(self)
 
@@ -1358,6 +1820,55 @@ class MySQLConnection(object):
         eof = self._handle_eof(self._socket.recv())
         return (column_count, columns, eof)
 
+    def _reset_prepared_cache(self):
+        """Empty the prepared statement cache
+
+        Prepared statements belong to the session, so the cache is emptied
+        when the connection is (re)opened or the user is changed. The
+        cache is disabled when prepared_cache_size is 0. The parameter
+        types and long data tracked per statement are forgotten as well.
+        """
+        if self._prepared_cache_size:
+            self._prepared_statements = OrderedDict()
+        else:
+            self._prepared_statements = None
+        self._stmt_bound_types = {}
+        self._stmt_long_data = set()
+
+    def _stmt_prepare_cached(self, statement):
+        """Prepare a MySQL statement using the prepared statement cache
+
+        Statements are cached by their text and shared by all prepared
+        cursors of the connection. When the cache holds more than
+        prepared_cache_size statements, the least recently used statement
+        is closed and removed.
+
+        Returns a dict() like cmd_stmt_prepare().
+        """
+        cache = self._prepared_statements
+        stats = self._prepared_cache_stats
+        try:
+            # Move the statement to the end, marking it most recently used
+            prepared = cache.pop(statement)
+            cache[statement] = prepared
+            stats['hits'] += 1
+            return prepared
+        except KeyError:
+            stats['misses'] += 1
+
+        prepared = self.cmd_stmt_prepare(statement)
+        cache[statement] = prepared
+        while len(cache) > self._prepared_cache_size:
+            (_, evicted) = cache.popitem(last=False)
+            stats['evictions'] += 1
+            self.cmd_stmt_close(evicted['statement_id'])
+        return prepared
+
+    @property
+    def prepared_cache_stats(self):
+        """Hits, misses and evictions of the prepared statement cache"""
+        return self._prepared_cache_stats.copy()
+
     def cmd_stmt_prepare(self, statement):
         """Prepare a MySQL statement
 
@@ -1402,11 +1913,122 @@ class MySQLConnection(object):
                     long_data_used[param_id] = (binary,)
 
         execute_packet = self._protocol.make_stmt_execute(
-            statement_id, data, tuple(parameters), flags, long_data_used)
-        packet = self._send_cmd(ServerCmd.STMT_EXECUTE, packet=execute_packet)
+            statement_id, data, tuple(parameters), flags, long_data_used,
+            bound_types=self._stmt_bound_types)
+        try:
+            packet = self._send_cmd(ServerCmd.STMT_EXECUTE,
+                                    packet=execute_packet)
+            result = self._handle_binary_result(packet)
+        except errors.Error:
+            # The server might not have bound the parameter types
+            self._stmt_bound_types.pop(statement_id, None)
+            raise
+        return result
+
+    def _read_stmt_pipeline_result(self):
+        """Read the result of a pipelined prepared statement execution
+
+        Returns a dict() like cmd_stmt_execute_pipeline(), or the
+        errors.Error instance when the MySQL server returned an error.
+        """
+        packet = self._socket.recv()
+        if packet[4] == 255:
+            return errors.get_exception(packet)
         result = self._handle_binary_result(packet)
+        if isinstance(result, tuple):
+            columns = result[1]
+            self.unread_result = True
+            (rows, eof) = self.get_rows(binary=True, columns=columns)
+            result = {'columns': columns, 'rows': rows, 'eof': eof}
         return result
 
+    def cmd_stmt_execute_pipeline(self, statement_id, seq_data,
+                                  parameters=(), window=32):
+        """Execute a prepared MySQL statement for each set of data
+
+        The executions are pipelined: up to window COM_STMT_EXECUTE
+        packets are sent before the first response is read, and the next
+        packet is sent each time a response was read. Each execution so
+        saves a round trip to the MySQL server. The window limits how
+        many responses the server has to buffer; keep it small when the
+        statement returns large result sets.
+
+        Once an execution failed, no more packets are sent. The results
+        of the executions already sent are still read, so the returned
+        list might be shorter than seq_data. Values sent as long data can
+        not be used.
+
+        Returns a list holding for each set of data the OK packet as a
+        dict(), a dict() with 'columns', 'rows' and 'eof' for result sets,
+        or the exception when the execution failed. Besides errors.Error,
+        this is the ValueError or TypeError raised converting the data.
+        """
+        if not isinstance(window, int) or window < 1:
+            raise ValueError("window should be a positive integer")
+        parameters = tuple(parameters)
+        results = []
+        pending = 0
+        failed = False
+        error = None
+        for data in seq_data:
+            if pending == window:
+                results.append(self._read_stmt_pipeline_result())
+                pending -= 1
+                if isinstance(results[-1], errors.Error):
+                    failed = True
+                    break
+            try:
+                if len(data) != len(parameters):
+                    raise errors.ProgrammingError(
+                        errno=1210,
+                        msg="Incorrect number of arguments "
+                            "executing prepared statement")
+                if any(isinstance(value, IOBase) for value in data):
+                    raise errors.NotSupportedError(
+                        "Long data can not be used when pipelining")
+                packet = self._protocol.make_stmt_execute(
+                    statement_id, data, parameters,
+                    bound_types=self._stmt_bound_types)
+            except (errors.Error, ValueError, TypeError) as err:
+                error = err
+                break
+            self._send_cmd(ServerCmd.STMT_EXECUTE, packet=packet,
+                           expect_response=False)
+            pending += 1
+
+        while pending:
+            results.append(self._read_stmt_pipeline_result())
+            pending -= 1
+            failed = failed or isinstance(results[-1], errors.Error)
+        if error is not None:
+            results.append(error)
+        if failed:
+            # The server might not have bound the parameter types
+            self._stmt_bound_types.pop(statement_id, None)
+        return results
+
+    def cmd_stmt_fetch(self, statement_id, columns, rows=1):
+        """Fetch rows from the cursor of a prepared MySQL statement
+
+        The cursor has to be opened by executing the statement with
+        cmd_stmt_execute() using the flag CursorType.READ_ONLY. At most
+        rows rows are fetched; columns holds the column information used
+        to decode them. When the last row was sent, the status flag
+        SERVER_STATUS_LAST_ROW_SENT is set in the EOF packet.
+
+        Returns a tuple() like get_rows().
+        """
+        self._send_cmd(ServerCmd.STMT_FETCH,
+                       packet=self._protocol.make_stmt_fetch(statement_id,
+                                                             rows),
+                       expect_response=False)
+        self.unread_result = True
+        try:
+            return self.get_rows(binary=True, columns=columns)
+        except errors.Error:
+            self.unread_result = False
+            raise
+
     def cmd_stmt_close(self, statement_id):
         """Deallocate a prepared MySQL statement
 
@@ -1414,6 +2036,8 @@ class MySQLConnection(object):
         statement_id. Note that the MySQL server does not return
         anything.
         """
+        self._stmt_bound_types.pop(statement_id, None)
+        self._stmt_long_data.discard(statement_id)
         self._send_cmd(ServerCmd.STMT_CLOSE, int4store(statement_id),
                        expect_response=False)
 
@@ -1450,8 +2074,20 @@ class MySQLConnection(object):
         except AttributeError:
             raise errors.OperationalError("MySQL Connection not available.")
 
+        self._stmt_long_data.add(statement_id)
         return total_sent
 
+    def _stmt_reset_needed(self, statement_id):
+        """Check whether a prepared statement has to be reset
+
+        Only long data sent using cmd_stmt_send_long_data() is kept by
+        the MySQL server between executions, so a statement only needs
+        a reset when long data was sent for it.
+
+        Returns True or False.
+        """
+        return statement_id in self._stmt_long_data
+
     def cmd_stmt_reset(self, statement_id):
         """Reset data for prepared statement sent as long data
 
@@ -1459,5 +2095,6 @@ class MySQLConnection(object):
 
         Returns a dict()
         """
+        self._stmt_long_data.discard(statement_id)
         self._handle_ok(self._send_cmd(ServerCmd.STMT_RESET,
                                        int4store(statement_id)))
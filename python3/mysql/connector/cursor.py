@@ -26,8 +26,14 @@
 
 import weakref
 import re
+import threading
+from collections import deque
+from queue import Queue, Full
 
 from mysql.connector import errors
+from mysql.connector.constants import CursorType, ServerFlag, flag_is_set
+
+PREFETCH_POLL_INTERVAL = 0.1
 
 RE_SQL_COMMENT = re.compile(r"\/\*.*\*\/")
 RE_SQL_ON_DUPLICATE = re.compile(r'\s*ON DUPLICATE KEY.*$')
@@ -257,12 +263,16 @@ class MySQLCursor(CursorBase):
         CursorBase.__init__(self)
         self._connection = None
         self._stored_results = []
-        self._nextrow = (None, None)
+        self._nextrows = deque()
         self._warnings = None
         self._warning_count = 0
         self._executed = None
         self._executed_list = []
         self._binary = False
+        self._raw = False
+        self._fused_converters = None
+        self.batch_size = 100
+        self._converters = None
 
         if connection is not None:
             self._set_connection(connection)
@@ -285,13 +295,14 @@ class MySQLCursor(CursorBase):
     def _reset_result(self):
         """Reset the cursor to default"""
         self._rowcount = -1
-        self._nextrow = (None, None)
+        self._nextrows = deque()
         self._stored_results = []
         self._warnings = None
         self._warning_count = 0
         self._description = None
         self._executed = None
         self._executed_list = []
+        self._fused_converters = None
         self.reset()
 
     def _have_unread_result(self):
@@ -301,6 +312,10 @@ class MySQLCursor(CursorBase):
         except AttributeError:
             return False
 
+    def _have_more_rows(self):
+        """Check whether rows are left to be read for the result set"""
+        return self._have_unread_result()
+
     def next(self):
         """Used for iterating over the result set."""
         return self.__next__()
@@ -373,13 +388,69 @@ class MySQLCursor(CursorBase):
             return tuple(res)
         return None
 
+    def _get_converters(self, desc):
+        """Get the functions converting the columns of a result set
+
+        The functions are looked up once for every description and
+        converter.
+
+        Returns a tuple.
+        """
+        converter = self._connection.converter
+        if (self._converters is None or self._converters[0] is not desc
+                or self._converters[1] is not converter):
+            self._converters = (desc, converter,
+                                converter.row_converters(desc))
+        return self._converters[2]
+
+    def _get_fused_converters(self):
+        """Get the converters used while reading text result rows
+
+        When the cursor converts rows using the default _row_to_python(),
+        the values are converted while the rows are parsed instead of
+        walking every row a second time.
+
+        Returns a tuple or None.
+        """
+        if (self._raw or self._binary or type(self)._row_to_python
+                is not MySQLCursor._row_to_python):
+            return None
+        try:
+            return self._get_converters(self.description)
+        except Exception:  # pylint: disable=W0703
+            return None
+
+    def _rows_to_python(self, rows):
+        """Convert rows from MySQL to Python types
+
+        Returns a list.
+        """
+        if type(self)._row_to_python is not MySQLCursor._row_to_python:
+            return [self._row_to_python(row) for row in rows]
+        try:
+            converters = self._get_converters(self.description)
+            return [tuple([None if val is None else convert(val)
+                           for convert, val in zip(converters, row)])
+                    for row in rows]
+        except Exception:  # pylint: disable=W0703
+            # Convert row by row to report which value failed
+            return [self._row_to_python(row) for row in rows]
+
     def _row_to_python(self, rowdata, desc=None):
         """Convert the row from MySQL to Python types"""
+        if not desc:
+            desc = self.description
+        try:
+            converters = self._get_converters(desc)
+            return tuple([None if val is None else convert(val)
+                          for convert, val in zip(converters, rowdata)])
+        except Exception:  # pylint: disable=W0703
+            # Convert value by value to report which field failed
+            pass
+
         res = []
         to_python = self._connection.converter.to_python
         try:
-            if not desc:
-                desc = self.description
             for flddsc, val in zip(desc, rowdata):
                 res.append(to_python(flddsc, val),)
         except Exception as err:
@@ -428,6 +499,7 @@ class MySQLCursor(CursorBase):
             # Weak test, must be column/eof information
             self._description = result['columns']
             self._connection.unread_result = True
+            self._fused_converters = self._get_fused_converters()
             self._handle_resultset()
         elif 'affected_rows' in result:
             # Weak test, must be an OK-packet
@@ -453,7 +525,35 @@ class MySQLCursor(CursorBase):
             self._executed = stmt
             yield self
 
-    def execute(self, operation, params=None, multi=False):
+    def _make_statement(self, operation, params=None):
+        """Make the statement executing operation with params
+
+        The operation is encoded using the character set of the connection
+        and the markers are substituted with the escaped and quoted params.
+
+        Returns bytes.
+        """
+        try:
+            if not isinstance(operation, bytes):
+                stmt = operation.encode(self._connection.charset)
+            else:
+                stmt = operation
+        except (UnicodeDecodeError, UnicodeEncodeError) as err:
+            raise errors.ProgrammingError(str(err))
+
+        if params is not None:
+            if isinstance(params, dict):
+                for key, value in self._process_params_dict(params).items():
+                    stmt = stmt.replace(key, value, 1)
+            elif isinstance(params, (list, tuple)):
+                psub = _ParamSubstitutor(self._process_params(params))
+                stmt = RE_PY_PARAM.sub(psub, stmt)
+                if psub.remaining != 0:
+                    raise errors.ProgrammingError(
+                        "Not all parameters were used in the SQL statement")
+        return stmt
+
+    def execute(self, operation, params=None, multi=False, timeout=None):
         """Executes the given operation
 
         Executes the given operation substituting any markers with
@@ -466,6 +566,13 @@ class MySQLCursor(CursorBase):
         statements in one operation. If not set and multiple results are
         found, an InterfaceError will be raised.
 
+        When timeout is given, executing the statement, including reading
+        a buffered result, is aborted after timeout seconds and
+        OperationalError is raised. The connection is closed then, and
+        when the connection option kill_query_on_timeout is set, the
+        statement is also killed on the MySQL server. A timeout can not
+        be used together with multi.
+
         If warnings where generated, and connection.get_warnings is True, then
         self._warnings will be a list containing these warnings.
 
@@ -477,44 +584,83 @@ class MySQLCursor(CursorBase):
             raise errors.InternalError("Unread result found.")
 
         self._reset_result()
-        stmt = ''
-
-        try:
-            if not isinstance(operation, bytes):
-                stmt = operation.encode(self._connection.charset)
-            else:
-                stmt = operation
-        except (UnicodeDecodeError, UnicodeEncodeError) as err:
-            raise errors.ProgrammingError(str(err))
-
-        if params is not None:
-            if isinstance(params, dict):
-                for key, value in self._process_params_dict(params).items():
-                    stmt = stmt.replace(key, value, 1)
-            elif isinstance(params, (list, tuple)):
-                psub = _ParamSubstitutor(self._process_params(params))
-                stmt = RE_PY_PARAM.sub(psub, stmt)
-                if psub.remaining != 0:
-                    raise errors.ProgrammingError(
-                        "Not all parameters were used in the SQL statement")
+        stmt = self._make_statement(operation, params)
 
         if multi:
+            if timeout is not None:
+                raise errors.ProgrammingError(
+                    "A timeout can not be used with multi=True")
             self._executed = stmt
             self._executed_list = []
             return self._execute_iter(self._connection.cmd_query_iter(stmt))
         else:
             self._executed = stmt
+            # pylint: disable=W0212
+            if timeout is not None:
+                self._connection._set_deadline(timeout)
             try:
                 self._handle_result(self._connection.cmd_query(stmt))
             except errors.InterfaceError:
-                if self._connection._have_next_result:  # pylint: disable=W0212
+                if self._connection._have_next_result:
                     raise errors.InterfaceError(
                         "Use multi=True when executing multiple statements")
                 raise
+            except errors.OperationalError as err:
+                if timeout is not None:
+                    self._connection._check_deadline(err)
+                raise
+            finally:
+                if timeout is not None and self._connection._deadline:
+                    self._connection._set_deadline(None)
+            # pylint: enable=W0212
             return None
 
-    def _batch_insert(self, operation, seq_params):
-        """Implemets multi row insert"""
+    def execute_pipeline(self, operations, window=32):
+        """Execute operations without waiting for each result
+
+        Each item of operations is an operation, or a tuple holding an
+        operation and its parameters. The statements are sent using
+        MySQLConnection.cmd_query_pipeline(): up to window statements are
+        sent before the first result is read, and a failing statement
+        does not stop the others.
+
+        The generator returned yields for each operation the cursor,
+        holding the result of the statement, or the errors.Error instance
+        when the statement failed. Rows which were not fetched before
+        the next result is taken are discarded.
+
+        Returns a generator.
+        """
+        if self._have_unread_result():
+            raise errors.InternalError("Unread result found.")
+
+        statements = []
+        for operation in operations:
+            params = None
+            if isinstance(operation, (list, tuple)):
+                (operation, params) = operation
+            statements.append(self._make_statement(operation, params))
+        return self._execute_pipeline_iter(statements, window)
+
+    def _execute_pipeline_iter(self, statements, window):
+        """Generator returning the results of pipelined statements"""
+        results = self._connection.cmd_query_pipeline(statements, window)
+        for stmt in statements:
+            # Stop using the previous result before the next is read
+            self._reset_result()
+            result = next(results)
+            if isinstance(result, errors.Error):
+                yield result
+            else:
+                self._handle_result(result)
+                self._executed = stmt
+                yield self
+
+    def _make_batch_insert(self, operation, seq_params):
+        """Make a multi row INSERT statement
+
+        Returns bytes.
+        """
         tmp = re.sub(RE_SQL_ON_DUPLICATE, '',
                      re.sub(RE_SQL_COMMENT, '', operation))
         matches = re.search(RE_SQL_INSERT_VALUES, tmp)
@@ -542,8 +688,7 @@ class MySQLCursor(CursorBase):
                     #for p in self._process_params(params):
                     #    tmp = tmp.replace(b'%s',p,1)
                 values.append(tmp)
-            stmt = stmt.replace(fmt, b','.join(values), 1)
-            return self.execute(stmt)
+            return stmt.replace(fmt, b','.join(values), 1)
         except (UnicodeDecodeError, UnicodeEncodeError) as err:
             raise errors.ProgrammingError(str(err))
         except errors.Error:
@@ -551,9 +696,17 @@ class MySQLCursor(CursorBase):
         except Exception as err:
             raise errors.InterfaceError(
                 "Failed executing the operation; %s" % err)
-        else:
-            self._executed = stmt
-            return self._rowcount
+
+    def _batch_insert(self, operation, seq_params):
+        """Implemets multi row insert"""
+        stmt = self._make_batch_insert(operation, seq_params)
+        try:
+            return self.execute(stmt)
+        except errors.Error:
+            raise
+        except Exception as err:
+            raise errors.InterfaceError(
+                "Failed executing the operation; %s" % err)
 
     def executemany(self, operation, seq_params):
         """Execute the given operation multiple times
@@ -723,41 +876,68 @@ class MySQLCursor(CursorBase):
     def _handle_eof(self, eof):
         """Handle EOF packet"""
         self._connection.unread_result = False
-        self._nextrow = (None, None)
         self._warning_count = eof['warning_count']
         if self._connection.get_warnings is True and eof['warning_count']:
             self._warnings = self._fetch_warnings()
 
+    def _fetch_batch(self):
+        """Read the next batch of rows from the result set
+
+        At most batch_size rows are read and added to the rows waiting to
+        be fetched.
+        """
+        (rows, eof) = self._connection.get_rows(
+            count=max(self.batch_size, 1), binary=self._binary,
+            columns=self.description, converters=self._fused_converters)
+        self._nextrows.extend(rows)
+        if eof is not None:
+            self._handle_eof(eof)
+
     def _fetch_row(self):
         """Returns the next row in the result set
 
+        Rows are read from the server in batches. The next batch is read as
+        soon as the last waiting row is taken so the EOF is handled together
+        with the last row of the result set.
+
         Returns a tuple or None.
         """
-        if not self._have_unread_result():
-            return None
-        row = None
-
-        if self._nextrow == (None, None):
-            (row, eof) = self._connection.get_row(
-                binary=self._binary, columns=self.description)
+        if not self._nextrows:
+            if not self._have_more_rows():
+                return None
+            self._fetch_batch()
+            if not self._nextrows:
+                return None
+
+        row = self._nextrows.popleft()
+        if not self._nextrows and self._have_more_rows():
+            self._fetch_batch()
+        if self._rowcount == -1:
+            self._rowcount = 1
         else:
-            (row, eof) = self._nextrow
-
-        if row:
-            self._nextrow = self._connection.get_row(
-                binary=self._binary, columns=self.description)
-            eof = self._nextrow[1]
-            if eof is not None:
-                self._handle_eof(eof)
-            if self._rowcount == -1:
-                self._rowcount = 1
-            else:
-                self._rowcount += 1
-        if eof:
-            self._handle_eof(eof)
+            self._rowcount += 1
 
         return row
 
+    def _fetch_all_rows(self):
+        """Returns all remaining rows in the result set
+
+        Raises InterfaceError when there is no result set.
+
+        Returns a list.
+        """
+        if not self._nextrows and not self._have_unread_result():
+            raise errors.InterfaceError("No result set to fetch from.")
+        rows = list(self._nextrows)
+        self._nextrows.clear()
+        if self._have_unread_result():
+            (more, eof) = self._connection.get_rows(
+                binary=self._binary, columns=self.description,
+                converters=self._fused_converters)
+            rows.extend(more)
+            self._handle_eof(eof)
+        return rows
+
     def fetchwarnings(self):
         """Returns Warnings."""
         return self._warnings
@@ -769,13 +949,15 @@ class MySQLCursor(CursorBase):
         """
         row = self._fetch_row()
         if row:
+            if self._fused_converters is not None:
+                return row
             return self._row_to_python(row)
         return None
 
     def fetchmany(self, size=None):
         res = []
         cnt = (size or self.arraysize)
-        while cnt > 0 and self._have_unread_result():
+        while cnt > 0 and (self._nextrows or self._have_more_rows()):
             cnt -= 1
             row = self.fetchone()
             if row:
@@ -783,13 +965,11 @@ class MySQLCursor(CursorBase):
         return res
 
     def fetchall(self):
-        if not self._have_unread_result():
-            raise errors.InterfaceError("No result set to fetch from.")
-        (rows, eof) = self._connection.get_rows()
-        if self._nextrow[0]:
-            rows.insert(0, self._nextrow[0])
-        res = [self._row_to_python(row) for row in rows]
-        self._handle_eof(eof)
+        rows = self._fetch_all_rows()
+        if self._fused_converters is not None:
+            res = rows
+        else:
+            res = self._rows_to_python(rows)
         rowcount = len(rows)
         if rowcount >= 0 and self._rowcount == -1:
             self._rowcount = 0
@@ -856,7 +1036,9 @@ class MySQLCursorBuffered(MySQLCursor):
         self._next_row = 0
 
     def _handle_resultset(self):
-        (self._rows, eof) = self._connection.get_rows()
+        (self._rows, eof) = self._connection.get_rows(
+            converters=self._fused_converters,
+            packed=self._connection.compact_buffered)
         self._rowcount = len(self._rows)
         self._handle_eof(eof)
         self._next_row = 0
@@ -872,7 +1054,7 @@ class MySQLCursorBuffered(MySQLCursor):
         row = None
         try:
             row = self._rows[self._next_row]
-        except:
+        except (IndexError, TypeError):
             return None
         else:
             self._next_row += 1
@@ -882,9 +1064,10 @@ class MySQLCursorBuffered(MySQLCursor):
     def fetchall(self):
         if self._rows is None:
             raise errors.InterfaceError("No result set to fetch from.")
-        res = []
-        for row in self._rows[self._next_row:]:
-            res.append(self._row_to_python(row))
+        if self._fused_converters is not None:
+            res = self._rows[self._next_row:]
+        else:
+            res = self._rows_to_python(self._rows[self._next_row:])
         self._next_row = len(self._rows)
         return res
 
@@ -908,6 +1091,10 @@ class MySQLCursorRaw(MySQLCursor):
     """
     Skips conversion from MySQL datatypes to Python types when fetching rows.
     """
+    def __init__(self, connection=None):
+        MySQLCursor.__init__(self, connection)
+        self._raw = True
+
     def fetchone(self):
         row = self._fetch_row()
         if row:
@@ -915,12 +1102,7 @@ class MySQLCursorRaw(MySQLCursor):
         return None
 
     def fetchall(self):
-        if not self._have_unread_result():
-            raise errors.InterfaceError("No result set to fetch from.")
-        (rows, eof) = self._connection.get_rows()
-        if self._nextrow[0]:
-            rows.insert(0, self._nextrow[0])
-        self._handle_eof(eof)
+        rows = self._fetch_all_rows()
         rowcount = len(rows)
         if rowcount >= 0 and self._rowcount == -1:
             self._rowcount = 0
@@ -933,6 +1115,10 @@ class MySQLCursorBufferedRaw(MySQLCursorBuffered):
     Cursor which skips conversion from MySQL datatypes to Python types when
     fetching rows and fetches rows within execute().
     """
+    def __init__(self, connection=None):
+        MySQLCursorBuffered.__init__(self, connection)
+        self._raw = True
+
     def fetchone(self):
         row = self._fetch_row()
         if row:
@@ -949,16 +1135,51 @@ class MySQLCursorBufferedRaw(MySQLCursorBuffered):
         return self._rows is not None
 
 
+class MySQLCursorSpooled(MySQLCursorBuffered):
+    """Buffered cursor writing large result sets to a temporary file
+
+    Like MySQLCursorBuffered, all rows are read within execute() so the
+    connection can be used again right away. Rows are kept packed and,
+    once more than spill_size bytes were read, written to a temporary
+    file which is read back through mmap when fetching.
+    """
+    def __init__(self, connection=None):
+        MySQLCursorBuffered.__init__(self, connection)
+        self.spill_size = 16 * 1024 * 1024
+
+    def _handle_resultset(self):
+        (self._rows, eof) = self._connection.get_rows(
+            converters=self._fused_converters, packed=True,
+            spill_size=max(self.spill_size, 0))
+        self._rowcount = len(self._rows)
+        self._handle_eof(eof)
+        self._next_row = 0
+        self._connection.unread_result = False
+
+    def reset(self):
+        if self._rows is not None:
+            self._rows.close()
+        self._rows = None
+
+
 class MySQLCursorPrepared(MySQLCursor):
     """Cursor using MySQL Prepared Statements
+
+    When server_side is True, statements are executed opening a read-only
+    cursor on the MySQL server. Rows are then fetched from it in batches
+    of arraysize rows, and the connection can be used for other
+    statements between fetches.
     """
-    def __init__(self, connection=None):
+    def __init__(self, connection=None, server_side=False):
         super(MySQLCursorPrepared, self).__init__(connection)
         self._rows = None
         self._next_row = 0
         self._prepared = None
+        self._statement = None
         self._binary = True
         self._have_result = None
+        self.server_side = server_side
+        self._cursor_open = False
 
     def callproc(self, *args, **kwargs):
         """Calls a stored procedue
@@ -967,13 +1188,24 @@ class MySQLCursorPrepared(MySQLCursor):
         """
         raise errors.NotSupportedError()
 
+    def execute_pipeline(self, *args, **kwargs):
+        """Execute operations without waiting for each result
+
+        Not supported with MySQLCursorPrepared; use executemany() with
+        a window instead.
+        """
+        raise errors.NotSupportedError()
+
     def close(self):
         """Close the cursor
 
         This method will try to deallocate the prepared statement and close
-        the cursor.
+        the cursor. Statements kept in the prepared statement cache of the
+        connection are not deallocated.
         """
-        if self._prepared:
+        # Deallocating the statement also closes its server-side cursor
+        self._cursor_open = False
+        if self._prepared and not self._is_cached():
             try:
                 self._connection.cmd_stmt_close(self._prepared['statement_id'])
             except errors.Error:
@@ -990,6 +1222,63 @@ class MySQLCursorPrepared(MySQLCursor):
         """
         pass
 
+    def _is_cached(self):
+        """Check whether the connection caches prepared statements
+
+        Server-side cursors do not use the cache since executing a
+        statement closes the cursor another cursor opened for it.
+        """
+        # pylint: disable=W0212
+        return (not self.server_side and
+                self._connection._prepared_statements is not None)
+
+    def _close_server_cursor(self):
+        """Close the cursor opened on the MySQL server
+
+        Rows which were fetched but not yet taken are discarded.
+        """
+        self._nextrows.clear()
+        if self._cursor_open:
+            self._cursor_open = False
+            self._connection.cmd_stmt_reset(self._prepared['statement_id'])
+
+    def _have_more_rows(self):
+        """Check whether rows are left to be read for the result set"""
+        return self._cursor_open or self._have_unread_result()
+
+    def _fetch_batch(self):
+        """Read the next batch of rows from the result set
+
+        Rows of a cursor opened on the MySQL server are fetched in
+        batches of arraysize rows.
+        """
+        if not self._cursor_open:
+            super(MySQLCursorPrepared, self)._fetch_batch()
+            return
+        (rows, eof) = self._connection.cmd_stmt_fetch(
+            self._prepared['statement_id'], self.description,
+            max(self.arraysize, 1))
+        self._nextrows.extend(rows)
+        if not rows or flag_is_set(ServerFlag.STATUS_LAST_ROW_SENT,
+                                   eof['status_flag']):
+            self._cursor_open = False
+        self._handle_eof(eof)
+
+    def _fetch_all_rows(self):
+        """Returns all remaining rows in the result set
+
+        Raises InterfaceError when there is no result set.
+
+        Returns a list.
+        """
+        if not self._cursor_open:
+            return super(MySQLCursorPrepared, self)._fetch_all_rows()
+        while self._cursor_open:
+            self._fetch_batch()
+        rows = list(self._nextrows)
+        self._nextrows.clear()
+        return rows
+
     def _handle_result(self, res):
         """Handle result after execution"""
         if isinstance(res, dict):
@@ -998,20 +1287,23 @@ class MySQLCursorPrepared(MySQLCursor):
             self._handle_noresultset(res)
         else:
             self._description = res[1]
-            self._connection.unread_result = True
             self._have_result = True
+            if flag_is_set(ServerFlag.STATUS_CURSOR_EXISTS,
+                           res[2]['status_flag']):
+                # Rows are fetched from the cursor opened on the server
+                self._cursor_open = True
+            else:
+                self._connection.unread_result = True
 
-    def execute(self, operation, params=(), multi=False):  # multi is unused
-        """Prepare and execute a MySQL Prepared Statement
-
-        This method will preare the given operation and execute it using
-        the optionally given parameters.
+    def _prepare(self, operation):
+        """Prepare the operation unless it already is
 
         If the cursor instance already had a prepared statement, it is
-        first closed.
+        first closed, unless the connection caches prepared statements.
         """
+        # pylint: disable=W0212
         if operation is not self._executed:
-            if self._prepared:
+            if self._prepared and not self._is_cached():
                 self._connection.cmd_stmt_close(self._prepared['statement_id'])
 
             self._executed = operation
@@ -1025,13 +1317,60 @@ class MySQLCursorPrepared(MySQLCursor):
             if b'%s' in operation:
                 operation = re.sub(RE_SQL_FIND_PARAM, b'?', operation)
 
+            self._statement = operation
             try:
-                self._prepared = self._connection.cmd_stmt_prepare(operation)
+                if self._is_cached():
+                    self._prepared = self._connection._stmt_prepare_cached(
+                        operation)
+                else:
+                    self._prepared = self._connection.cmd_stmt_prepare(
+                        operation)
             except errors.Error:
                 self._executed = None
                 raise
+        elif self._is_cached():
+            # Other cursors could have made the statement be evicted
+            self._prepared = self._connection._stmt_prepare_cached(
+                self._statement)
+
+        if self._connection._stmt_reset_needed(self._prepared['statement_id']):
+            self._connection.cmd_stmt_reset(self._prepared['statement_id'])
+        # pylint: enable=W0212
 
-        self._connection.cmd_stmt_reset(self._prepared['statement_id'])
+    def execute(self, operation, params=(), multi=False,  # multi is unused
+                timeout=None):
+        """Prepare and execute a MySQL Prepared Statement
+
+        This method will preare the given operation and execute it using
+        the optionally given parameters.
+
+        If the cursor instance already had a prepared statement, it is
+        first closed, unless the connection caches prepared statements.
+        A cursor opened on the MySQL server by the previous execution is
+        closed.
+
+        When timeout is given, preparing and executing the statement is
+        aborted after timeout seconds, like MySQLCursor.execute() does.
+        """
+        # pylint: disable=W0212
+        if timeout is not None:
+            self._connection._set_deadline(timeout)
+        try:
+            self._execute_prepared(operation, params)
+        except errors.OperationalError as err:
+            if timeout is not None:
+                self._connection._check_deadline(err)
+            raise
+        finally:
+            if timeout is not None and self._connection._deadline:
+                self._connection._set_deadline(None)
+        # pylint: enable=W0212
+
+    def _execute_prepared(self, operation, params):
+        """Prepare and execute the statement for execute()"""
+        if self.server_side:
+            self._close_server_cursor()
+        self._prepare(operation)
 
         if self._prepared['parameters'] and not params:
             return
@@ -1041,13 +1380,17 @@ class MySQLCursorPrepared(MySQLCursor):
                 msg="Incorrect number of arguments "
                     "executing prepared statement")
 
+        flags = CursorType.NO_CURSOR
+        if self.server_side:
+            flags = CursorType.READ_ONLY
         res = self._connection.cmd_stmt_execute(
             self._prepared['statement_id'],
             data=params,
-            parameters=self._prepared['parameters'])
+            parameters=self._prepared['parameters'],
+            flags=flags)
         self._handle_result(res)
 
-    def executemany(self, operation, seq_params):
+    def executemany(self, operation, seq_params, window=None):
         """Prepare and execute a MySQL Prepared Statement many times
 
         This method will prepare the given operation and execute with each
@@ -1056,8 +1399,19 @@ class MySQLCursorPrepared(MySQLCursor):
         If the cursor instance already had a prepared statement, it is
         first closed.
 
-        executemany() simply calls execute().
+        executemany() simply calls execute(), unless window is given.
+        The executions are then pipelined: up to window statements are
+        sent to the MySQL server before reading their results. When an
+        execution fails, the error is raised once the results of the
+        statements already sent were read. Its row_index attribute holds
+        the position in seq_params of the parameters which failed, and
+        rowcount the rows affected by the executions which succeeded,
+        including those sent before the failure was noticed.
         """
+        if window:
+            self._executemany_pipelined(operation, seq_params, window)
+            return
+
         rowcnt = 0
         try:
             for params in seq_params:
@@ -1073,6 +1427,38 @@ class MySQLCursorPrepared(MySQLCursor):
             raise
         self._rowcount = rowcnt
 
+    def _executemany_pipelined(self, operation, seq_params, window):
+        """Execute a MySQL Prepared Statement many times, pipelined"""
+        if self.server_side:
+            self._close_server_cursor()
+        self._prepare(operation)
+        results = self._connection.cmd_stmt_execute_pipeline(
+            self._prepared['statement_id'], seq_params,
+            self._prepared['parameters'], window)
+
+        rowcnt = 0
+        error = None
+        for row_index, result in enumerate(results):
+            if isinstance(result, Exception):
+                if error is None:
+                    error = result
+                    error_index = row_index
+                continue
+            if 'rows' in result:
+                # Result sets are discarded, like executemany() does
+                rowcnt += len(result['rows'])
+            else:
+                self._handle_noresultset(result)
+                rowcnt += self._rowcount
+        self._rowcount = rowcnt
+        if error is not None:
+            if isinstance(error, (ValueError, TypeError)):
+                error = errors.InterfaceError(
+                    "Failed executing the operation; {error}".format(
+                        error=error))
+            error.row_index = error_index
+            raise error
+
     def fetchone(self):
         """Returns next row of a query result set
 
@@ -1083,7 +1469,7 @@ class MySQLCursorPrepared(MySQLCursor):
     def fetchmany(self, size=None):
         res = []
         cnt = (size or self.arraysize)
-        while cnt > 0 and self._have_unread_result():
+        while cnt > 0 and (self._nextrows or self._have_more_rows()):
             cnt -= 1
             row = self._fetch_row()
             if row:
@@ -1091,10 +1477,121 @@ class MySQLCursorPrepared(MySQLCursor):
         return res
 
     def fetchall(self):
-        if not self._have_unread_result():
-            raise errors.InterfaceError("No result set to fetch from.")
-        (rows, eof) = self._connection.get_rows(
-            binary=self._binary, columns=self.description)
+        rows = self._fetch_all_rows()
         self._rowcount = len(rows)
-        self._handle_eof(eof)
         return rows
+
+
+def _prefetch_rows(connection, rows_queue, stop, count, columns, converters):
+    """Read the rows of a result set for MySQLCursorPrefetch
+
+    Rows are read in batches of count rows and put in rows_queue as tuples
+    (rows, eof, error) until the EOF is read, an error occurs or stop is set.
+    """
+    while not stop.is_set():
+        try:
+            (rows, eof) = connection.get_rows(
+                count=count, columns=columns, converters=converters)
+            batch = (rows, eof, None)
+        except Exception as err:  # pylint: disable=W0703
+            batch = ([], None, err)
+        while not stop.is_set():
+            try:
+                rows_queue.put(batch, timeout=PREFETCH_POLL_INTERVAL)
+                break
+            except Full:
+                pass
+        if batch[1] is not None or batch[2] is not None:
+            return
+
+
+class MySQLCursorPrefetch(MySQLCursor):
+    """Cursor reading the result set using a background thread
+
+    Rows are read from the server and converted by a worker thread in
+    batches of batch_size rows. At most prefetch batches are queued so
+    reading the result set overlaps with processing the fetched rows.
+
+    Errors raised while reading are raised again by the fetch methods.
+    The connection can not be used for other statements until the result
+    set is read completely, as with MySQLCursor.
+    """
+    def __init__(self, connection=None, prefetch=None):
+        super(MySQLCursorPrefetch, self).__init__(connection)
+        self.prefetch = prefetch or 4
+        self._prefetch_queue = None
+        self._prefetch_stop = None
+        self._prefetch_thread = None
+
+    def _reset_result(self):
+        """Reset the cursor to default"""
+        self._stop_prefetch()
+        super(MySQLCursorPrefetch, self)._reset_result()
+
+    def _have_more_rows(self):
+        """Check whether the worker thread is still reading rows"""
+        return self._prefetch_thread is not None
+
+    def _handle_resultset(self):
+        """Start reading the result set using a worker thread"""
+        stop = threading.Event()
+        self._prefetch_queue = Queue(max(self.prefetch, 1))
+        self._prefetch_stop = stop
+        self._prefetch_thread = threading.Thread(
+            target=_prefetch_rows,
+            args=(self._connection, self._prefetch_queue, stop,
+                  max(self.batch_size, 1), self.description,
+                  self._fused_converters))
+        self._prefetch_thread.daemon = True
+        # Stop the worker when the cursor is garbage collected
+        self._prefetch_thread.cursor_ref = weakref.ref(
+            self, lambda ref: stop.set())
+        self._prefetch_thread.start()
+
+    def _stop_prefetch(self):
+        """Stop the worker thread discarding the rows it read"""
+        if self._prefetch_thread is None:
+            return
+        self._prefetch_stop.set()
+        self._prefetch_thread.join()
+        self._prefetch_thread = None
+        self._prefetch_queue = None
+
+    def _fetch_batch(self):
+        """Take the next batch of rows read by the worker thread"""
+        (rows, eof, error) = self._prefetch_queue.get()
+        if eof is not None or error is not None:
+            self._prefetch_thread.join()
+            self._prefetch_thread = None
+            self._prefetch_queue = None
+        if error is not None:
+            raise error
+        self._nextrows.extend(rows)
+        if eof is not None:
+            self._handle_eof(eof)
+
+    def _fetch_all_rows(self):
+        """Returns all remaining rows in the result set
+
+        Raises InterfaceError when there is no result set.
+
+        Returns a list.
+        """
+        if not self._nextrows and not self._have_more_rows():
+            raise errors.InterfaceError("No result set to fetch from.")
+        while self._have_more_rows():
+            self._fetch_batch()
+        rows = list(self._nextrows)
+        self._nextrows.clear()
+        return rows
+
+    def close(self):
+        """Close the cursor
+
+        The worker thread is stopped before closing. When the result set
+        was not read completely, InternalError is raised.
+
+        Returns True when successful, otherwise False.
+        """
+        self._stop_prefetch()
+        return super(MySQLCursorPrefetch, self).close()
@@ -26,7 +26,25 @@
 
 __MYSQL_DEBUG__ = False
 
+import mmap
 import struct
+import tempfile
+from array import array
+
+# Size of length encoded integers, keyed by their first byte
+_LC_INT_SIZES = {
+    252: 2,  # \xfc
+    253: 3,  # \xfd
+    254: 8,  # \xfe
+}
+
+# Unsigned little-endian integers, keyed by their size
+_INT_STRUCTS = {
+    1: struct.Struct('<B'),
+    2: struct.Struct('<H'),
+    4: struct.Struct('<I'),
+    8: struct.Struct('<Q'),
+}
 
 
 def intread(buf):
@@ -184,51 +202,85 @@ def read_lc_string(buf):
     if fst == 254:
         lsize = 8
 
-    length = intread(buf[1:lsize + 1])
+    length = intread(bytes(buf[1:lsize + 1]))
     return (buf[lsize + length + 1:], buf[lsize + 1:length + lsize + 1])
 
-def read_lc_string_list(buf):
+def read_lc_string_list(buf, offset=0):
     """Reads all length encoded strings from the given buffer
 
+    The buffer can be a bytes-object or a memoryview. Strings are read
+    starting at offset without slicing the buffer; only the values
+    themselves are copied.
+
     Returns a list of bytes
     """
     byteslst = []
-    view = memoryview(buf)
-    sizes = {
-        b'\xfc': 2,
-        b'\xfd': 3,
-        b'\xfe': 8
-        }
-
-    while view:
-        first = bytes(view[0:1])
-        if first == b'\xff':
+    pos = offset
+    len_buf = len(buf)
+    while pos < len_buf:
+        fst = buf[pos]
+        if fst == 251:  # \xfb
+            # NULL value
+            byteslst.append(None)
+            pos += 1
+            continue
+        elif fst == 255:  # \xff
             # Special case when MySQL error 1317 is returned by MySQL.
             # We simply return None.
             return None
-        if first == b'\xfb':
-            # NULL value
-            byteslst.append(None)
-            view = view[1:]
+
+        if fst <= 250:  # \xFA
+            length = fst
+            pos += 1
         else:
-            if first <= b'\xfa':
-                length = first[0]
-                byteslst.append(bytes(view[1:length + 1]))
-                view = view[1 + length:]
-            else:
-                lsize = 0
-                try:
-                    lsize = sizes[first]
-                except KeyError:
-                    print(buf)
-                    print(_digest_buffer(buf))
-                    return None
-                length = intread(bytes(view[1:lsize + 1]))
-                byteslst.append(bytes(view[lsize + 1:length + lsize + 1]))
-                view = view[lsize + length + 1:]
+            try:
+                lsize = _LC_INT_SIZES[fst]
+            except KeyError:
+                print(buf)
+                print(_digest_buffer(buf))
+                return None
+            length = intread(bytes(buf[pos + 1:pos + lsize + 1]))
+            pos += lsize + 1
+        byteslst.append(bytes(buf[pos:pos + length]))
+        pos += length
 
     return tuple(byteslst)
 
+def read_lc_values(buf, converters, offset=0):
+    """Reads and converts all length encoded values from the given buffer
+
+    Like read_lc_string_list(), but the row is walked only once: each value
+    is passed to the function of its column in converters, as returned by
+    MySQLConverter.row_converters(). NULL values are returned as None.
+
+    Returns a tuple
+    """
+    values = []
+    pos = offset
+    for convert in converters:
+        fst = buf[pos]
+        if fst == 251:  # \xfb
+            # NULL value
+            values.append(None)
+            pos += 1
+            continue
+        elif fst == 255:  # \xff
+            # Special case when MySQL error 1317 is returned by MySQL.
+            # We simply return None.
+            return None
+
+        if fst <= 250:  # \xFA
+            length = fst
+            pos += 1
+        else:
+            lsize = _LC_INT_SIZES[fst]
+            length = intread(bytes(buf[pos + 1:pos + lsize + 1]))
+            pos += lsize + 1
+        values.append(convert(bytes(buf[pos:pos + length])))
+        pos += length
+
+    return tuple(values)
+
 def read_string(buf, end=None, size=None):
     """
     Reads a string up until a character or for a given size.
@@ -286,6 +338,193 @@ def read_lc_int(buf):
         raise ValueError("Failed reading length encoded integer")
 
 
+class PacketReader(object):
+    """Reads values from a packet while keeping track of the position
+
+    The read_*() functions return the truncated buffer together with the
+    value, slicing the packet for every field. PacketReader instead moves
+    an offset through the buffer and uses precompiled structures.
+    """
+    __slots__ = ('buf', 'pos')
+
+    def __init__(self, buf, pos=0):
+        self.buf = buf
+        self.pos = pos
+
+    def remaining(self):
+        """Returns the number of bytes left to read"""
+        return len(self.buf) - self.pos
+
+    def skip(self, size):
+        """Skips size bytes"""
+        self.pos += size
+
+    def unpack(self, struct_):
+        """Unpacks values using a struct.Struct at the current position
+
+        Returns a tuple.
+        """
+        res = struct_.unpack_from(self.buf, self.pos)
+        self.pos += struct_.size
+        return res
+
+    def read_int(self, size):
+        """Reads an unsigned little-endian integer of size bytes"""
+        try:
+            res = _INT_STRUCTS[size].unpack_from(self.buf, self.pos)[0]
+        except KeyError:
+            res = intread(bytes(self.buf[self.pos:self.pos + size]))
+        self.pos += size
+        return res
+
+    def read_bytes(self, size):
+        """Reads size bytes"""
+        res = self.buf[self.pos:self.pos + size]
+        self.pos += size
+        return res
+
+    def read_string(self, end):
+        """Reads bytes up until the end byte, which is skipped"""
+        try:
+            idx = self.buf.index(end, self.pos)
+        except ValueError:
+            raise ValueError("end byte not present in buffer")
+        res = self.buf[self.pos:idx]
+        self.pos = idx + 1
+        return res
+
+    def read_lc_int(self):
+        """Reads a length encoded integer
+
+        Returns an integer or None for NULL.
+        """
+        try:
+            lcbyte = self.buf[self.pos]
+        except IndexError:
+            raise ValueError("Empty buffer.")
+        self.pos += 1
+        if lcbyte < 251:
+            return lcbyte
+        elif lcbyte == 251:
+            return None
+        try:
+            size = _LC_INT_SIZES[lcbyte]
+        except KeyError:
+            raise ValueError("Failed reading length encoded integer")
+        return self.read_int(size)
+
+    def read_lc_string(self):
+        """Reads a length encoded string
+
+        Returns bytes or None for NULL.
+        """
+        length = self.read_lc_int()
+        if length is None:
+            return None
+        res = self.buf[self.pos:self.pos + length]
+        self.pos += length
+        return res
+
+    def skip_lc_string(self):
+        """Skips a length encoded string"""
+        length = self.read_lc_int()
+        if length:
+            self.pos += length
+
+
+class PackedRows(object):
+    """Rows kept as packed payloads and decoded when accessed
+
+    The payloads of all rows are stored in one bytearray and the end
+    offset of each row in an array, avoiding a tuple and a bytes-object
+    per column for every row. Rows are decoded using the decode function
+    when they are accessed, either by index or by slice.
+    """
+    __slots__ = ('buf', 'ends', 'decode')
+
+    def __init__(self, decode):
+        self.buf = bytearray()
+        self.ends = array('Q')
+        self.decode = decode
+
+    def append(self, payload):
+        """Adds the payload of a row"""
+        self.buf += payload
+        self.ends.append(len(self.buf))
+
+    def __len__(self):
+        return len(self.ends)
+
+    def _row(self, index):
+        """Decodes the row at index"""
+        start = self.ends[index - 1] if index else 0
+        view = memoryview(self.buf)
+        try:
+            return self.decode(view[start:self.ends[index]])
+        finally:
+            # Rows can still be appended to, or the mmap closed
+            view.release()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("row index out of range")
+        return self._row(index)
+
+
+class SpooledRows(PackedRows):
+    """PackedRows moving the payloads to a temporary file when large
+
+    Once more than max_size bytes of payloads are kept in memory, they are
+    written to a temporary file. After finish() is called, the rows are
+    read back from the file through mmap.
+    """
+    __slots__ = ('max_size', 'size', 'file')
+
+    def __init__(self, decode, max_size):
+        super(SpooledRows, self).__init__(decode)
+        self.max_size = max_size
+        self.size = 0
+        self.file = None
+
+    def append(self, payload):
+        """Adds the payload of a row"""
+        self.buf += payload
+        self.size += len(payload)
+        self.ends.append(self.size)
+        if len(self.buf) > self.max_size:
+            self._spill()
+
+    def _spill(self):
+        """Writes the payloads kept in memory to the temporary file"""
+        if self.file is None:
+            self.file = tempfile.TemporaryFile()
+        self.file.write(self.buf)
+        self.buf = bytearray()
+
+    def finish(self):
+        """Maps the temporary file when payloads were written to it"""
+        if self.file is None:
+            return
+        self._spill()
+        self.file.flush()
+        self.buf = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        """Closes the temporary file, if any"""
+        if self.file is None:
+            return
+        if isinstance(self.buf, mmap.mmap):
+            self.buf.close()
+        self.buf = bytearray()
+        self.ends = array('Q')
+        self.file.close()
+        self.file = None
+
+
 #
 # For debugging
 #
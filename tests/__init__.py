@@ -142,6 +142,8 @@ def get_test_modules():
                                 'test_*.py')
     for file_ in glob.glob(ver_specific):
         module = os.path.splitext(os.path.basename(file_))[0]
+        if module == 'test_aio' and sys.version_info < (3, 5):
+            continue
         testcases.append(
             'tests.py{major}.{module}'.format(major=major, module=module))
         LOGGER.debug('Added tests.py{major}.{module}'.format(
@@ -95,6 +95,16 @@ class DummySocket(object):
         self._server_replies = self._server_replies[bufsize:]
         return res
 
+    def recv_into(self, buffer_, nbytes=0, flags=0):
+        if self._raise_socket_error:
+            raise socket.error(self._raise_socket_error)
+        if not nbytes:
+            nbytes = len(buffer_)
+        res = self._server_replies[0:nbytes]
+        self._server_replies = self._server_replies[nbytes:]
+        buffer_[0:len(res)] = res
+        return len(res)
+
     def send(self, string, flags=0):
         if self._raise_socket_error:
             raise socket.error(self._raise_socket_error)
@@ -26,6 +26,7 @@
 
 import itertools
 from decimal import Decimal
+from collections import deque
 import time
 import datetime
 import new
@@ -50,7 +51,7 @@ class MySQLCursorTests(tests.TestsCursor):
         exp = {
             '_connection': None,
             '_stored_results': [],
-            '_nextrow': (None, None),
+            '_nextrows': deque(),
             '_warnings': None,
             '_warning_count': 0,
             '_executed': None,
@@ -86,7 +87,7 @@ class MySQLCursorTests(tests.TestsCursor):
         exp = {
             'rowcount': -1,
             '_stored_results': [],
-            '_nextrow': (None, None),
+            '_nextrows': deque(),
             '_warnings': None,
             '_warning_count': 0,
             '_executed': None,
@@ -375,6 +376,67 @@ class MySQLCursorTests(tests.TestsCursor):
         self._test_execute_cleanup(self.connection, tbl)
         self.cur.close()
 
+    def test_execute_timeout(self):
+        """MySQLCursor object execute()-method using a timeout"""
+        config = tests.get_mysql_config()
+        config['kill_query_on_timeout'] = True
+        self.cnx = connection.MySQLConnection(**config)
+        self.cur = self.cnx.cursor()
+        thread_id = self.cnx.connection_id
+
+        self.cur.execute("SELECT SLEEP(0.1)", timeout=5)
+        self.assertEqual([(0,)], self.cur.fetchall())
+        self.assertEqual(None, self.cnx._socket._deadline)
+
+        self.assertRaises(errors.ProgrammingError, self.cur.execute,
+                          "SELECT 1", multi=True, timeout=1)
+        self.assertRaises(errors.OperationalError, self.cur.execute,
+                          "SELECT SLEEP(5)", timeout=0.5)
+        self.assertFalse(self.cnx.is_connected())
+
+        # The statement was killed on the MySQL server
+        cnx = connection.MySQLConnection(**config)
+        cur = cnx.cursor()
+        cur.execute("SELECT COUNT(*) FROM INFORMATION_SCHEMA.PROCESSLIST "
+                    "WHERE ID = %s", (thread_id,))
+        self.assertEqual([(0,)], cur.fetchall())
+        cnx.close()
+
+    def test_execute_pipeline(self):
+        """MySQLCursor object execute_pipeline()-method"""
+        self.check_method(self.cur, 'execute_pipeline')
+
+        config = tests.get_mysql_config()
+        cnx = connection.MySQLConnection(**config)
+        cur = cnx.cursor()
+        operations = [
+            "SELECT 1",
+            ("SELECT %s, %s", ('a', 2)),
+            "SELECT * FROM non_existing_table_myconnpy",
+            "SET @a = 1",
+            "SELECT @a",
+        ]
+        results = []
+        for result in cur.execute_pipeline(operations, window=2):
+            if isinstance(result, errors.Error):
+                results.append(result.errno)
+            elif result.with_rows:
+                results.append(result.fetchall())
+            else:
+                results.append(result.rowcount)
+        self.assertEqual([[(1,)], [('a', 2)], 1146, 0, [(1,)]], results)
+
+        # Rows which are not fetched are discarded
+        for result in cur.execute_pipeline(["SELECT 1", "SELECT 2"]):
+            pass
+        cur.execute("SELECT 3")
+        self.assertEqual([(3,)], cur.fetchall())
+
+        cur = cnx.cursor(cursor_class=cursor.MySQLCursorPrepared)
+        self.assertRaises(errors.NotSupportedError, cur.execute_pipeline,
+                          operations)
+        cnx.close()
+
     def test_executemany(self):
         """MySQLCursor object executemany()-method"""
         self.check_method(self.cur, 'executemany')
@@ -803,6 +865,30 @@ class MySQLCursorRawBufferedTests(tests.TestsCursor):
         self.assertEqual(exp, self.cur.fetchall())
 
 
+class MySQLCursorSpooledTests(tests.TestsCursor):
+
+    def setUp(self):
+        config = tests.get_mysql_config()
+        self.cnx = connection.MySQLConnection(**config)
+        self.cur = self.cnx.cursor(cursor_class=cursor.MySQLCursorSpooled)
+
+    def tearDown(self):
+        self.cur.close()
+        self.cnx.close()
+
+    def test_execute(self):
+        self.cur.spill_size = 0
+        self.cur.execute("SELECT 1, 'string'")
+        self.assertFalse(self.cnx.unread_result)
+        spooled = self.cur._rows
+        self.assertNotEqual(None, spooled.file)
+        self.assertEqual([(1, u'string')], self.cur.fetchall())
+        self.assertEqual(None, self.cur.fetchone())
+
+        self.cur.reset()
+        self.assertEqual(None, spooled.file)
+
+
 class MySQLCursorPreparedTests(tests.TestsCursor):
 
     def setUp(self):
@@ -825,29 +911,30 @@ class MySQLCursorPreparedTests(tests.TestsCursor):
         self.assertEqual(None, cur._fetch_row())
         cur._description = [('c1', 5, None, None, None, None, 1, 128)]
 
-        # Monkey patch the get_row method of the connection for testing
-        def _get_row(binary, columns):  # pylint: disable=W0613
+        # Monkey patch the get_rows method of the connection for testing
+        def _get_rows(count=None, binary=False, columns=None,
+                      converters=None):  # pylint: disable=W0613
             try:
-                row = self.cnx._test_fetch_row[0]
-                self.cnx._test_fetch_row = self.cnx._test_fetch_row[1:]
+                rows = self.cnx._test_fetch_rows[0]
+                self.cnx._test_fetch_rows = self.cnx._test_fetch_rows[1:]
             except IndexError:
-                return None
-            return row
-        self.cnx.get_row = _get_row
+                return ([], None)
+            return rows
+        self.cnx.get_rows = _get_rows
 
         eof_info = {'status_flag': 0, 'warning_count': 2}
         self.cnx.unread_result = True
 
-        self.cnx._test_fetch_row = [('1', None), (None, eof_info)]
+        self.cnx._test_fetch_rows = [(['1'], None), ([], eof_info)]
         self.assertEqual('1', cur._fetch_row())
-        self.assertEqual((None, None), cur._nextrow)
+        self.assertEqual(deque(), cur._nextrows)
         self.assertEqual(eof_info['warning_count'], cur._warning_count)
 
         cur._reset_result()
         self.cnx.unread_result = True
-        self.cnx._test_fetch_row = [(None, eof_info)]
+        self.cnx._test_fetch_rows = [([], eof_info)]
         self.assertEqual(None, cur._fetch_row())
-        self.assertEqual((None, None), cur._nextrow)
+        self.assertEqual(deque(), cur._nextrows)
         self.assertEqual(eof_info['warning_count'], cur._warning_count)
 
     def test_execute(self):
@@ -899,6 +986,97 @@ class MySQLCursorPreparedTests(tests.TestsCursor):
         self.assertEqual(3, cur._prepared['statement_id'])
         self.assertEqual(exp, cur.fetchone())
 
+    def test_execute_cached(self):
+        config = tests.get_mysql_config()
+        config['prepared_cache_size'] = 2
+        cnx = connection.MySQLConnection(**config)
+        cur = cnx.cursor(cursor_class=cursor.MySQLCursorPrepared)
+        cur2 = cnx.cursor(cursor_class=cursor.MySQLCursorPrepared)
+
+        stmt = "SELECT (%s * 2) AS c1"
+        cur.execute(stmt, (5,))
+        self.assertEqual([(10,)], cur.fetchall())
+        cur2.execute(stmt, (6,))
+        self.assertEqual([(12,)], cur2.fetchall())
+        self.assertEqual(cur._prepared, cur2._prepared)
+        self.assertEqual({'hits': 1, 'misses': 1, 'evictions': 0},
+                         cnx.prepared_cache_stats)
+
+        # Closing a cursor keeps the cached statement
+        cur2.close()
+        self.assertEqual(['SELECT (? * 2) AS c1'],
+                         list(cnx._prepared_statements))
+
+        # Least recently used statement is evicted
+        cur2 = cnx.cursor(cursor_class=cursor.MySQLCursorPrepared)
+        cur2.execute("SELECT (%s * 3) AS c1", (1,))
+        cur2.fetchall()
+        cur2.execute("SELECT (%s * 4) AS c1", (1,))
+        cur2.fetchall()
+        self.assertEqual({'hits': 1, 'misses': 3, 'evictions': 1},
+                         cnx.prepared_cache_stats)
+
+        # Evicted statement is prepared again
+        cur.execute(stmt, (7,))
+        self.assertEqual([(14,)], cur.fetchall())
+        self.assertEqual({'hits': 1, 'misses': 4, 'evictions': 2},
+                         cnx.prepared_cache_stats)
+
+        # Changing user empties the cache
+        cnx.cmd_change_user(config['user'], config['password'],
+                            config['database'])
+        self.assertEqual(0, len(cnx._prepared_statements))
+        cnx.close()
+
+    def test_execute_timeout(self):
+        """MySQLCursorPrepared object execute()-method using a timeout"""
+        config = tests.get_mysql_config()
+        cnx = connection.MySQLConnection(**config)
+        cur = cnx.cursor(cursor_class=cursor.MySQLCursorPrepared)
+
+        cur.execute("SELECT SLEEP(%s)", (0.1,), timeout=5)
+        self.assertEqual([(0,)], cur.fetchall())
+        self.assertEqual(None, cnx._socket._deadline)
+
+        self.assertRaises(errors.OperationalError, cur.execute,
+                          "SELECT SLEEP(%s)", (5,), timeout=0.5)
+        self.assertFalse(cnx.is_connected())
+
+    def test_execute_server_side(self):
+        config = tests.get_mysql_config()
+        cnx = connection.MySQLConnection(**config)
+        cur = cnx.cursor(server_side=True)
+        cur.arraysize = 3
+        tbl = 'myconnpy_cursor'
+        self._test_execute_setup(cnx, tbl)
+        cur.executemany(
+            "INSERT INTO {table} (col1, col2) VALUES (%s, %s)".format(
+                table=tbl),
+            [(i, str(i)) for i in range(1, 11)])
+
+        stmt = "SELECT col1 FROM {table} ORDER BY col1".format(table=tbl)
+        cur.execute(stmt)
+        self.assertTrue(cur._cursor_open)
+        self.assertEqual((1,), cur.fetchone())
+
+        # The connection can be used between fetches
+        cnx.cmd_query("SELECT 1")
+        cnx.get_rows()
+        self.assertEqual([(2,), (3,), (4,)], cur.fetchmany())
+        self.assertEqual([(i,) for i in range(5, 11)], cur.fetchall())
+        self.assertFalse(cur._cursor_open)
+        self.assertEqual(None, cur.fetchone())
+
+        # Executing again closes the open cursor
+        cur.execute(stmt)
+        self.assertEqual((1,), cur.fetchone())
+        cur.execute(stmt)
+        self.assertEqual(10, len(cur.fetchall()))
+
+        self._test_execute_cleanup(cnx, tbl)
+        cur.close()
+        cnx.close()
+
     def test_executemany(self):
         cur = self.cnx.cursor(cursor_class=cursor.MySQLCursorPrepared)
 
@@ -943,6 +1121,53 @@ class MySQLCursorPreparedTests(tests.TestsCursor):
         self._test_execute_cleanup(self.cnx, tbl)
         cur.close()
 
+    def test_executemany_pipelined(self):
+        cur = self.cnx.cursor(cursor_class=cursor.MySQLCursorPrepared)
+        tbl = 'myconnpy_cursor'
+        self._test_execute_setup(self.cnx, tbl)
+        stmt_insert = "INSERT INTO {table} (col1,col2) VALUES (%s, %s)".format(
+            table=tbl)
+
+        data = [(i, str(i)) for i in range(1, 101)]
+        cur.executemany(stmt_insert, data, window=8)
+        self.assertEqual(100, cur.rowcount)
+        cur.execute("SELECT COUNT(*) FROM {table}".format(table=tbl))
+        self.assertEqual([(100,)], cur.fetchall())
+
+        # The failed row is reported; rows already sent are executed
+        # and counted, even when sent after the failed one
+        data = [(101, 'a'), (102, 'b'), (1, 'c'), (103, 'd'), (104, 'e')]
+        try:
+            cur.executemany(stmt_insert, data, window=2)
+        except errors.IntegrityError as err:
+            self.assertEqual(2, err.row_index)
+        else:
+            self.fail("IntegrityError not raised")
+        self.assertEqual(3, cur.rowcount)
+        cur.execute("SELECT COUNT(*) FROM {table}".format(table=tbl))
+        self.assertEqual([(103,)], cur.fetchall())
+
+        self.assertRaises(ValueError, cur.executemany, stmt_insert, data,
+                          window=-1)
+        try:
+            cur.executemany(stmt_insert, [(200, 'a'), (201,)], window=4)
+        except errors.ProgrammingError as err:
+            self.assertEqual(1, err.row_index)
+        else:
+            self.fail("ProgrammingError not raised")
+        try:
+            cur.executemany(stmt_insert, [(202, 'a'), 5], window=4)
+        except errors.InterfaceError as err:
+            self.assertEqual(1, err.row_index)
+        else:
+            self.fail("InterfaceError not raised")
+
+        cur.executemany("SELECT %s", [('h',), ('a',), ('m',)], window=2)
+        self.assertEqual(3, cur.rowcount)
+
+        self._test_execute_cleanup(self.cnx, tbl)
+        cur.close()
+
     def test_fetchone(self):
         cur = self.cnx.cursor(cursor_class=cursor.MySQLCursorPrepared)
 
@@ -997,3 +1222,80 @@ class MySQLCursorPreparedTests(tests.TestsCursor):
         self.assertEqual(len(rows), cur._rowcount)
         self.assertEqual(3, cur._warning_count)
         self.assertRaises(errors.InterfaceError, cur.fetchall)
+
+
+class MySQLCursorPrefetchTests(tests.TestsCursor):
+
+    def setUp(self):
+        config = tests.get_mysql_config()
+        self.cnx = connection.MySQLConnection(**config)
+
+        # Monkey patch the get_rows method of the connection for testing
+        def _get_rows(count=None, binary=False, columns=None,
+                      converters=None):  # pylint: disable=W0613
+            try:
+                rows = self.cnx._test_fetch_rows[0]
+                self.cnx._test_fetch_rows = self.cnx._test_fetch_rows[1:]
+            except IndexError:
+                return ([], None)
+            if isinstance(rows, Exception):
+                raise rows
+            if rows[1] is not None:
+                self.cnx.unread_result = False
+            return rows
+        self.cnx.get_rows = _get_rows
+
+    def tearDown(self):
+        self.cnx.close()
+
+    def test_init(self):
+        cur = cursor.MySQLCursorPrefetch(self.cnx, 2)
+        self.assertEqual(2, cur.prefetch)
+        self.assertEqual(None, cur._prefetch_thread)
+        self.assertEqual(4, cursor.MySQLCursorPrefetch(self.cnx).prefetch)
+
+    def test_fetch(self):
+        cur = self.cnx.cursor(prefetch=1)
+        self.assertTrue(isinstance(cur, cursor.MySQLCursorPrefetch))
+        cur.batch_size = 2
+        eof_info = {'status_flag': 0, 'warning_count': 2}
+        self.cnx._test_fetch_rows = [
+            ([(1,), (2,)], None), ([(3,)], None), ([], eof_info)]
+        cur._handle_result({'columns': [('c1', 3, None, None, None, None, 1,
+                                         0)]})
+        self.assertEqual((1,), cur.fetchone())
+        self.assertEqual([(2,), (3,)], cur.fetchmany(5))
+        self.assertEqual(None, cur.fetchone())
+        self.assertEqual(None, cur._prefetch_thread)
+        self.assertEqual(3, cur.rowcount)
+        self.assertEqual(2, cur._warning_count)
+        self.assertFalse(self.cnx.unread_result)
+
+        self.cnx._test_fetch_rows = [
+            ([(1,), (2,)], None), ([(3,)], eof_info)]
+        cur._handle_result({'columns': [('c1', 3, None, None, None, None, 1,
+                                         0)]})
+        self.assertEqual([(1,), (2,), (3,)], cur.fetchall())
+        self.assertRaises(errors.InterfaceError, cur.fetchall)
+
+    def test_fetch_error(self):
+        cur = self.cnx.cursor(prefetch=2)
+        error = errors.OperationalError("Lost connection")
+        self.cnx._test_fetch_rows = [([(1,)], None), error]
+        cur._handle_result({'columns': [('c1', 3, None, None, None, None, 1,
+                                         0)]})
+        self.assertRaises(errors.OperationalError, cur.fetchall)
+        self.assertEqual(None, cur._prefetch_thread)
+        self.cnx.unread_result = False
+
+    def test_close(self):
+        cur = self.cnx.cursor(prefetch=1)
+        cur.batch_size = 1
+        self.cnx._test_fetch_rows = [([(i,)], None) for i in range(10)]
+        cur._handle_result({'columns': [('c1', 3, None, None, None, None, 1,
+                                         0)]})
+        self.assertEqual((0,), cur.fetchone())
+        self.assertRaises(errors.InternalError, cur.close)
+        self.assertEqual(None, cur._prefetch_thread)
+        self.cnx.unread_result = False
+        self.assertTrue(cur.close())
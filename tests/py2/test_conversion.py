@@ -311,6 +311,40 @@ class MySQLConverterTests(tests.MySQLConnectorTests):
         res = tuple([self.cnv.to_python(v[1], v[0]) for v in data])
         self.failUnlessEqual(res, exp)
 
+    def test_row_converters(self):
+        """Get functions converting the columns of a result set"""
+        flags = constants.FieldFlag
+        data = (
+            ('3.14', constants.FieldType.DOUBLE, 0),
+            ('128', constants.FieldType.LONGLONG, flags.UNSIGNED),
+            ('3.14', constants.FieldType.NEWDECIMAL, 0),
+            ('2008-05-07', constants.FieldType.DATE, 0),
+            ('val1,val2', constants.FieldType.STRING, flags.SET),
+            ('\xc3\xa4 utf8', constants.FieldType.VAR_STRING, 0),
+            ('\xc3\xa4 binary', constants.FieldType.STRING, flags.BINARY),
+            ('\xc3\xa4 text', constants.FieldType.BLOB, 0),
+            ('\xc3\xa4 blob', constants.FieldType.BLOB, flags.BINARY),
+            ('\x80\x00\x00\x00', constants.FieldType.BIT, 0),
+            ('geometry', constants.FieldType.GEOMETRY, 0),
+        )
+        description = [('c{0}'.format(i), field_type, None, None, None,
+                        None, True, flag)
+                       for i, (_, field_type, flag) in enumerate(data)]
+        converters = self.cnv.row_converters(description)
+        self.assertEqual(len(data), len(converters))
+        for convert, flddsc, (value, _, _) in zip(converters, description,
+                                                  data):
+            self.assertEqual(self.cnv.to_python(flddsc, value),
+                             convert(value))
+
+        class Converter(conversion.MySQLConverter):
+            """Converter returning DATE values as strings"""
+            def _DATE_to_python(self, value, dsc=None):
+                return dsc[0]
+
+        converters = Converter().row_converters(description)
+        self.assertEqual('c3', converters[3](data[3][0]))
+
     def test__FLOAT_to_python(self):
         """Convert a MySQL FLOAT/DOUBLE to a Python float type"""
         data = '3.14'
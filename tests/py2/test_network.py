@@ -26,7 +26,10 @@
 
 import os
 import socket
+import struct
+import time
 import logging
+import zlib
 from collections import deque
 import unittest
 
@@ -53,6 +56,90 @@ class NetworkTests(tests.MySQLConnectorTests):
         ]
         self.assertEqual(exp, network._prepare_packets(*(data)))
 
+    def test__packet_buffers(self):
+        """Split a payload in packets without copying"""
+        exp = ['\x0e\x00\x00\x01abcdefghijklmn']
+        self.assertEqual(exp, network._packet_buffers('abcdefghijklmn', 1))
+        self.assertEqual(exp, network._packet_buffers(
+            ('abc', '', 'defghijklmn'), 1))
+        self.assertEqual(['\x00\x00\x00\xff'],
+                         network._packet_buffers('', 255))
+
+        data = 'a' * (constants.MAX_PACKET_LENGTH + 30000)
+        buffers = network._packet_buffers(('\x03', data), 255)
+        self.assertEqual('\xff\xff\xff\xff', buffers[0])
+        self.assertEqual('\x31\x75\x00\x00', buffers[-2])
+        self.assertTrue(all(isinstance(buf, memoryview)
+                            for buf in buffers[1:3] + buffers[-1:]))
+        exp = network._prepare_packets('\x03' + data, 0)
+        self.assertEqual(''.join(exp), ''.join(
+            [memoryview(buf).tobytes()
+             for buf in network._packet_buffers(('\x03', data), 0)]))
+
+        data = 'a' * constants.MAX_PACKET_LENGTH
+        buffers = network._packet_buffers(data, 0)
+        self.assertEqual('\x00\x00\x00\x01', buffers[-1])
+
+    def test__getaddrinfo(self):
+        """Resolve MySQL server addresses using the DNS cache"""
+        network._DNS_CACHE.clear()
+        exp = socket.getaddrinfo('127.0.0.1', 3306, 0, socket.SOCK_STREAM,
+                                 socket.SOL_TCP)
+        self.assertEqual(exp, network._getaddrinfo('127.0.0.1', 3306))
+        self.assertEqual({}, network._DNS_CACHE)
+
+        self.assertEqual(exp, network._getaddrinfo('127.0.0.1', 3306, 60))
+        self.assertEqual([('127.0.0.1', 3306)], list(network._DNS_CACHE))
+        network._DNS_CACHE[('127.0.0.1', 3306)] = (time.time() + 60, [])
+        self.assertEqual([], network._getaddrinfo('127.0.0.1', 3306, 60))
+        network._DNS_CACHE[('127.0.0.1', 3306)] = (time.time() - 1, [])
+        self.assertEqual(exp, network._getaddrinfo('127.0.0.1', 3306, 60))
+        network._DNS_CACHE.clear()
+
+    def test__connect_any(self):
+        """Connect to the first address accepting connections"""
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(('127.0.0.1', 0))
+        server.listen(5)
+        refused = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        refused.bind(('127.0.0.1', 0))
+        try:
+            candidates = [
+                ('refused', network._getaddrinfo(
+                    *refused.getsockname())[0]),
+                ('server', network._getaddrinfo(*server.getsockname())[0]),
+            ]
+            (sock, key, failed) = network._connect_any(
+                candidates, 5, {'tcp_nodelay': True})
+            self.assertEqual('server', key)
+            self.assertEqual(set(['refused']), failed)
+            self.assertEqual(server.getsockname(), sock.getpeername())
+            self.assertTrue(
+                sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY))
+            sock.close()
+
+            self.assertRaises(IOError, network._connect_any, candidates[0:1])
+        finally:
+            server.close()
+            refused.close()
+
+    @unittest.skipIf(not tests.SSL_AVAILABLE, "Python has no SSL support")
+    def test__get_ssl_context(self):
+        """Get the SSLContext shared by SSL configuration"""
+        import ssl
+        network._SSL_CONTEXTS.clear()
+        ca = os.path.join(tests.SSL_DIR, 'tests_CA_cert.pem')
+        context = network._get_ssl_context(ca, None, None)
+        self.assertTrue(isinstance(context, ssl.SSLContext))
+        self.assertEqual(ssl.CERT_NONE, context.verify_mode)
+        self.assertTrue(context is network._get_ssl_context(ca, None, None))
+
+        other = network._get_ssl_context(ca, None, None, verify_cert=True)
+        self.assertFalse(other is context)
+        self.assertEqual(ssl.CERT_REQUIRED, other.verify_mode)
+        self.assertEqual(2, len(network._SSL_CONTEXTS))
+        network._SSL_CONTEXTS.clear()
+
 
 class BaseMySQLSocketTests(tests.MySQLConnectorTests):
 
@@ -84,7 +171,9 @@ class BaseMySQLSocketTests(tests.MySQLConnectorTests):
             '_connection_timeout': None,
             '_packet_number': -1,
             '_packet_queue': deque(),
+            '_zip_buffer': bytearray(),
             'recvsize': 1024 * 8,
+            '_socket_options': {},
         }
 
         for key, value in exp.items():
@@ -134,9 +223,38 @@ class BaseMySQLSocketTests(tests.MySQLConnectorTests):
             except errors.Error as err:
                 self.fail("Failed sending pktnr {0}: {1}".format(
                     d[1], str(err)))
-            self.assertEqual(exp, self.cnx.sock._client_sends)
+            self.assertEqual(''.join(exp), ''.join(
+                [memoryview(buf).tobytes()
+                 for buf in self.cnx.sock._client_sends]))
             self.cnx.sock.reset()
 
+        # Payload given in parts
+        self.cnx.send_plain(('\x03', 'SELECT 1'), 0)
+        self.assertEqual(['\x09\x00\x00\x00\x03SELECT 1'],
+                         self.cnx.sock._client_sends)
+
+    def test__sendall(self):
+        """Send buffers using sendmsg()"""
+        class PartialSocket(object):
+            """Socket sending at most 1000 bytes with each sendmsg() call"""
+            def __init__(self):
+                self.calls = []
+                self.received = ''
+
+            def sendmsg(self, buffers):
+                self.calls.append(len(buffers))
+                data = ''.join([buf.tobytes() for buf in buffers])[:1000]
+                self.received += data
+                return len(data)
+
+        self.cnx.sock = PartialSocket()
+        buffers = network._packet_buffers('a' * 100000, 1)
+        self.cnx._sendall(buffers)
+        self.assertEqual(''.join([memoryview(buf).tobytes()
+                                  for buf in buffers]),
+                         self.cnx.sock.received)
+        self.assertEqual([2, 1], self.cnx.sock.calls[:2])
+
     def test_send_compressed(self):
         """Send compressed data through the socket"""
         data = 'asddfasdfasdf'
@@ -184,6 +302,57 @@ class BaseMySQLSocketTests(tests.MySQLConnectorTests):
         self.assertEqual(exp, received)
         self.cnx.sock.reset()
 
+    def test_set_compression(self):
+        """Compress packets depending on their size and ratio"""
+        self.cnx.sock = tests.DummySocket()
+        data = '\x03SELECT "' + 'a' * 100 + '"'
+        self.cnx.set_compression(level=9, threshold=200)
+        self.cnx.send_compressed(data, 0)
+        self.assertEqual('\x00\x00\x00', self.cnx.sock._client_sends[0][4:7])
+        self.cnx.sock.reset()
+
+        self.cnx.set_compression(level=9, threshold=50)
+        self.cnx.send_compressed(data, 0)
+        packet = self.cnx.sock._client_sends[0]
+        self.assertEqual(zlib.compress('\x6e\x00\x00\x00' + data, 9),
+                         packet[7:])
+        self.cnx.sock.reset()
+
+        # Incompressible payloads make the next packets be sent uncompressed
+        self.cnx.set_compression(adaptive=True)
+        stats = self.cnx.compression_stats
+        skipped = stats['skipped']
+        for _ in range(4):
+            self.cnx.send_compressed(os.urandom(1000), 0)
+        self.assertEqual(skipped + 4, stats['skipped'])
+        self.assertEqual(1, self.cnx._compress_skip)
+        self.cnx.send_compressed(data, 0)
+        self.assertEqual('\x00\x00\x00', self.cnx.sock._client_sends[-1][4:7])
+        self.cnx.send_compressed(data, 0)
+        self.assertNotEqual('\x00\x00\x00',
+                            self.cnx.sock._client_sends[-1][4:7])
+        self.assertEqual(0, self.cnx._compress_backoff)
+        self.cnx.sock.reset()
+
+    def test_compression_codecs(self):
+        """Compress packets using the codec of the compression algorithm"""
+        self.assertEqual('zlib', self.cnx.compression_algorithm)
+        codecs = [network.ZlibCodec]
+        if network.ZstdCodec.available:
+            codecs.append(network.ZstdCodec)
+        data = '\x03SELECT "' + 'a' * 100 + '"'
+        for codec in codecs:
+            self.cnx.sock = tests.DummySocket()
+            self.cnx.set_compression(codec=codec)
+            self.assertEqual(codec.name, self.cnx.compression_algorithm)
+            self.cnx.send_compressed(data, 0)
+            packet = self.cnx.sock._client_sends[0]
+            self.assertNotEqual('\x00\x00\x00', packet[4:7])
+            self.cnx.sock.reset()
+            self.cnx.sock.add_packet(packet)
+            self.assertEqual('\x6e\x00\x00\x00' + data,
+                             self.cnx.recv_compressed())
+
     def test_recv_plain(self):
         """Receive data from the socket"""
         self.cnx.sock = tests.DummySocket()
@@ -225,6 +394,40 @@ class BaseMySQLSocketTests(tests.MySQLConnectorTests):
             packet = self.cnx.recv_plain()
         self.assertEqual(exp, result)
 
+        # Packets bigger than the receive buffer are read from the socket
+        self.cnx.sock.reset()
+        self.cnx.recvsize = 16
+        exp = [
+            '\x04\x00\x00\x01\x03\x48\x61\x6d',
+            '\x18\x00\x00\x02' + '\x61' * 24,
+            '\x05\x00\x00\x03\xfe\x00\x00\x02\x00',
+        ]
+        self.cnx.sock.add_packets(exp)
+        result = [self.cnx.recv_plain() for _ in range(len(exp))]
+        self.assertEqual(exp, result)
+        self.assertEqual(3, self.cnx._packet_number)
+
+        # Receive buffer grows when smaller than a packet header
+        self.cnx.sock.reset()
+        self.cnx.recvsize = 3
+        self.cnx.sock.add_packets(exp)
+        result = [self.cnx.recv_plain() for _ in range(len(exp))]
+        self.assertEqual(exp, result)
+
+    def test_recv_plain_view(self):
+        """Receive packets as views on the receive buffer"""
+        self.cnx.sock = tests.DummySocket()
+        exp = [
+            '\x04\x00\x00\x01\x03\x48\x61\x6d',
+            '\x05\x00\x00\x02\xfe\x00\x00\x02\x00',
+        ]
+        self.cnx.sock.add_packets(exp)
+        packet = self.cnx.recv_plain_view()
+        self.assertTrue(isinstance(packet, buffer))
+        self.assertEqual(exp[0], str(packet))
+        self.assertEqual(exp[1], str(self.cnx.recv_view()))
+        self.assertEqual(2, self.cnx._packet_number)
+
     def test_recv_compressed(self):
         """Receive compressed data from the socket"""
         self.cnx.sock = tests.DummySocket()
@@ -275,13 +478,22 @@ class BaseMySQLSocketTests(tests.MySQLConnectorTests):
         ]
         self.cnx.sock.reset()
         self.cnx.sock.add_packets(packets)
-        length_exp = len(exp)
-        packet = self.cnx.recv_compressed()
-        counter = 0
-        while packet and counter < length_exp:
-            self.assertEqual(exp[counter], packet)
-            packet = self.cnx.recv_compressed()
-            counter += 1
+        for packet in exp:
+            self.assertEqual(packet, self.cnx.recv_compressed())
+        self.assertRaises(errors.InterfaceError, self.cnx.recv_compressed)
+
+        # Packets spanning compressed packets, some not compressed
+        self.cnx.sock.reset()
+        plain = ''.join(exp)
+        compressed = zlib.compress(plain[0:100])
+        self.cnx.sock.add_packets([
+            struct.pack('<I', len(compressed))[0:3] + '\x00'
+            + struct.pack('<I', 100)[0:3] + compressed,
+            struct.pack('<I', len(plain) - 100)[0:3] + '\x01\x00\x00\x00'
+            + plain[100:]])
+        for packet in exp:
+            self.assertEqual(packet, self.cnx.recv_compressed())
+        self.assertEqual(bytearray(), self.cnx._zip_buffer)
 
     def test_set_connection_timeout(self):
         """Set the connection timeout"""
@@ -289,6 +501,61 @@ class BaseMySQLSocketTests(tests.MySQLConnectorTests):
         self.cnx.set_connection_timeout(exp)
         self.assertEqual(exp, self.cnx._connection_timeout)
 
+    def test_set_read_write_timeout(self):
+        """Set the timeouts for receiving and sending packets"""
+        self.cnx.sock = tests.DummySocket()
+        self.cnx.set_connection_timeout(10)
+        self.cnx._apply_read_timeout()
+        self.assertEqual(10, self.cnx._timeout)
+
+        self.cnx.set_read_timeout(30)
+        self.cnx.set_write_timeout(5)
+        self.cnx._apply_read_timeout()
+        self.assertEqual(30, self.cnx._timeout)
+        self.cnx._apply_write_timeout()
+        self.assertEqual(5, self.cnx._timeout)
+
+        self.cnx.set_deadline(time.time() + 2)
+        self.cnx._apply_read_timeout()
+        self.assertTrue(0 < self.cnx._timeout <= 2)
+        self.cnx._apply_write_timeout()
+        self.assertTrue(0 < self.cnx._timeout <= 2)
+        self.cnx.set_deadline(time.time() - 1)
+        self.assertRaises(socket.timeout, self.cnx._apply_read_timeout)
+        self.assertRaises(socket.timeout,
+                          self.cnx._apply_write_timeout)
+
+    def test_set_socket_options(self):
+        """Set the options of the socket"""
+        self.cnx.set_socket_options(tcp_nodelay=True, keepalive=True,
+                                    keepalive_count=3,
+                                    recv_buffer_size=65536)
+        exp = {
+            'tcp_nodelay': True,
+            'keepalive': True,
+            'keepalive_idle': None,
+            'keepalive_interval': None,
+            'keepalive_count': 3,
+            'recv_buffer_size': 65536,
+            'send_buffer_size': None,
+        }
+        self.assertEqual(exp, self.cnx._socket_options)
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            network._set_socket_options(sock, self.cnx._socket_options)
+            self.assertTrue(
+                sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY))
+            self.assertTrue(
+                sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE))
+            self.assertTrue(
+                sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF) >= 65536)
+            if hasattr(socket, 'TCP_KEEPCNT'):
+                self.assertEqual(3, sock.getsockopt(socket.IPPROTO_TCP,
+                                                    socket.TCP_KEEPCNT))
+        finally:
+            sock.close()
+
 
 @unittest.skipIf(os.name == 'nt', "Skip UNIX Socket tests on Windows")
 class MySQLUnixSocketTests(tests.MySQLConnectorTests):
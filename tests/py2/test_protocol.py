@@ -129,6 +129,19 @@ class MySQLProtocolTests(tests.MySQLConnectorTests):
         res = self._protocol.make_auth(**kwargs)
         self.assertEqual(exp['nouser'], res)
 
+        # The zstd compression level ends the packet
+        kwargs['client_flags'] = (flags
+                                  | ClientFlag.ZSTD_COMPRESSION_ALGORITHM)
+        kwargs['compress_level'] = 7
+        res = self._protocol.make_auth(**kwargs)
+        self.assertEqual('\x07', res[-1:])
+        self.assertEqual(exp['nouser'][4:], res[4:-1])
+
+        for level in (-1, 0, 23):
+            kwargs['compress_level'] = level
+            self.assertRaises(errors.ProgrammingError,
+                              self._protocol.make_auth, **kwargs)
+
     def test_make_auth_ssl(self):
         """Make a SSL authentication packet"""
         cases = [
@@ -219,6 +232,12 @@ class MySQLProtocolTests(tests.MySQLConnectorTests):
         res = self._protocol.parse_handshake(handshake)
         self.assertEqual(exp, res)
 
+        # Upper 2 bytes of the capabilities
+        handshake = handshake[:49] + '\x00\x04' + handshake[51:]
+        res = self._protocol.parse_handshake(handshake)
+        self.assertEqual(41516 | ClientFlag.ZSTD_COMPRESSION_ALGORITHM,
+                         res['capabilities'])
+
     def test_parse_ok(self):
         """Parse OK-packet sent by MySQL"""
         res = self._protocol.parse_ok(OK_PACKET)
@@ -251,10 +270,38 @@ class MySQLProtocolTests(tests.MySQLConnectorTests):
         res = self._protocol.parse_eof(EOF_PACKET)
         self.assertEqual(EOF_PACKET_RESULT, res)
 
+        for packet in (EOF_PACKET[:-1], EOF_PACKET + '\x00'):
+            self.assertRaises(errors.InterfaceError,
+                              self._protocol.parse_eof, packet)
+
     def test_read_text_result(self):
         # Tested by MySQLConnectionTests.test_get_rows() and .test_get_row()
         pass
 
+    def test_read_text_result_packed(self):
+        """Read text result rows without decoding them"""
+        class _Socket(object):
+            def __init__(self, packets):
+                self.packets = list(packets)
+
+            def recv(self):
+                return self.packets.pop(0)
+
+        rows = ['\x02\x00\x00\x01\x01\x31', '\x02\x00\x00\x02\x01\x32']
+        eof = '\x05\x00\x00\x03\xfe\x00\x00\x02\x00'
+        (res, eof) = self._protocol.read_text_result_packed(
+            _Socket(rows + [eof]))
+        self.assertEqual([('1',), ('2',)], list(res))
+        self.assertEqual(2, eof['status_flag'])
+
+        # Error packet in the middle of the result set
+        error = ('\x28\x00\x00\x03\xff\x25\x05#70100'
+                 'Query execution was interrupted')
+        sock = _Socket(rows + [error, eof])
+        self.assertRaises(errors.DatabaseError,
+                          self._protocol.read_text_result_packed, sock)
+        self.assertEqual([eof], sock.packets)
+
     def test_parse_binary_prepare_ok(self):
         """Parse Prepare OK packet"""
         cases = [
@@ -281,8 +328,8 @@ class MySQLProtocolTests(tests.MySQLConnectorTests):
             self.assertEqual(exp,
                              self._protocol.parse_binary_prepare_ok(packet))
 
-    def test__parse_binary_integer(self):
-        """Parse an integer from a binary packet"""
+    def test__binary_row_decoder_integers(self):
+        """Decode integers from a binary row"""
         # Case = Expected value; pack format; field type; field flag
         cases = [
             (-128, 'b', FieldType.TINY, 0),
@@ -294,18 +341,16 @@ class MySQLProtocolTests(tests.MySQLConnectorTests):
             (4294967295, 'I', FieldType.LONG, FieldFlag.UNSIGNED),
             (9999999999, 'Q', FieldType.LONGLONG, FieldFlag.UNSIGNED),
         ]
-        field_info = [None] * 8
-        field_info[0] = 'c1'
         for exp, fmt, field_type, flag in cases:
-            field_info[1] = field_type
-            field_info[7] = flag
-            data = struct.pack(fmt, exp) + '\x00\x00'
-            res = self._protocol._parse_binary_integer(data, field_info)
-            self.assertEqual(('\x00\x00', exp), res,
+            field_info = ['c1', field_type, None, None, None, None, None,
+                          flag]
+            data = '\x00' + struct.pack('<' + fmt, exp)
+            decode = self._protocol._binary_row_decoder([field_info])
+            self.assertEqual((exp,), decode(data),
                              "Failed parsing binary integer '{0}'".format(exp))
 
-    def test__parse_binary_float(self):
-        """Parse a float/double from a binary packet"""
+    def test__binary_row_decoder_floats(self):
+        """Decode floats and doubles from a binary row"""
         # Case = Expected value; data; field type
         cases = [
             (-3.14159, '\x6e\x86\x1b\xf0\xf9\x21\x09\xc0', FieldType.DOUBLE),
@@ -313,16 +358,11 @@ class MySQLProtocolTests(tests.MySQLConnectorTests):
             (-3.14, '\xc3\xf5\x48\xc0', FieldType.FLOAT),
             (3.14, '\xc3\xf5\x48\x40', FieldType.FLOAT),
         ]
-        field_info = [None] * 8
-        field_info[0] = 'c1'
         for exp, data, field_type in cases:
-            field_info[1] = field_type
-            res = self._protocol._parse_binary_float(data + '\x00\x00',
-                                                     field_info)
-            self.assertEqual('\x00\x00', res[0],
-                             "Failed parsing binary float '{0}'".format(exp))
+            field_info = ['c1', field_type, None, None, None, None, None, 0]
+            decode = self._protocol._binary_row_decoder([field_info])
             self.assertAlmostEqual(
-                exp, res[1], places=5,
+                exp, decode('\x00' + data)[0], places=5,
                 msg="Failed parsing binary float '{0}'".format(exp))
 
     def test__parse_binary_timestamp(self):
@@ -394,6 +434,33 @@ class MySQLProtocolTests(tests.MySQLConnectorTests):
         res = self._protocol._parse_binary_values(fields, packet)
         self.assertEqual(exp, res)
 
+    def test__binary_row_decoder(self):
+        """Decode binary rows using a decoder built for the columns"""
+        fields = [('c1', FieldType.LONG, None, None, None, None, 1, 0),
+                  ('c2', FieldType.SHORT, None, None, None, None, 1,
+                   FieldFlag.UNSIGNED),
+                  ('c3', FieldType.DOUBLE, None, None, None, None, 1, 0),
+                  ('c4', FieldType.VAR_STRING, None, None, None, None, 1, 0),
+                  ('c5', FieldType.TINY, None, None, None, None, 1, 0)]
+        decode = self._protocol._binary_row_decoder(fields)
+        self.assertTrue(decode is self._protocol._binary_row_decoder(fields))
+
+        values = struct.pack('<iHd', -7, 65535, 1.5) + '\x03abc' + '\xff'
+        self.assertEqual((-7, 65535, 1.5, 'abc', -1),
+                         decode('\x00' + values))
+        self.assertEqual((-7, 65535, 1.5, 'abc', -1),
+                         decode('\x00\x00' + values, 1))
+
+        # Second and fourth column are NULL
+        packet = '\x28' + struct.pack('<id', -7, 1.5) + '\xff'
+        self.assertEqual((-7, None, 1.5, None, -1), decode(packet))
+
+        # NULL-bitmap larger than 8 bytes
+        fields = [('c', FieldType.TINY, None, None, None, None, 1, 0)] * 70
+        packet = '\x04' + '\x00' * 8 + '\x01' * 69
+        self.assertEqual((None,) + (1,) * 69,
+                         self._protocol._binary_row_decoder(fields)(packet))
+
     def test_read_binary_result(self):
         """Read MySQL binary protocol result"""
 
@@ -466,6 +533,11 @@ class MySQLProtocolTests(tests.MySQLConnectorTests):
         self.assertRaises(ValueError,
                           self._protocol._prepare_binary_time, 'spam')
 
+    def test_make_stmt_fetch(self):
+        """Make a MySQL packet with the STMT_FETCH command"""
+        exp = '\x01\x00\x00\x00\x0a\x00\x00\x00'
+        self.assertEqual(exp, self._protocol.make_stmt_fetch(1, 10))
+
     def test_make_stmt_execute(self):
         """Make a MySQL packet with the STMT_EXECUTE command"""
         statement_id = 1
@@ -490,7 +562,7 @@ class MySQLProtocolTests(tests.MySQLConnectorTests):
              '\x01\x00\x00\x00\x00\x01\x00\x00\x00\x00'
              '\x01\x00\x00\x04\x33\x2e\x31\x34'),
             (255,
-             '\x01\x00\x00\x00\x80\x01\x00\x00\x00\x00\x01\x01\x80\xff'),
+             '\x01\x00\x00\x00\x00\x01\x00\x00\x00\x00\x01\x01\x80\xff'),
             (-128,
              '\x01\x00\x00\x00\x00\x01\x00\x00\x00\x00\x01\x01\x00\x80'),
             (datetime.datetime(1977, 6, 14, 21, 20, 30),
@@ -508,6 +580,12 @@ class MySQLProtocolTests(tests.MySQLConnectorTests):
             self.assertEqual(
                 exp, res, "Failed preparing statement with '{0}'".format(data))
 
+        # Cursor type flags are not changed by parameter flags
+        exp = '\x01\x00\x00\x00\x01\x01\x00\x00\x00\x00\x01\x01\x80\xff'
+        res = self._protocol.make_stmt_execute(statement_id, (255,), (1,),
+                                               flags=1)
+        self.assertEqual(exp, res)
+
         # Testing null bitmap
         data = (None, None)
         exp = '\x01\x00\x00\x00\x00\x01\x00\x00\x00\x03\x01'
@@ -540,3 +618,30 @@ class MySQLProtocolTests(tests.MySQLConnectorTests):
         self.assertRaises(errors.ProgrammingError,
                           self._protocol.make_stmt_execute,
                           statement_id, data, (1, 2))
+
+        # Parameter types are only sent when they change
+        bound_types = {}
+        data = ('ham', 'spam')
+        exp = (
+            '\x01\x00\x00\x00\x00\x01\x00\x00\x00\x00\x01\x0f'
+            '\x00\x0f\x00\x03\x68\x61\x6d\x04\x73\x70\x61\x6d'
+        )
+        res = self._protocol.make_stmt_execute(statement_id, data, (1, 2),
+                                               bound_types=bound_types)
+        self.assertEqual(exp, res)
+        self.assertEqual({1: '\x0f\x00\x0f\x00'}, bound_types)
+        exp = (
+            '\x01\x00\x00\x00\x00\x01\x00\x00\x00\x00\x00'
+            '\x03\x68\x61\x6d\x04\x73\x70\x61\x6d'
+        )
+        res = self._protocol.make_stmt_execute(statement_id, data, (1, 2),
+                                               bound_types=bound_types)
+        self.assertEqual(exp, res)
+        res = self._protocol.make_stmt_execute(statement_id, ('ham', 1),
+                                               (1, 2), bound_types=bound_types)
+        self.assertEqual('\x01', res[10:11])
+        self.assertEqual({1: '\x0f\x00\x01\x80'}, bound_types)
+        res = self._protocol.make_stmt_execute(statement_id, (None, 'ham'),
+                                               (1, 2), bound_types=bound_types)
+        self.assertEqual('\x01', res[10:11])
+        self.assertEqual({}, bound_types)
@@ -192,6 +192,78 @@ class UtilsTests(tests.MySQLConnectorTests):
         if result != None or rest != exp:
             self.fail("Wrong result. Expected None.")
 
+    def test_read_lc_string_list(self):
+        """Read a list of length coded strings starting at an offset"""
+        buf = '\x01\x00\x00\x01' + '\x03abc\xfb\xfc\x01\x01' + 'x' * 257
+        exp = ('abc', None, 'x' * 257)
+        self.assertEqual(exp, utils.read_lc_string_list(buf[4:]))
+        self.assertEqual(exp, utils.read_lc_string_list(buf, 4))
+        result = utils.read_lc_string_list(buffer(buf), 4)
+        self.assertEqual(exp, result)
+        self.assertTrue(isinstance(result[0], str))
+
+    def test_read_lc_values(self):
+        """Read and convert a list of length coded values"""
+        buf = '\x01\x00\x00\x01' + '\x0242\xfb\xfc\x01\x01' + 'x' * 257
+        converters = (int, int, len)
+        exp = (42, None, 257)
+        self.assertEqual(exp, utils.read_lc_values(buf, converters, 4))
+        self.assertEqual(exp, utils.read_lc_values(buf[4:], converters))
+        self.assertEqual(None, utils.read_lc_values('\xff', converters))
+        self.assertRaises(ValueError, utils.read_lc_values,
+                          '\x01a', (int,))
+
+    def test_packet_reader(self):
+        """Read values from a packet using PacketReader"""
+        buf = ('\x01\x00\x00\x01' + 'spam\x00' + '\x2a\x00'
+               + '\xfc\x01\x01' + '\xfb' + '\x03ham' + '\x01x' + '\x00')
+        reader = utils.PacketReader(buf, 4)
+        self.assertEqual('spam', reader.read_string(end='\x00'))
+        self.assertEqual(42, reader.read_int(2))
+        self.assertEqual(257, reader.read_lc_int())
+        self.assertEqual(None, reader.read_lc_string())
+        self.assertEqual('ham', reader.read_lc_string())
+        reader.skip_lc_string()
+        self.assertEqual(1, reader.remaining())
+        self.assertEqual((0,), reader.unpack(struct.Struct('<B')))
+        self.assertEqual(0, reader.remaining())
+        self.assertRaises(ValueError, reader.read_lc_int)
+        self.assertRaises(ValueError, utils.PacketReader(buf).read_string,
+                          '\xff')
+
+    def test_packed_rows(self):
+        """Store rows packed and decode them when accessed"""
+        rows = utils.PackedRows(utils.read_lc_string_list)
+        rows.append('\x0242\xfb')
+        rows.append(buffer('\xff\x00\x03ham', 1))
+        rows.append('\x00')
+        self.assertEqual(3, len(rows))
+        self.assertEqual(('42', None), rows[0])
+        self.assertEqual(('', 'ham'), rows[-2])
+        self.assertEqual([('', 'ham'), ('',)], rows[1:])
+        self.assertEqual([('42', None), ('',)], rows[::2])
+        self.assertRaises(IndexError, rows.__getitem__, 3)
+        self.assertEqual(3, len(list(rows)))
+
+        # Rows can be added after rows were decoded
+        rows.append('\x01a')
+        self.assertEqual(('a',), rows[3])
+
+    def test_spooled_rows(self):
+        """Write packed rows to a temporary file"""
+        rows = utils.SpooledRows(utils.read_lc_string_list, 4)
+        rows.append('\x0242\xfb')
+        self.assertEqual(None, rows.file)
+        rows.append('\x03ham')
+        self.assertNotEqual(None, rows.file)
+        rows.append('\x00')
+        rows.finish()
+        self.assertEqual(3, len(rows))
+        self.assertEqual([('42', None), ('ham',), ('',)], rows[:])
+        rows.close()
+        self.assertEqual(None, rows.file)
+        self.assertEqual(0, len(rows))
+
     def test_read_string_1(self):
         """Read a string from a buffer up until a certain character."""
         buf = 'abcdef\x00ghijklm'
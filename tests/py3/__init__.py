@@ -53,6 +53,16 @@ class DummySocket(object):
         self._server_replies = self._server_replies[bufsize:]
         return res
 
+    def recv_into(self, buffer_, nbytes=0, flags=0):
+        if self._raise_socket_error:
+            raise socket.error(self._raise_socket_error)
+        if not nbytes:
+            nbytes = len(buffer_)
+        res = self._server_replies[0:nbytes]
+        self._server_replies = self._server_replies[nbytes:]
+        buffer_[0:len(res)] = res
+        return len(res)
+
     def send(self, string, flags=0):
         if self._raise_socket_error:
             raise socket.error(self._raise_socket_error)
@@ -63,6 +73,13 @@ class DummySocket(object):
         self._client_sends.append(string)
         return None
 
+    def sendmsg(self, buffers, *args):
+        if self._raise_socket_error:
+            raise socket.error(self._raise_socket_error)
+        data = b''.join(buffers)
+        self._client_sends.append(data)
+        return len(data)
+
     def add_packet(self, packet):
         self._server_replies += packet
 
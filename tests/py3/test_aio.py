@@ -0,0 +1,243 @@
+# MySQL Connector/Python - MySQL driver written in Python.
+# Copyright (c) 2013, Oracle and/or its affiliates. All rights reserved.
+
+# MySQL Connector/Python is licensed under the terms of the GPLv2
+# <http://www.gnu.org/licenses/old-licenses/gpl-2.0.html>, like most
+# MySQL Connectors. There are special exceptions to the terms and
+# conditions of the GPLv2 as it is applied to this software, see the
+# FOSS License Exception
+# <http://www.mysql.com/about/legal/licensing/foss-exception.html>.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+"""Unittests for mysql.connector.aio
+"""
+
+import asyncio
+
+import tests
+from mysql.connector import connection, errors, aio
+from mysql.connector.aio import network
+
+
+class AioTestCase(tests.MySQLConnectorTests):
+
+    """Base class running coroutines on an event loop"""
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def run_coro(self, coro):
+        """Run a coroutine until it is done"""
+        return self.loop.run_until_complete(coro)
+
+
+class NetworkTests(AioTestCase):
+
+    """Testing mysql.connector.aio.network"""
+
+    def test_packetqueue(self):
+        """Read received packets like from a socket"""
+        packets = [b'\x01\x00\x00\x01\x01', b'\x01\x00\x00\x02\x02']
+        queue = network.PacketQueue(packets)
+        self.assertEqual(packets[0], queue.recv())
+        self.assertEqual(packets[1], queue.recv_view())
+        self.assertRaises(errors.InterfaceError, queue.recv)
+
+    def test_recv_rows(self):
+        """Receive the packets of a text result set"""
+        async def stream_reader():
+            return asyncio.StreamReader()
+
+        sock = network.MySQLStreamSocket()
+        sock._reader = self.run_coro(stream_reader())
+        rows = [b'\x04\x00\x00\x01\x03Ham', b'\x04\x00\x00\x02\x03Egg']
+        eof = b'\x05\x00\x00\x03\xfe\x00\x00\x02\x00'
+        sock._reader.feed_data(b''.join(rows) + eof)
+        self.assertEqual(rows[0:1], self.run_coro(sock.recv_rows(1)))
+        self.assertEqual([rows[1], eof], self.run_coro(sock.recv_rows()))
+        self.assertEqual(3, sock._packet_number)
+
+        sock._reader.feed_data(
+            b'\x0e\x00\x00\x01\xff\x28\x04#42000Oops!')
+        self.assertRaises(errors.ProgrammingError,
+                          self.run_coro, sock.recv_rows())
+
+        sock._reader.feed_eof()
+        self.assertRaises(errors.InterfaceError,
+                          self.run_coro, sock.recv_rows())
+
+    def test_close_connection(self):
+        """Close the connection and wait until it is closed"""
+        async def serve(reader, writer):
+            writer.close()
+
+        server = self.run_coro(
+            asyncio.start_server(serve, host='127.0.0.1', port=0))
+        port = server.sockets[0].getsockname()[1]
+        sock = network.MySQLStreamSocket(host='127.0.0.1', port=port)
+        self.run_coro(sock.open_connection())
+        writer = sock._writer
+        self.run_coro(sock.close_connection())
+        self.assertTrue(writer.transport.is_closing())
+        self.assertEqual(None, sock._writer)
+        self.run_coro(sock.close_connection())
+        server.close()
+        self.run_coro(server.wait_closed())
+
+
+class InheritedMethodsTests(tests.MySQLConnectorTests):
+
+    """Testing methods inherited from mysql.connector.MySQLConnection"""
+
+    # Inherited methods and properties which do not communicate with
+    # the MySQL server
+    no_io = (
+        '_get_compression_codec', '_get_getwarnings',
+        '_get_raise_on_warnings', '_get_self', '_get_server_compress_level',
+        '_get_unread_result', '_handle_binary_ok', '_handle_eof',
+        '_handle_ok', '_handle_server_status', '_reset_prepared_cache',
+        '_set_getwarnings', '_set_raise_on_warnings', '_set_unread_result',
+        '_stmt_reset_needed', 'charset', 'cmd_process_info', 'collation',
+        'compact_buffered', 'compression_algorithm', 'compression_stats',
+        'connection_id', 'get_server_info', 'get_server_version',
+        'get_warnings', 'in_transaction', 'isset_client_flag',
+        'prepared_cache_stats', 'raise_on_warnings', 'server_host',
+        'server_port', 'set_client_flags', 'set_converter_class',
+        'set_login', 'set_unicode', 'unix_socket', 'unread_result', 'user',
+    )
+
+    def test_blocking_methods(self):
+        """Methods doing blocking I/O are overridden"""
+        inherited = [
+            name for name, value in vars(connection.MySQLConnection).items()
+            if not name.startswith('__')
+            and name not in vars(aio.MySQLConnection)
+            and name not in self.no_io]
+        self.assertEqual([], sorted(inherited))
+
+        cnx = aio.MySQLConnection()
+        for name, args in (('_stmt_prepare_cached', (b'SELECT 1',)),
+                           ('_set_deadline', (1,)),
+                           ('_check_deadline', ()),
+                           ('_kill_thread', (42,))):
+            self.assertRaises(errors.NotSupportedError,
+                              getattr(cnx, name), *args)
+
+
+class MySQLConnectionTests(AioTestCase):
+
+    """Testing mysql.connector.aio.MySQLConnection"""
+
+    def setUp(self):
+        super().setUp()
+        self.config = tests.get_mysql_config()
+        self.cnx = self.run_coro(aio.connect(**self.config))
+
+    def tearDown(self):
+        try:
+            self.run_coro(self.cnx.close())
+        except:
+            pass
+        super().tearDown()
+
+    def test_config(self):
+        """Compression and SSL are not supported"""
+        cnx = aio.MySQLConnection()
+        self.assertRaises(errors.NotSupportedError, cnx.config,
+                          compress=True)
+        for option, value in (('read_timeout', 30), ('write_timeout', 5),
+                              ('kill_query_on_timeout', True),
+                              ('recvsize', 16384), ('zero_copy', True),
+                              ('compact_buffered', True),
+                              ('dns_cache_ttl', 60), ('host_retry_delay', 0),
+                              ('prepared_cache_size', 16)):
+            self.assertRaises(errors.NotSupportedError, cnx.config,
+                              **{option: value})
+        cnx.config(read_timeout=None, recvsize=8192, zero_copy=False)
+        self.assertRaises(errors.NotSupportedError, cnx.config,
+                          host='db1,db2')
+        self.assertEqual(None, cnx._hosts)
+        self.assertRaises(errors.NotSupportedError, self.cnx.cursor,
+                          prepared=True)
+        self.assertRaises(errors.NotSupportedError,
+                          cnx.cmd_stmt_execute_pipeline, 1, [()])
+        self.assertRaises(errors.NotSupportedError,
+                          cnx.cmd_query_pipeline, [b'SELECT 1'])
+        self.assertRaises(errors.NotSupportedError,
+                          cnx.cmd_stmt_fetch, 1, 10)
+
+    def test_settings(self):
+        """Change settings needing a round trip"""
+        self.run_coro(self.cnx.set_autocommit(True))
+        self.assertEqual(True, self.cnx.autocommit)
+        self.assertEqual(True, self.run_coro(self.cnx.get_autocommit()))
+        self.run_coro(self.cnx.set_time_zone('+02:00'))
+        self.assertEqual('+02:00', self.run_coro(self.cnx.get_time_zone()))
+        self.assertEqual(True, self.run_coro(self.cnx.is_connected()))
+
+    def test_cursor(self):
+        """Execute statements and fetch rows using asyncio cursors"""
+        async def fetch(cur):
+            await cur.execute("SELECT %s, 'ham' UNION SELECT %s, 'spam'",
+                              (1, 2))
+            return [row async for row in cur]
+
+        exp = [(1, 'ham'), (2, 'spam')]
+        self.assertEqual(exp, self.run_coro(fetch(self.cnx.cursor())))
+        self.assertEqual(
+            exp, self.run_coro(fetch(self.cnx.cursor(buffered=True))))
+        self.assertEqual(
+            [(b'1', b'ham'), (b'2', b'spam')],
+            self.run_coro(fetch(self.cnx.cursor(raw=True))))
+
+        cur = self.cnx.cursor()
+        self.assertRaises(TypeError, iter, cur)
+        self.assertRaises(errors.NotSupportedError, cur.execute_pipeline,
+                          ["SELECT 1"])
+        self.assertRaises(errors.ProgrammingError,
+                          self.run_coro, cur.execute("SELECT * FROM"))
+
+    def test_executemany(self):
+        """Execute statements for multiple sets of parameters"""
+        cur = self.cnx.cursor()
+        self.run_coro(cur.execute(
+            "CREATE TEMPORARY TABLE myconnpy_aio (id INT, c1 VARCHAR(20))"))
+        data = [(1, 'ham'), (2, 'spam'), (3, 'eggs')]
+        self.run_coro(cur.executemany(
+            "INSERT INTO myconnpy_aio (id, c1) VALUES (%s, %s)", data))
+        self.assertEqual(3, cur.rowcount)
+        self.run_coro(cur.execute("SELECT id, c1 FROM myconnpy_aio"))
+        self.assertEqual(data, self.run_coro(cur.fetchall()))
+
+    def test_concurrent_connections(self):
+        """Run queries on many connections using one event loop"""
+        async def query(i):
+            cnx = await aio.connect(pool_name='myconnpy_aio', pool_size=3,
+                                    **self.config)
+            cur = cnx.cursor()
+            await cur.execute("SELECT SLEEP(0.1), %s", (i,))
+            row = await cur.fetchone()
+            await cnx.close()
+            return row[1]
+
+        exp = list(range(10))
+        self.assertEqual(exp, self.run_coro(
+            asyncio.gather(*[query(i) for i in exp])))
+        # pylint: disable=W0212
+        pool = aio._CONNECTION_POOLS['myconnpy_aio']
+        self.assertEqual(3, self.run_coro(pool._remove_connections()))
@@ -192,6 +192,78 @@ class UtilsTests(tests.MySQLConnectorTests):
         if result != None or rest != exp:
             self.fail("Wrong result. Expected None.")
 
+    def test_read_lc_string_list(self):
+        """Read a list of length coded strings starting at an offset"""
+        buf = b'\x01\x00\x00\x01' + b'\x03abc\xfb\xfc\x01\x01' + b'x' * 257
+        exp = (b'abc', None, b'x' * 257)
+        self.assertEqual(exp, utils.read_lc_string_list(buf[4:]))
+        self.assertEqual(exp, utils.read_lc_string_list(buf, 4))
+        result = utils.read_lc_string_list(memoryview(buf), 4)
+        self.assertEqual(exp, result)
+        self.assertTrue(isinstance(result[0], bytes))
+
+    def test_read_lc_values(self):
+        """Read and convert a list of length coded values"""
+        buf = b'\x01\x00\x00\x01' + b'\x0242\xfb\xfc\x01\x01' + b'x' * 257
+        converters = (int, int, len)
+        exp = (42, None, 257)
+        self.assertEqual(exp, utils.read_lc_values(buf, converters, 4))
+        self.assertEqual(exp, utils.read_lc_values(buf[4:], converters))
+        self.assertEqual(None, utils.read_lc_values(b'\xff', converters))
+        self.assertRaises(ValueError, utils.read_lc_values,
+                          b'\x01a', (int,))
+
+    def test_packet_reader(self):
+        """Read values from a packet using PacketReader"""
+        buf = (b'\x01\x00\x00\x01' + b'spam\x00' + b'\x2a\x00'
+               + b'\xfc\x01\x01' + b'\xfb' + b'\x03ham' + b'\x01x' + b'\x00')
+        reader = utils.PacketReader(buf, 4)
+        self.assertEqual(b'spam', reader.read_string(end=b'\x00'))
+        self.assertEqual(42, reader.read_int(2))
+        self.assertEqual(257, reader.read_lc_int())
+        self.assertEqual(None, reader.read_lc_string())
+        self.assertEqual(b'ham', reader.read_lc_string())
+        reader.skip_lc_string()
+        self.assertEqual(1, reader.remaining())
+        self.assertEqual((0,), reader.unpack(struct.Struct('<B')))
+        self.assertEqual(0, reader.remaining())
+        self.assertRaises(ValueError, reader.read_lc_int)
+        self.assertRaises(ValueError, utils.PacketReader(buf).read_string,
+                          b'\xff')
+
+    def test_packed_rows(self):
+        """Store rows packed and decode them when accessed"""
+        rows = utils.PackedRows(utils.read_lc_string_list)
+        rows.append(b'\x0242\xfb')
+        rows.append(memoryview(b'\xff\x00\x03ham')[1:])
+        rows.append(b'\x00')
+        self.assertEqual(3, len(rows))
+        self.assertEqual((b'42', None), rows[0])
+        self.assertEqual((b'', b'ham'), rows[-2])
+        self.assertEqual([(b'', b'ham'), (b'',)], rows[1:])
+        self.assertEqual([(b'42', None), (b'',)], rows[::2])
+        self.assertRaises(IndexError, rows.__getitem__, 3)
+        self.assertEqual(3, len(list(rows)))
+
+        # Rows can be added after rows were decoded
+        rows.append(b'\x01a')
+        self.assertEqual((b'a',), rows[3])
+
+    def test_spooled_rows(self):
+        """Write packed rows to a temporary file"""
+        rows = utils.SpooledRows(utils.read_lc_string_list, 4)
+        rows.append(b'\x0242\xfb')
+        self.assertEqual(None, rows.file)
+        rows.append(b'\x03ham')
+        self.assertNotEqual(None, rows.file)
+        rows.append(b'\x00')
+        rows.finish()
+        self.assertEqual(3, len(rows))
+        self.assertEqual([(b'42', None), (b'ham',), (b'',)], rows[:])
+        rows.close()
+        self.assertEqual(None, rows.file)
+        self.assertEqual(0, len(rows))
+
     def test_read_string_1(self):
         """Read a string from a buffer up until a certain character."""
         buf = b'abcdef\x00ghijklm'
@@ -31,6 +31,7 @@ import timeit
 import unittest
 from decimal import Decimal
 import io
+import zlib
 
 import tests
 
@@ -77,8 +78,15 @@ class ConnectionTests(tests.MySQLConnectorTests):
             'get_warnings': False,
             'raise_on_warnings': False,
             'connection_timeout': None,
+            'read_timeout': None,
+            'write_timeout': None,
+            'kill_query_on_timeout': False,
             'client_flags': 0,
             'compress': False,
+            'compress_algorithm': None,
+            'compress_level': None,
+            'compress_threshold': 50,
+            'compress_adaptive': False,
             'buffered': False,
             'raw': False,
             'ssl_ca': None,
@@ -90,6 +98,19 @@ class ConnectionTests(tests.MySQLConnectorTests):
             'connect_timeout': None,
             'dsn': None,
             'force_ipv6': False,
+            'dns_cache_ttl': 0,
+            'host_retry_delay': 30,
+            'zero_copy': False,
+            'compact_buffered': False,
+            'prepared_cache_size': 0,
+            'tcp_nodelay': True,
+            'keepalive': False,
+            'keepalive_idle': None,
+            'keepalive_interval': None,
+            'keepalive_count': None,
+            'recv_buffer_size': None,
+            'send_buffer_size': None,
+            'recvsize': 8192,
         }
         self.assertEqual(exp, connection.DEFAULT_CONFIGURATION)
 
@@ -124,6 +145,10 @@ class MySQLConnectionTests(tests.MySQLConnectorTests):
             '_get_warnings': False,
             '_raise_on_warnings': False,
             '_connection_timeout': None,
+            '_read_timeout': None,
+            '_write_timeout': None,
+            '_kill_query_on_timeout': False,
+            '_deadline': None,
             '_buffered': False,
             '_unread_result': False,
             '_have_next_result': False,
@@ -133,6 +158,24 @@ class MySQLConnectionTests(tests.MySQLConnectorTests):
             '_ssl': {},
             '_in_transaction': False,
             '_force_ipv6': False,
+            '_hosts': None,
+            '_dns_cache_ttl': 0,
+            '_host_retry_delay': 30,
+            '_zero_copy': False,
+            '_compact_buffered': False,
+            '_prepared_cache_size': 0,
+            '_compress_algorithm': None,
+            '_compress_level': None,
+            '_compress_threshold': 50,
+            '_compress_adaptive': False,
+            '_tcp_nodelay': True,
+            '_keepalive': False,
+            '_keepalive_idle': None,
+            '_keepalive_interval': None,
+            '_keepalive_count': None,
+            '_recv_buffer_size': None,
+            '_send_buffer_size': None,
+            '_recvsize': 8192,
         }
         for key, value in exp.items():
             self.assertEqual(
@@ -331,6 +374,13 @@ class MySQLConnectionTests(tests.MySQLConnectorTests):
         exp = ([], {'status_flag': 32, 'warning_count': 0})
         self.assertEqual(exp, self.cnx.get_rows())
 
+        self.__helper_get_rows_buffer()
+        (packed, eof) = self.cnx.get_rows(packed=True)
+        self.assertEqual(len(rows), len(packed))
+        self.assertEqual(list(rows), packed[:])
+        self.assertEqual(rows[-1], packed[-1])
+        self.assertEqual({'status_flag': 32, 'warning_count': 0}, eof)
+
         # Test unread results
         self.cnx.unread_result = False
         self.assertRaises(errors.InternalError, self.cnx.get_rows)
@@ -459,6 +509,47 @@ class MySQLConnectionTests(tests.MySQLConnectorTests):
                 results.append(self.cnx.get_rows())
         self.assertEqual(exp, results)
 
+    def test_cmd_query_pipeline(self):
+        """Send queries to MySQL without waiting for the results"""
+        self.cnx._socket.sock = tests.DummySocket()
+        packets = [
+            OK_PACKET,
+            b'\x0e\x00\x00\x01\xff\x28\x04\x23\x34\x32\x30\x30\x30'
+            b'\x4f\x6f\x70\x73\x21',
+            b'\x01\x00\x00\x01\x01',
+            b'\x17\x00\x00\x02\x03\x64\x65\x66\x00\x00\x00\x01'
+            b'\x31\x00\x0c\x3f\x00\x01\x00\x00\x00\x08\x81\x00'
+            b'\x00\x00\x00',
+            b'\x05\x00\x00\x03\xfe\x00\x00\x00\x00',
+            b'\x02\x00\x00\x04\x01\x31',
+            b'\x05\x00\x00\x05\xfe\x00\x00\x00\x00',
+        ]
+        self.cnx._socket.sock.add_packets(packets)
+        sock = self.cnx._socket.sock
+        stmts = ["SET @a = 1", "BAD", "SELECT 1"]
+        results = []
+        sent = []
+        for result in self.cnx.cmd_query_pipeline(stmts, window=2):
+            sent.append(len(sock._client_sends))
+            results.append(result)
+            if isinstance(result, dict) and 'columns' in result:
+                results.append(self.cnx.get_rows())
+
+        # Two statements are sent before reading the first result
+        self.assertEqual([2, 3, 3], sent)
+        self.assertEqual(OK_PACKET_RESULT, results[0])
+        self.assertTrue(isinstance(results[1], errors.ProgrammingError))
+        self.assertEqual(1064, results[1].errno)
+        exp = [
+            {'columns': [('1', 8, None, None, None, None, 0, 129)],
+             'eof': {'status_flag': 0, 'warning_count': 0}},
+            ([(b'1',)], {'status_flag': 0, 'warning_count': 0}),
+        ]
+        self.assertEqual(exp, results[2:])
+
+        self.assertRaises(ValueError, next,
+                          self.cnx.cmd_query_pipeline(stmts, window=0))
+
     def test_cmd_refresh(self):
         """Send the Refresh-command to MySQL"""
         self.cnx._socket.sock = tests.DummySocket()
@@ -888,6 +979,85 @@ class MySQLConnectionTests(tests.MySQLConnectorTests):
         self.assertEqual(exp, cnx._client_flags &
                          constants.ClientFlag.COMPRESS)
 
+        # Test compression settings
+        cnx.config(compress_level=1, compress_threshold=1024,
+                   compress_adaptive=True)
+        self.assertEqual(1, cnx._compress_level)
+        self.assertEqual(1024, cnx._compress_threshold)
+        self.assertEqual(True, cnx._compress_adaptive)
+        for level in (10, -2, '1'):
+            self.assertRaises(errors.InterfaceError, cnx.config,
+                              compress_level=level)
+        for threshold in (-1, None):
+            self.assertRaises(errors.InterfaceError, cnx.config,
+                              compress_threshold=threshold)
+        cnx.config(compress_algorithm='zstd', compress_level=19)
+        self.assertEqual('zstd', cnx._compress_algorithm)
+        self.assertEqual(19, cnx._compress_level)
+        self.assertRaises(errors.InterfaceError, cnx.config,
+                          compress_algorithm='lz4')
+
+        # Test prepared statement cache size
+        cnx.config(prepared_cache_size=16)
+        self.assertEqual(16, cnx._prepared_cache_size)
+        for size in (-1, None, '16'):
+            self.assertRaises(errors.InterfaceError, cnx.config,
+                              prepared_cache_size=size)
+        self.assertRaises(errors.InterfaceError, cnx.config,
+                          compress_algorithm='zlib', compress_level=19)
+        cnx.config(compress_algorithm=None, compress_level=None)
+
+        # Test multiple hosts
+        cnx.config(host='db1:3307, db2,[::1]:3308', port=3306)
+        self.assertEqual('db1', cnx._host)
+        self.assertEqual(3307, cnx._port)
+        self.assertEqual([('db1', 3307), ('db2', None), ('::1', 3308)],
+                         cnx._hosts)
+        cnx.config(host=['db1', ('db2', 3307)], port=3306)
+        self.assertEqual([('db1', None), ('db2', 3307)], cnx._hosts)
+        cnx.config(host='::1', dns_cache_ttl=60, host_retry_delay=0)
+        self.assertEqual('::1', cnx._host)
+        self.assertEqual(None, cnx._hosts)
+        self.assertEqual(60, cnx._dns_cache_ttl)
+        self.assertEqual(0, cnx._host_retry_delay)
+        self.assertRaises(errors.InterfaceError, cnx.config, host='db1:ham')
+        self.assertRaises(errors.InterfaceError, cnx.config, host=[])
+        self.assertRaises(errors.InterfaceError, cnx.config,
+                          dns_cache_ttl=-1)
+        self.assertRaises(errors.InterfaceError, cnx.config,
+                          host_retry_delay='30')
+        cnx.config(host='127.0.0.1', port=3306, dns_cache_ttl=0,
+                   host_retry_delay=30)
+
+        # Test timeouts
+        cnx.config(read_timeout=30, write_timeout=2.5)
+        self.assertEqual(30, cnx._read_timeout)
+        self.assertEqual(2.5, cnx._write_timeout)
+        for timeout in (0, -1, '10'):
+            self.assertRaises(errors.InterfaceError, cnx.config,
+                              read_timeout=timeout)
+            self.assertRaises(errors.InterfaceError, cnx.config,
+                              write_timeout=timeout)
+        cnx.config(read_timeout=None, write_timeout=None)
+
+        # Test socket options
+        cnx.config(tcp_nodelay=False, keepalive=True, keepalive_idle=60,
+                   keepalive_interval=None, recv_buffer_size=65536,
+                   recvsize=16384)
+        self.assertEqual(False, cnx._tcp_nodelay)
+        self.assertEqual(True, cnx._keepalive)
+        self.assertEqual(60, cnx._keepalive_idle)
+        self.assertEqual(None, cnx._keepalive_interval)
+        self.assertEqual(65536, cnx._recv_buffer_size)
+        self.assertEqual(16384, cnx._recvsize)
+        self.assertRaises(errors.InterfaceError, cnx.config,
+                          tcp_nodelay=1)
+        for key in ('keepalive_count', 'send_buffer_size', 'recvsize'):
+            for value in (0, -1, '1024'):
+                self.assertRaises(errors.InterfaceError, cnx.config,
+                                  **{key: value})
+        self.assertRaises(errors.InterfaceError, cnx.config, recvsize=None)
+
         # Test character set
         # utf8 is default, which is mapped to 33
         self.assertEqual(33, cnx._charset_id)
@@ -980,6 +1150,67 @@ class MySQLConnectionTests(tests.MySQLConnectorTests):
         self.assertTrue(isinstance(res, network.MySQLTCPSocket))
         self.assertEqual(self.cnx._connection_timeout,
                          res._connection_timeout)
+        self.assertEqual(True, res._socket_options['tcp_nodelay'])
+        self.assertEqual(None, res._read_timeout)
+        self.assertEqual(None, res._write_timeout)
+        self.assertEqual(8192, res.recvsize)
+
+        self.cnx.config(keepalive=True, keepalive_count=3,
+                        send_buffer_size=32768, recvsize=16384,
+                        read_timeout=30, write_timeout=5)
+        res = self.cnx._get_connection()
+        self.assertEqual(30, res._read_timeout)
+        self.assertEqual(5, res._write_timeout)
+
+        self.cnx.config(host='db1,db2:3307', port=3306, dns_cache_ttl=60)
+        res = self.cnx._get_connection()
+        self.assertEqual([('db1', 3306), ('db2', 3307)], res._hosts)
+        self.assertEqual(60, res._dns_cache_ttl)
+        self.assertEqual(True, res._socket_options['keepalive'])
+        self.assertEqual(3, res._socket_options['keepalive_count'])
+        self.assertEqual(32768, res._socket_options['send_buffer_size'])
+        self.assertEqual(16384, res.recvsize)
+
+    def test__check_deadline(self):
+        """Kill the statement on the server which exceeded its deadline"""
+        configs = []
+
+        class _KillConnection(object):
+            def __init__(self, **config):
+                configs.append(config)
+                raise errors.InterfaceError("Not connecting")
+
+        cnx = _DummyMySQLConnection()
+        cnx.config(host='db1,db2:3307', port=3306, unix_socket=None,
+                   kill_query_on_timeout=True)
+        cnx._handshake = {'server_threadid': 42}
+        cnx._socket = cnx._get_connection()
+        cnx._socket.server_host = 'db2'
+        cnx._socket.server_port = 3307
+        cnx._set_deadline(-1)
+
+        orig_connection = connection.MySQLConnection
+        connection.MySQLConnection = _KillConnection
+        try:
+            self.assertRaises(errors.OperationalError, cnx._check_deadline)
+
+            # Errors of the MySQL server keep the connection
+            cnx._set_deadline(60)
+            cnx._check_deadline(errors.OperationalError(errno=1205))
+            self.assertNotEqual(None, cnx._deadline)
+
+            # The socket timed out before the deadline according to the
+            # clock; the connection is closed nevertheless
+            cnx._check_deadline(errors.OperationalError(errno=2055))
+        finally:
+            connection.MySQLConnection = orig_connection
+
+        self.assertEqual(2, len(configs))
+        self.assertEqual('db2', configs[0]['host'])
+        self.assertEqual(3307, configs[0]['port'])
+        self.assertEqual(None, configs[0]['unix_socket'])
+        self.assertFalse('hosts' in configs[0])
+        self.assertEqual(None, cnx._deadline)
 
     def test__open_connection(self):
         """Open the connection to the MySQL server"""
@@ -991,11 +1222,59 @@ class MySQLConnectionTests(tests.MySQLConnectorTests):
         self.cnx.close()
 
         self.cnx._client_flags |= constants.ClientFlag.COMPRESS
+        self.cnx._compress_algorithm = 'zlib'
         self.cnx._open_connection()
         self.assertEqual(self.cnx._socket.recv_compressed,
                          self.cnx._socket.recv)
         self.assertEqual(self.cnx._socket.send_compressed,
                          self.cnx._socket.send)
+        self.assertEqual('zlib', self.cnx.compression_algorithm)
+        self.assertEqual(zlib.Z_DEFAULT_COMPRESSION,
+                         self.cnx._socket._codec.level)
+        self.assertEqual(50, self.cnx._socket._compress_threshold)
+        self.cnx.close()
+
+        self.cnx._compress_level = 9
+        self.cnx._compress_threshold = 100
+        self.cnx._compress_adaptive = True
+        self.cnx._open_connection()
+        self.assertEqual(9, self.cnx._socket._codec.level)
+        self.assertEqual(100, self.cnx._socket._compress_threshold)
+        self.assertEqual(True, self.cnx._socket._compress_adaptive)
+
+    def test__get_compression_codec(self):
+        """Choose the codec compressing the packets"""
+        zstd_flag = constants.ClientFlag.ZSTD_COMPRESSION_ALGORITHM
+        self.cnx._client_flags &= ~constants.ClientFlag.COMPRESS
+        self.assertEqual(None, self.cnx._get_compression_codec())
+
+        self.cnx._client_flags |= constants.ClientFlag.COMPRESS
+        self.cnx._handshake = {'capabilities': 41516}
+        self.cnx._compress_algorithm = None
+        self.assertEqual(network.ZlibCodec,
+                         self.cnx._get_compression_codec())
+        self.cnx._compress_algorithm = 'zstd'
+        self.assertRaises(errors.NotSupportedError,
+                          self.cnx._get_compression_codec)
+
+        self.cnx._handshake = {'capabilities': 41516 | zstd_flag}
+        self.cnx._compress_algorithm = 'zlib'
+        self.assertEqual(network.ZlibCodec,
+                         self.cnx._get_compression_codec())
+        if network.ZstdCodec.available:
+            exp = network.ZstdCodec
+        else:
+            exp = network.ZlibCodec
+        self.cnx._compress_algorithm = None
+        self.assertEqual(exp, self.cnx._get_compression_codec())
+
+    def test__get_server_compress_level(self):
+        """Get the zstd compression level sent to the server"""
+        default = network.ZstdCodec.default_level
+        for level, exp in ((None, default), (-1, default), (0, default),
+                           (-7, default), (1, 1), (19, 19), (22, 22)):
+            self.cnx._compress_level = level
+            self.assertEqual(exp, self.cnx._get_server_compress_level())
 
     def test__post_connection(self):
         """Executes commands after connection has been established"""
@@ -1469,10 +1748,19 @@ class MySQLConnectionTests(tests.MySQLConnectorTests):
             ({'buffered': True}, cursor.MySQLCursorBuffered),
             ({'raw': True}, cursor.MySQLCursorRaw),
             ({'buffered': True, 'raw': True}, cursor.MySQLCursorBufferedRaw),
+            ({'prefetch': 2}, cursor.MySQLCursorPrefetch),
+            ({'server_side': True}, cursor.MySQLCursorPrepared),
         ]
         for kwargs, exp in cases:
             self.assertTrue(isinstance(self.cnx.cursor(**kwargs), exp))
 
+        self.assertRaises(ValueError, self.cnx.cursor, prefetch=0)
+        self.assertRaises(ValueError, self.cnx.cursor, prefetch=2,
+                          buffered=True)
+        self.assertTrue(self.cnx.cursor(server_side=True).server_side)
+        self.assertRaises(ValueError, self.cnx.cursor, server_side=True,
+                          raw=True)
+
         # Test when connection is closed
         self.cnx.close()
         self.assertRaises(errors.OperationalError, self.cnx.cursor)
@@ -393,3 +393,26 @@ class ShutdownTypeTests(tests.MySQLConnectorTests):
             exp = value[1]
             res = constants.ShutdownType.get_desc(key)
             self.assertEqual(exp, res)
+
+
+class CursorTypeTests(tests.MySQLConnectorTests):
+
+    """Test COM_STMT_EXECUTE cursor types"""
+    desc = {
+        'NO_CURSOR': (0, 'No cursor is opened'),
+        'READ_ONLY': (1, 'Open a read-only cursor'),
+        'FOR_UPDATE': (2, 'Open a cursor for update'),
+        'SCROLLABLE': (4, 'Open a scrollable cursor'),
+    }
+
+    def test_attributes(self):
+        """Check attributes for CursorType"""
+        for key, value in self.desc.items():
+            self.assertEqual(
+                value[0], getattr(constants.CursorType, key),
+                '{0} attribute of CursorType has wrong value'.format(key))
+
+    def test_get_desc(self):
+        """Get cursor type description by name"""
+        for key, value in self.desc.items():
+            self.assertEqual(value[1], constants.CursorType.get_desc(key))
@@ -0,0 +1,76 @@
+# MySQL Connector/Python - MySQL driver written in Python.
+# Copyright (c) 2013, Oracle and/or its affiliates. All rights reserved.
+
+# MySQL Connector/Python is licensed under the terms of the GPLv2
+# <http://www.gnu.org/licenses/old-licenses/gpl-2.0.html>, like most
+# MySQL Connectors. There are special exceptions to the terms and
+# conditions of the GPLv2 as it is applied to this software, see the
+# FOSS License Exception
+# <http://www.mysql.com/about/legal/licensing/foss-exception.html>.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+"""Unittests for mysql.connector.multiplex
+"""
+
+import time
+
+import tests
+from mysql.connector import errors, multiplex
+from mysql.connector.connection import MySQLConnection
+
+
+class QueryManyTests(tests.MySQLConnectorTests):
+
+    def setUp(self):
+        config = tests.get_mysql_config()
+        self.cnxs = [MySQLConnection(**config) for _ in range(4)]
+
+    def tearDown(self):
+        for cnx in self.cnxs:
+            cnx.close()
+
+    def test_query_many(self):
+        queries = [
+            (self.cnxs[0], "SELECT SLEEP(0.5), 'ham'"),
+            (self.cnxs[1], "SELECT SLEEP(0.5), 'spam'"),
+            (self.cnxs[2], "DO SLEEP(0.5)"),
+            (self.cnxs[3], "SELECT * FROM"),
+        ]
+        start = time.time()
+        results = multiplex.query_many(queries)
+        self.assertTrue(time.time() - start < 1.0)
+
+        self.assertEqual([(0, 'ham')], results[self.cnxs[0]]['rows'])
+        self.assertEqual([(0, 'spam')], results[self.cnxs[1]]['rows'])
+        self.assertEqual(0, results[self.cnxs[2]]['field_count'])
+        self.assertTrue(isinstance(results[self.cnxs[3]],
+                                   errors.ProgrammingError))
+        for cnx in self.cnxs:
+            self.assertFalse(cnx.unread_result)
+            self.assertTrue(cnx.is_connected())
+
+        results = multiplex.query_many({self.cnxs[0]: "SELECT 1"}, raw=True)
+        self.assertEqual([(b'1',)], results[self.cnxs[0]]['rows'])
+
+        self.assertRaises(errors.ProgrammingError, multiplex.query_many,
+                          [(self.cnxs[0], "SELECT 1"),
+                           (self.cnxs[0], "SELECT 2")])
+
+    def test_query_many_timeout(self):
+        queries = dict([(cnx, "DO SLEEP(2)") for cnx in self.cnxs[0:2]])
+        self.assertRaises(errors.OperationalError, multiplex.query_many,
+                          queries, timeout=0.5)
+        for cnx in self.cnxs[0:2]:
+            self.assertFalse(cnx.is_connected())